@@ -1,5 +1,9 @@
 PRAGMA foreign_keys=ON;
 BEGIN TRANSACTION;
+DROP TABLE IF EXISTS catalog_manifest;
+DROP TABLE IF EXISTS catalog_version;
+DROP TABLE IF EXISTS recipe_scores;
+DROP TABLE IF EXISTS score_configs;
 DROP TABLE IF EXISTS recipe_ingredients;
 DROP TABLE IF EXISTS recipes;
 DROP TABLE IF EXISTS ingredients;
@@ -47,6 +51,33 @@ CREATE TABLE recipe_ingredients (
     notes TEXT,
     PRIMARY KEY (recipe_id, ingredient_id)
 );
+CREATE TABLE score_configs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    target_calories REAL NOT NULL,
+    target_protein REAL NOT NULL,
+    target_fat REAL NOT NULL,
+    target_carbs REAL NOT NULL,
+    weight_calories REAL NOT NULL,
+    weight_protein REAL NOT NULL,
+    weight_fat REAL NOT NULL,
+    weight_carbs REAL NOT NULL
+);
+CREATE TABLE recipe_scores (
+    config_id INTEGER NOT NULL REFERENCES score_configs(id) ON DELETE CASCADE,
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+    score REAL NOT NULL,
+    PRIMARY KEY (config_id, recipe_id)
+) WITHOUT ROWID;
+CREATE TABLE catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version TEXT NOT NULL
+);
+CREATE TABLE catalog_manifest (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+) WITHOUT ROWID;
 INSERT INTO "categories" VALUES(1,'Breakfast','Quick meals to jump-start the morning with balanced macros.');
 INSERT INTO "categories" VALUES(2,'Lunch','Midday plates designed to refuel with a mix of carbs, protein, and healthy fats.');
 INSERT INTO "categories" VALUES(3,'Dinner','Heartier entrees that keep macro targets on track without sacrificing flavor.');
@@ -122,6 +153,11 @@ INSERT INTO "ingredients" VALUES(66,'Beet','g',0.43,0.016,0.002,0.096);
 INSERT INTO "ingredients" VALUES(67,'Orange juice','ml',0.45,0.007,0.0,0.11);
 INSERT INTO "ingredients" VALUES(68,'Matcha powder','g',3.24,0.31,0.05,0.38);
 INSERT INTO "ingredients" VALUES(69,'Coconut water','ml',0.19,0.004,0.0,0.044);
+INSERT INTO "score_configs" VALUES(1,'balanced',600.0,26.0,17.0,80.0,2.0,3.0,2.0,1.0);
+INSERT INTO "score_configs" VALUES(2,'high_protein',600.0,45.0,17.0,55.0,2.0,4.0,2.0,1.0);
+INSERT INTO "score_configs" VALUES(3,'low_carb',550.0,35.0,30.0,30.0,2.0,3.0,2.0,3.0);
+INSERT INTO "score_configs" VALUES(4,'light',400.0,25.0,12.0,50.0,3.0,3.0,2.0,1.0);
+INSERT INTO "score_configs" VALUES(5,'bulking',850.0,45.0,28.0,100.0,2.0,3.0,1.0,2.0);
 INSERT INTO "recipes" VALUES(1,1,'Protein Oatmeal Bowl','Creamy oats layered with fruit, healthy fats, and a protein boost to anchor the morning.','1. Bring the almond milk to a gentle simmer and stir in the oats.
 2. Cook for 5 minutes until thickened, then fold in chia seeds and whey protein.
 3. Transfer to bowls, top with sliced banana, and finish with remaining toppings.',2,314.55,21.3,7.54,43.51,'https://images.pexels.com/photos/704569/pexels-photo-704569.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2',10.0,5.0,128.0,1);
@@ -384,4 +420,175 @@ INSERT INTO "recipe_ingredients" VALUES(30,19,15.0,'g',45.6,0.0,0.0,12.3,NULL);
 INSERT INTO "recipe_ingredients" VALUES(30,16,15.0,'ml',3.3,0.06,0.0,0.09,NULL);
 INSERT INTO "recipe_ingredients" VALUES(30,69,300.0,'ml',57.0,1.2,0.0,13.2,NULL);
 INSERT INTO "recipe_ingredients" VALUES(30,3,12.0,'g',58.32,2.04,3.72,5.04,NULL);
+INSERT INTO "recipe_scores" VALUES(1,1,0.42050770385284914);
+INSERT INTO "recipe_scores" VALUES(2,1,0.31006316749154511);
+INSERT INTO "recipe_scores" VALUES(3,1,0.28124834158083739);
+INSERT INTO "recipe_scores" VALUES(4,1,0.66856575707319343);
+INSERT INTO "recipe_scores" VALUES(5,1,0.2632997653408457);
+INSERT INTO "recipe_scores" VALUES(1,2,0.34091035545305653);
+INSERT INTO "recipe_scores" VALUES(2,2,0.24529577517973236);
+INSERT INTO "recipe_scores" VALUES(3,2,0.22636220855848149);
+INSERT INTO "recipe_scores" VALUES(4,2,0.31025907275414533);
+INSERT INTO "recipe_scores" VALUES(5,2,0.19959687815650778);
+INSERT INTO "recipe_scores" VALUES(1,3,0.28784683239604297);
+INSERT INTO "recipe_scores" VALUES(2,3,0.22010929659833836);
+INSERT INTO "recipe_scores" VALUES(3,3,0.25361258239213447);
+INSERT INTO "recipe_scores" VALUES(4,3,0.3734426323168748);
+INSERT INTO "recipe_scores" VALUES(5,3,0.19516109409466667);
+INSERT INTO "recipe_scores" VALUES(1,4,0.31452356675880094);
+INSERT INTO "recipe_scores" VALUES(2,4,0.23419025949148348);
+INSERT INTO "recipe_scores" VALUES(3,4,0.25093357898606333);
+INSERT INTO "recipe_scores" VALUES(4,4,0.3987605898800009);
+INSERT INTO "recipe_scores" VALUES(5,4,0.19452241500135584);
+INSERT INTO "recipe_scores" VALUES(1,5,0.27890851686510826);
+INSERT INTO "recipe_scores" VALUES(2,5,0.21280737922035958);
+INSERT INTO "recipe_scores" VALUES(3,5,0.24412099082860492);
+INSERT INTO "recipe_scores" VALUES(4,5,0.34972457696798409);
+INSERT INTO "recipe_scores" VALUES(5,5,0.18607981988560793);
+INSERT INTO "recipe_scores" VALUES(1,6,0.35822574112608085);
+INSERT INTO "recipe_scores" VALUES(2,6,0.25709613290652972);
+INSERT INTO "recipe_scores" VALUES(3,6,0.28518901719826617);
+INSERT INTO "recipe_scores" VALUES(4,6,0.48653685146638576);
+INSERT INTO "recipe_scores" VALUES(5,6,0.2196110466188485);
+INSERT INTO "recipe_scores" VALUES(1,7,0.3714643918956328);
+INSERT INTO "recipe_scores" VALUES(2,7,0.45739950613831515);
+INSERT INTO "recipe_scores" VALUES(3,7,0.34129537789420655);
+INSERT INTO "recipe_scores" VALUES(4,7,0.3179315156291076);
+INSERT INTO "recipe_scores" VALUES(5,7,0.28484166785772569);
+INSERT INTO "recipe_scores" VALUES(1,8,0.40184231881613142);
+INSERT INTO "recipe_scores" VALUES(2,8,0.27993066974012454);
+INSERT INTO "recipe_scores" VALUES(3,8,0.20233137143996016);
+INSERT INTO "recipe_scores" VALUES(4,8,0.59921120289156471);
+INSERT INTO "recipe_scores" VALUES(5,8,0.25671860389421436);
+INSERT INTO "recipe_scores" VALUES(1,9,0.28533001850185569);
+INSERT INTO "recipe_scores" VALUES(2,9,0.77979464619039895);
+INSERT INTO "recipe_scores" VALUES(3,9,0.54101772623846123);
+INSERT INTO "recipe_scores" VALUES(4,9,0.25258667298967069);
+INSERT INTO "recipe_scores" VALUES(5,9,0.40351821694489437);
+INSERT INTO "recipe_scores" VALUES(1,10,0.24443131775150803);
+INSERT INTO "recipe_scores" VALUES(2,10,0.19192489731616877);
+INSERT INTO "recipe_scores" VALUES(3,10,0.21640441977175326);
+INSERT INTO "recipe_scores" VALUES(4,10,0.29671575341753542);
+INSERT INTO "recipe_scores" VALUES(5,10,0.1753584076434313);
+INSERT INTO "recipe_scores" VALUES(1,11,0.30392153431344127);
+INSERT INTO "recipe_scores" VALUES(2,11,0.42222690981008754);
+INSERT INTO "recipe_scores" VALUES(3,11,0.88475267741232666);
+INSERT INTO "recipe_scores" VALUES(4,11,0.15239233978969152);
+INSERT INTO "recipe_scores" VALUES(5,11,0.40863804579079777);
+INSERT INTO "recipe_scores" VALUES(1,12,0.41376681102149593);
+INSERT INTO "recipe_scores" VALUES(2,12,0.39424225934511947);
+INSERT INTO "recipe_scores" VALUES(3,12,0.31727238319283563);
+INSERT INTO "recipe_scores" VALUES(4,12,0.3845622589519247);
+INSERT INTO "recipe_scores" VALUES(5,12,0.2598218798343046);
+INSERT INTO "recipe_scores" VALUES(1,13,0.32422516724143446);
+INSERT INTO "recipe_scores" VALUES(2,13,0.61378801703892216);
+INSERT INTO "recipe_scores" VALUES(3,13,0.79964368385852869);
+INSERT INTO "recipe_scores" VALUES(4,13,0.19210166874009543);
+INSERT INTO "recipe_scores" VALUES(5,13,0.44943343976119809);
+INSERT INTO "recipe_scores" VALUES(1,14,0.29928953502063288);
+INSERT INTO "recipe_scores" VALUES(2,14,0.29322278553626457);
+INSERT INTO "recipe_scores" VALUES(3,14,0.22831447272910813);
+INSERT INTO "recipe_scores" VALUES(4,14,0.36457715444021349);
+INSERT INTO "recipe_scores" VALUES(5,14,0.22165664846243358);
+INSERT INTO "recipe_scores" VALUES(1,15,0.23618081766291354);
+INSERT INTO "recipe_scores" VALUES(2,15,0.18801077969239158);
+INSERT INTO "recipe_scores" VALUES(3,15,0.20198966974352661);
+INSERT INTO "recipe_scores" VALUES(4,15,0.29520007366540718);
+INSERT INTO "recipe_scores" VALUES(5,15,0.18433967491064457);
+INSERT INTO "recipe_scores" VALUES(1,16,0.29367601786979697);
+INSERT INTO "recipe_scores" VALUES(2,16,0.22224438115811304);
+INSERT INTO "recipe_scores" VALUES(3,16,0.25636235558921971);
+INSERT INTO "recipe_scores" VALUES(4,16,0.38088640018265174);
+INSERT INTO "recipe_scores" VALUES(5,16,0.19410851288635086);
+INSERT INTO "recipe_scores" VALUES(1,17,0.1534638649420752);
+INSERT INTO "recipe_scores" VALUES(2,17,0.13204809297248526);
+INSERT INTO "recipe_scores" VALUES(3,17,0.13643258563768176);
+INSERT INTO "recipe_scores" VALUES(4,17,0.15627007968276896);
+INSERT INTO "recipe_scores" VALUES(5,17,0.13560567856535449);
+INSERT INTO "recipe_scores" VALUES(1,18,0.22251542283853898);
+INSERT INTO "recipe_scores" VALUES(2,18,0.17928369270783404);
+INSERT INTO "recipe_scores" VALUES(3,18,0.19496183151885435);
+INSERT INTO "recipe_scores" VALUES(4,18,0.25171447981937695);
+INSERT INTO "recipe_scores" VALUES(5,18,0.16295394247958683);
+INSERT INTO "recipe_scores" VALUES(1,19,0.14119306461659495);
+INSERT INTO "recipe_scores" VALUES(2,19,0.12305127302261722);
+INSERT INTO "recipe_scores" VALUES(3,19,0.12326214123984594);
+INSERT INTO "recipe_scores" VALUES(4,19,0.13922343270640058);
+INSERT INTO "recipe_scores" VALUES(5,19,0.12897597218452161);
+INSERT INTO "recipe_scores" VALUES(1,20,0.39594198761037069);
+INSERT INTO "recipe_scores" VALUES(2,20,0.27548670152066135);
+INSERT INTO "recipe_scores" VALUES(3,20,0.3148955983849665);
+INSERT INTO "recipe_scores" VALUES(4,20,0.41119629693209037);
+INSERT INTO "recipe_scores" VALUES(5,20,0.2373032156596015);
+INSERT INTO "recipe_scores" VALUES(1,21,0.17711792574872179);
+INSERT INTO "recipe_scores" VALUES(2,21,0.15089112666731191);
+INSERT INTO "recipe_scores" VALUES(3,21,0.1564660168382703);
+INSERT INTO "recipe_scores" VALUES(4,21,0.19007927301277625);
+INSERT INTO "recipe_scores" VALUES(5,21,0.14383143330189763);
+INSERT INTO "recipe_scores" VALUES(1,22,0.1696642278767001);
+INSERT INTO "recipe_scores" VALUES(2,22,0.14255024616258063);
+INSERT INTO "recipe_scores" VALUES(3,22,0.14398401665255564);
+INSERT INTO "recipe_scores" VALUES(4,22,0.17642752624791844);
+INSERT INTO "recipe_scores" VALUES(5,22,0.14180217246520674);
+INSERT INTO "recipe_scores" VALUES(1,23,0.17798054898797028);
+INSERT INTO "recipe_scores" VALUES(2,23,0.15136178745757678);
+INSERT INTO "recipe_scores" VALUES(3,23,0.17343763328379785);
+INSERT INTO "recipe_scores" VALUES(4,23,0.19925391950456514);
+INSERT INTO "recipe_scores" VALUES(5,23,0.15637257755572703);
+INSERT INTO "recipe_scores" VALUES(1,24,0.23351909007942642);
+INSERT INTO "recipe_scores" VALUES(2,24,0.18392716547151222);
+INSERT INTO "recipe_scores" VALUES(3,24,0.18401178115990408);
+INSERT INTO "recipe_scores" VALUES(4,24,0.26389144236336753);
+INSERT INTO "recipe_scores" VALUES(5,24,0.16776956813286292);
+INSERT INTO "recipe_scores" VALUES(1,25,0.1333692142011822);
+INSERT INTO "recipe_scores" VALUES(2,25,0.1190353491334334);
+INSERT INTO "recipe_scores" VALUES(3,25,0.12942559991062791);
+INSERT INTO "recipe_scores" VALUES(4,25,0.13240756559150441);
+INSERT INTO "recipe_scores" VALUES(5,25,0.1280396806014919);
+INSERT INTO "recipe_scores" VALUES(1,26,0.15278512003209732);
+INSERT INTO "recipe_scores" VALUES(2,26,0.13241528274427414);
+INSERT INTO "recipe_scores" VALUES(3,26,0.15643905363648217);
+INSERT INTO "recipe_scores" VALUES(4,26,0.15663134274334659);
+INSERT INTO "recipe_scores" VALUES(5,26,0.14540579375464793);
+INSERT INTO "recipe_scores" VALUES(1,27,0.48458987512986346);
+INSERT INTO "recipe_scores" VALUES(2,27,0.69214197489489249);
+INSERT INTO "recipe_scores" VALUES(3,27,0.46144440104509743);
+INSERT INTO "recipe_scores" VALUES(4,27,0.28438765225556795);
+INSERT INTO "recipe_scores" VALUES(5,27,0.48926232483099974);
+INSERT INTO "recipe_scores" VALUES(1,28,0.13542085920034366);
+INSERT INTO "recipe_scores" VALUES(2,28,0.12015099094832936);
+INSERT INTO "recipe_scores" VALUES(3,28,0.13964655146801649);
+INSERT INTO "recipe_scores" VALUES(4,28,0.13424170247136502);
+INSERT INTO "recipe_scores" VALUES(5,28,0.13375595203706539);
+INSERT INTO "recipe_scores" VALUES(1,29,0.23002144686305245);
+INSERT INTO "recipe_scores" VALUES(2,29,0.18375753144019502);
+INSERT INTO "recipe_scores" VALUES(3,29,0.20070594110833975);
+INSERT INTO "recipe_scores" VALUES(4,29,0.2618127575338689);
+INSERT INTO "recipe_scores" VALUES(5,29,0.17446344234336472);
+INSERT INTO "recipe_scores" VALUES(1,30,0.14524397219430088);
+INSERT INTO "recipe_scores" VALUES(2,30,0.12799709684203556);
+INSERT INTO "recipe_scores" VALUES(3,30,0.14774725309806619);
+INSERT INTO "recipe_scores" VALUES(4,30,0.14954314281532047);
+INSERT INTO "recipe_scores" VALUES(5,30,0.13804372926080907);
+INSERT INTO "catalog_version" VALUES(1,'f1b4f7843dc97fee');
+INSERT INTO "catalog_manifest" VALUES('categories',6,'d5581b9c9b1927e8d7ff46efef0b398b2c71405f3ec8409d169e099445f99ed2');
+INSERT INTO "catalog_manifest" VALUES('ingredients',69,'840506281bac895ad284b744ce7ee341cef5bbd67fb0a2f42f1035bb39dff94f');
+INSERT INTO "catalog_manifest" VALUES('score_configs',5,'7037e1321f8744e4186daed36b60f0dc404b5e8995a5fa40a98da0680e6af8c6');
+INSERT INTO "catalog_manifest" VALUES('recipes',30,'3f37a975e6b99fe303bb94f4a30a848bf2b51783c4ce20e41c5ef41656c4c837');
+INSERT INTO "catalog_manifest" VALUES('recipe_ingredients',172,'f22fee3dbeaa8dd9a9cc1f94f850176d6b3ada6e2898b75126fb8a0e457bbfc2');
+INSERT INTO "catalog_manifest" VALUES('recipe_scores',150,'93b8454d90c72605782f2945e500e48ddd3a63c37a71656879c27a216901c901');
+CREATE INDEX recipes_category_idx ON recipes(category_id, name);
+CREATE INDEX recipes_popular_idx ON recipes(review_count DESC) WHERE is_popular = 1;
+CREATE INDEX recipe_ingredients_ingredient_idx ON recipe_ingredients(ingredient_id, recipe_id, quantity, unit);
+CREATE INDEX recipe_scores_rank_idx ON recipe_scores(config_id, score DESC);
+ANALYZE sqlite_master;
+INSERT INTO "sqlite_stat1" VALUES('categories','sqlite_autoindex_categories_1','6 1');
+INSERT INTO "sqlite_stat1" VALUES('ingredients','sqlite_autoindex_ingredients_1','69 1');
+INSERT INTO "sqlite_stat1" VALUES('score_configs','sqlite_autoindex_score_configs_1','5 1');
+INSERT INTO "sqlite_stat1" VALUES('recipes','recipes_category_idx','30 5 1');
+INSERT INTO "sqlite_stat1" VALUES('recipes','recipes_popular_idx','9 1');
+INSERT INTO "sqlite_stat1" VALUES('recipe_ingredients','sqlite_autoindex_recipe_ingredients_1','172 6 1');
+INSERT INTO "sqlite_stat1" VALUES('recipe_ingredients','recipe_ingredients_ingredient_idx','172 3 1 1 1');
+INSERT INTO "sqlite_stat1" VALUES('recipe_scores','recipe_scores','150 30 1');
+INSERT INTO "sqlite_stat1" VALUES('recipe_scores','recipe_scores_rank_idx','150 30 1');
 COMMIT;
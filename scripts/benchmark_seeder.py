@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the recipe seeder over synthetic catalogs.
+
+``synthetic_catalog`` builds a deterministic catalog of any size from the real
+``INGREDIENT_CATALOG`` and ``CATEGORY_DESCRIPTIONS``: ingredient choices, row
+counts, quantities, servings and images are sampled from the bundled recipes, so
+generated rows look like the hand-written ones. A quarter of the rows whose
+ingredient converts from another unit (``unit_factor``) use that unit, about
+one row in ten overall, so the unit conversions are timed too.
+
+The benchmark sweeps catalog sizes (1k to 1M recipes by default) and runs every
+size in a fresh interpreter so that peak RSS belongs to that size alone. Each
+case records wall time per phase (``build``, ``insert``, ``analyze``,
+``vacuum``, ``dump``, ``write``), peak RSS and output sizes; ``--output`` saves them as JSON that ``--baseline``
+can compare against on a later commit.
+
+``--macro-queries`` instead times the ``recipe_macros`` R*Tree against full
+scans of ``recipes``: macro-box lookups through ``recipes_in_box`` and
+nearest-target lookups through ``nearest_recipes`` for every score preset.
+
+``--sinks`` times one seed run with the outputs fed in turn against one worker
+process per output (``seed_recipe_database.py --parallel-sinks``).
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from seed_recipe_database import (
+    BULK_CHUNK_SIZE,
+    CATEGORY_DESCRIPTIONS,
+    DEFAULT_PAGE_SIZE,
+    DUMP_BUFFER_SIZE,
+    INGREDIENT_CATALOG,
+    MACRO_COLUMNS,
+    SCORE_PRESETS,
+    Catalog,
+    MacroBox,
+    Recipe,
+    ScoreConfig,
+    StringPool,
+    build_database,
+    UNITS,
+    build_recipe,
+    builtin_recipes,
+    nearest_recipes,
+    recipes_in_box,
+    seed_database,
+    unit_factor,
+    write_sql_dump,
+)
+
+RESULTS_FORMAT_VERSION = 2
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+PHASES = ("build", "insert", "analyze", "vacuum", "dump", "write")
+# Share of rows with a convertible ingredient that use another unit.
+OTHER_UNIT_SHARE = 0.25
+DEFAULT_MACRO_QUERY_SIZES = (1_000_000,)
+DEFAULT_SINK_SIZES = (1_000, 20_000, 100_000)
+# findOptimalRecipe's filter, which OPTIMAL_SCORES_QUERY serves as well.
+OPTIMAL_BOX = MacroBox(calories=(400, 800), protein=(20, None))
+
+DISHES = {
+    "Breakfast": ("Bowl", "Scramble", "Toast", "Parfait", "Pancakes"),
+    "Lunch": ("Salad", "Wrap", "Grain Bowl", "Sandwich", "Soup"),
+    "Dinner": ("Stir-Fry", "Bake", "Skillet", "Curry", "Roast"),
+    "Snack": ("Bites", "Dip", "Bar", "Crisps", "Cups"),
+    "Desert": ("Pudding", "Mousse", "Crumble", "Cake", "Tart"),
+    "Beverage": ("Smoothie", "Shake", "Cooler", "Latte", "Tonic"),
+}
+
+STEPS = (
+    "Prep the {first} and {second}.",
+    "Warm a pan over medium heat and cook the {first} for {minutes} minutes.",
+    "Stir in the {second} and {third} and cook until heated through.",
+    "Whisk the {third} with a pinch of salt.",
+    "Combine everything in a bowl and toss to coat.",
+    "Blend until smooth, adding the {second} a little at a time.",
+    "Let rest for {minutes} minutes before serving.",
+    "Portion into servings and finish with the {third}.",
+)
+
+
+class SyntheticRecipes:
+    """Re-iterable stream of ``count`` generated recipes; the same seed gives the same recipes."""
+
+    __slots__ = ("count", "seed")
+
+    def __init__(self, count: int, seed: int = 0) -> None:
+        self.count = count
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Recipe]:
+        rng = random.Random(self.seed)
+        bundled = builtin_recipes()
+        categories = list(CATEGORY_DESCRIPTIONS)
+        # Ingredients the bundled recipes use per category, falling back to the
+        # whole catalog for categories without recipes.
+        pools: Dict[str, List[str]] = {category: [] for category in categories}
+        # Quantities seen per ingredient, and per unit for ingredients the
+        # bundled recipes never use.
+        quantities: Dict[str, List[float]] = {}
+        row_counts = []
+        for recipe in bundled:
+            row_counts.append(len(recipe.ingredient_rows))
+            pool = pools.setdefault(recipe.category, [])
+            for ingredient, quantity, unit, *_ in recipe.ingredient_rows.tuples():
+                if ingredient not in pool:
+                    pool.append(ingredient)
+                quantities.setdefault(ingredient, []).append(quantity)
+                quantities.setdefault(unit, []).append(quantity)
+        servings = [recipe.servings for recipe in bundled]
+        images = [recipe.image_url for recipe in bundled]
+        strings = StringPool()
+        # Units other than the default that each ingredient converts from.
+        other_units = {
+            name: [unit for unit in UNITS if unit != ingredient.default_unit and unit_factor(ingredient, unit)]
+            for name, ingredient in INGREDIENT_CATALOG.items()
+        }
+
+        for index in range(1, self.count + 1):
+            category = rng.choice(categories)
+            count = rng.choice(row_counts)
+            pool = pools[category]
+            if len(pool) < count:
+                pool = list(INGREDIENT_CATALOG)
+            names = rng.sample(pool, count)
+            rows = []
+            for name in names:
+                ingredient = INGREDIENT_CATALOG[name]
+                unit = ingredient.default_unit
+                choices = quantities.get(name) or quantities.get(unit) or (1.0,)
+                quantity = rng.choice(choices)
+                if other_units[name] and rng.random() < OTHER_UNIT_SHARE:
+                    unit = rng.choice(other_units[name])
+                    quantity = max(round(quantity / unit_factor(ingredient, unit), 1), 0.5)
+                rows.append((name, quantity, unit, None))
+            words = {
+                "first": names[0].lower(),
+                "second": names[1 % count].lower(),
+                "third": names[2 % count].lower(),
+                "minutes": rng.randrange(2, 16),
+            }
+            dish = rng.choice(DISHES.get(category, ("Plate",)))
+            yield build_recipe(
+                name=f"{names[0]} {dish} #{index}",
+                category=category,
+                description=f"{dish} with {words['first']}, {words['second']} and {words['third']}.",
+                instructions=[
+                    STEPS[step].format(**words) for step in sorted(rng.sample(range(len(STEPS)), rng.randint(3, 5)))
+                ],
+                servings=rng.choice(servings),
+                image_url=rng.choice(images),
+                prep_minutes=rng.randrange(5, 35, 5),
+                cook_minutes=rng.randrange(0, 65, 5),
+                review_count=rng.randrange(0, 500),
+                is_popular=rng.random() < 0.15,
+                ingredients=rows,
+                strings=strings,
+            )
+
+
+def synthetic_catalog(recipes: int, seed: int = 0, materialize: bool = True) -> Catalog:
+    """Return a catalog of ``recipes`` generated recipes over the real categories and ingredients.
+
+    With ``materialize=False`` the recipes are regenerated on every pass instead
+    of being held in memory.
+    """
+    generated = SyntheticRecipes(recipes, seed)
+    return Catalog(CATEGORY_DESCRIPTIONS, INGREDIENT_CATALOG, list(generated) if materialize else generated)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or ``None`` where ``resource`` is unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class TimedFile(io.RawIOBase):
+    """Unbuffered binary file that records the seconds spent writing it, including the ``fsync`` on close."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.file = open(path, "wb", buffering=0)
+        self.seconds = 0.0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def write(self, data: bytes) -> int:
+        started = time.perf_counter()
+        written = self.file.write(data)
+        self.seconds += time.perf_counter() - started
+        return written
+
+    def close(self) -> None:
+        if not self.closed:
+            started = time.perf_counter()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.seconds += time.perf_counter() - started
+        super().close()
+
+
+def run_case(
+    recipes: int,
+    workdir: Path,
+    seed: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict:
+    """Build, dump and load one synthetic catalog in ``workdir`` and return its measurements.
+
+    ``dump`` is the time spent rendering ``recipes.sql`` and ``write`` the time
+    its bytes spend in ``write`` calls and the final ``fsync``. The database
+    is timed as ``insert`` (schema, rows and indexes), ``analyze`` and
+    ``vacuum`` (``VACUUM INTO`` the shipped file).
+    """
+    seconds: Dict[str, float] = {}
+    started = time.perf_counter()
+    catalog = synthetic_catalog(recipes, seed)
+    seconds["build"] = time.perf_counter() - started
+
+    dump_path = workdir / "recipes.sql"
+    started = time.perf_counter()
+    dump_file = TimedFile(dump_path)
+    buffered = io.BufferedWriter(dump_file, DUMP_BUFFER_SIZE)
+    with io.TextIOWrapper(buffered, encoding="utf-8", newline="\n") as handle:
+        sections = write_sql_dump(handle, catalog)
+    seconds["write"] = dump_file.seconds
+    seconds["dump"] = time.perf_counter() - started - dump_file.seconds
+
+    database_path = workdir / "recipes.db"
+    steps: Dict[str, float] = {}
+    build_database(database_path, catalog, page_size, chunk_size, steps)
+    seconds["insert"] = steps["schema"] + steps["insert"] + steps["indexes"]
+    seconds["analyze"] = steps["analyze"]
+    seconds["vacuum"] = steps["write"]
+    return {
+        "recipes": recipes,
+        "ingredient_rows": sections["recipe_ingredients"].rows,
+        "seconds": {phase: seconds[phase] for phase in PHASES},
+        "peak_rss_bytes": peak_rss_bytes(),
+        "sql_bytes": dump_path.stat().st_size,
+        "db_bytes": database_path.stat().st_size,
+    }
+
+
+def _box_filter(box: MacroBox) -> Tuple[str, List[float]]:
+    conditions = []
+    params: List[float] = []
+    for macro, (low, high) in zip(MACRO_COLUMNS, box):
+        if low is not None:
+            conditions.append(f"{macro}_per_serving >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"{macro}_per_serving <= ?")
+            params.append(high)
+    return " AND ".join(conditions) or "1", params
+
+
+def _scan_in_box(conn, box: MacroBox) -> List[int]:
+    where, params = _box_filter(box)
+    return [row[0] for row in conn.execute(f"SELECT id FROM recipes WHERE {where} ORDER BY id", params)]
+
+
+def _scan_nearest(conn, config: ScoreConfig, k: int, box: MacroBox) -> List[int]:
+    """The ``k`` best recipes by ``ScoreConfig.error``, computed by SQLite over every recipe in ``box``."""
+    terms = []
+    for macro, target, weight in zip(
+        MACRO_COLUMNS,
+        (config.target_calories, config.target_protein, config.target_fat, config.target_carbs),
+        (config.weight_calories, config.weight_protein, config.weight_fat, config.weight_carbs),
+    ):
+        relative = f"(({macro}_per_serving - {target!r}) / {target!r})"
+        terms.append(f"{relative} * {relative} * {weight!r}")
+    where, params = _box_filter(box)
+    query = f"SELECT id FROM recipes WHERE {where} ORDER BY {' + '.join(terms)}, id LIMIT {int(k)}"
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def _best_seconds(function, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_macro_queries(
+    recipes: int, workdir: Path, seed: int = 0, boxes: int = 20, k: int = 10, repeats: int = 3
+) -> Dict:
+    """Time R*Tree macro queries against full scans on a synthetic catalog of ``recipes`` recipes.
+
+    ``boxes`` random boxes (a 100 kcal and a 10 g protein window, with an upper
+    fat bound) go through ``recipes_in_box``, and every score preset through
+    ``nearest_recipes`` with and without ``OPTIMAL_BOX``. Each query runs
+    ``repeats`` times on both paths; the best times are summed and the results
+    must agree.
+    """
+    import sqlite3
+    from contextlib import closing
+
+    database_path = workdir / "recipes.db"
+    started = time.perf_counter()
+    build_database(database_path, synthetic_catalog(recipes, seed, materialize=False), macro_index=True)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    box_queries = []
+    for _ in range(boxes):
+        calories = rng.uniform(150, 900)
+        protein = rng.uniform(5, 45)
+        box_queries.append(
+            MacroBox(calories=(calories, calories + 100), protein=(protein, protein + 10), fat=(None, rng.uniform(10, 40)))
+        )
+    nearest_queries = [(config, box) for config in SCORE_PRESETS.values() for box in (MacroBox(), OPTIMAL_BOX)]
+
+    seconds = {"box_rtree": 0.0, "box_scan": 0.0, "nearest_rtree": 0.0, "nearest_scan": 0.0}
+    matches = 0
+    with closing(sqlite3.connect(database_path)) as conn:
+        for box in box_queries:
+            found = recipes_in_box(conn, box)
+            if found != _scan_in_box(conn, box):
+                raise AssertionError(f"recipes_in_box differs from a full scan for {box}")
+            matches += len(found)
+            seconds["box_rtree"] += _best_seconds(lambda: recipes_in_box(conn, box), repeats)
+            seconds["box_scan"] += _best_seconds(lambda: _scan_in_box(conn, box), repeats)
+        for config, box in nearest_queries:
+            # Compared by score: recipes with equal scores may tie-break
+            # differently when their errors differ in the last bit.
+            found = [score for _, score in nearest_recipes(conn, config, k, box)]
+            scanned = conn.execute(
+                "SELECT calories_per_serving, protein_per_serving, fat_per_serving, carbs_per_serving "
+                f"FROM recipes WHERE id IN ({','.join(map(str, _scan_nearest(conn, config, k, box)))})"
+            ).fetchall()
+            if found != sorted((config.score(*row) for row in scanned), reverse=True):
+                raise AssertionError(f"nearest_recipes differs from a full scan for {config}")
+            seconds["nearest_rtree"] += _best_seconds(lambda: nearest_recipes(conn, config, k, box), repeats)
+            seconds["nearest_scan"] += _best_seconds(lambda: _scan_nearest(conn, config, k, box), repeats)
+    return {
+        "recipes": recipes,
+        "build_seconds": build_seconds,
+        "db_bytes": database_path.stat().st_size,
+        "box_queries": len(box_queries),
+        "box_matches": matches,
+        "nearest_queries": len(nearest_queries),
+        "k": k,
+        "seconds": seconds,
+    }
+
+
+def describe_macro_queries(result: Dict) -> List[str]:
+    seconds = result["seconds"]
+    lines = [f"{result['recipes']:>9,} recipes: R*Tree database built in {result['build_seconds']:.1f}s"]
+    for kind, count, detail in (
+        ("box", result["box_queries"], f"{result['box_matches'] / result['box_queries']:,.0f} matches each"),
+        ("nearest", result["nearest_queries"], f"k={result['k']}"),
+    ):
+        rtree = seconds[f"{kind}_rtree"] / count
+        scan = seconds[f"{kind}_scan"] / count
+        lines.append(
+            f"  {kind:<8} {count} queries ({detail}): R*Tree {rtree * 1000:.2f} ms, "
+            f"full scan {scan * 1000:.2f} ms ({scan / rtree:.0f}x)"
+        )
+    return lines
+
+
+def run_sink_comparison(recipes: int, workdir: Path, seed: int = 0) -> Dict:
+    """Time ``seed_database`` on a synthetic catalog with the sinks in turn and in worker processes.
+
+    Both runs write the dump, the database, the app database and the shards
+    from scratch, and must produce the same dump.
+    """
+    from contextlib import redirect_stdout
+
+    seconds = {}
+    for mode, processes in (("in_turn", False), ("processes", True)):
+        directory = workdir / mode
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            seed_database(
+                directory / "recipes.sql",
+                directory / "recipes.db",
+                force=True,
+                catalog=synthetic_catalog(recipes, seed, materialize=False),
+                app_database_path=directory / "recipes_v2.db",
+                shard_directory=directory / "shards",
+                processes=processes,
+            )
+        seconds[mode] = time.perf_counter() - started
+    if (workdir / "in_turn" / "recipes.sql").read_bytes() != (workdir / "processes" / "recipes.sql").read_bytes():
+        raise AssertionError("worker processes wrote a different dump")
+    return {"recipes": recipes, "cpus": os.cpu_count(), "seconds": seconds}
+
+
+def describe_sink_comparison(result: Dict) -> str:
+    in_turn, processes = result["seconds"]["in_turn"], result["seconds"]["processes"]
+    return (
+        f"{result['recipes']:>9,} recipes, {result['cpus']} CPU(s): in turn {in_turn:.2f}s, "
+        f"worker processes {processes:.2f}s ({in_turn / processes:.2f}x)"
+    )
+
+
+def _environment() -> Dict[str, str | None]:
+    import platform
+    import sqlite3
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+
+def run_sweep(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    seed: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict:
+    """Run ``run_case`` for every size, each in its own interpreter, and collect the results."""
+    cases = []
+    for recipes in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--case",
+                    str(recipes),
+                    "--workdir",
+                    workdir,
+                    "--seed",
+                    str(seed),
+                    "--page-size",
+                    str(page_size),
+                    "--chunk-size",
+                    str(chunk_size),
+                ],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        case = json.loads(result.stdout)
+        print(describe_case(case), flush=True)
+        cases.append(case)
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        **_environment(),
+        "seed": seed,
+        "page_size": page_size,
+        "chunk_size": chunk_size,
+        "cases": cases,
+    }
+
+
+def describe_case(case: Dict) -> str:
+    phases = " ".join(f"{phase} {case['seconds'][phase]:.2f}s" for phase in PHASES)
+    rss = case["peak_rss_bytes"]
+    rss_text = f"{rss / 2**20:.0f} MiB" if rss is not None else "n/a"
+    return (
+        f"{case['recipes']:>9,} recipes ({case['ingredient_rows']:,} rows): {phases}; "
+        f"peak RSS {rss_text}; sql {case['sql_bytes'] / 2**20:.1f} MiB, db {case['db_bytes'] / 2**20:.1f} MiB"
+    )
+
+
+def compare_results(current: Dict, baseline: Dict) -> List[str]:
+    """Describe per-phase time and peak RSS of ``current`` relative to ``baseline``, per shared size."""
+    previous = {case["recipes"]: case for case in baseline["cases"]}
+    lines = []
+    for case in current["cases"]:
+        before = previous.get(case["recipes"])
+        if before is None:
+            continue
+        ratios = []
+        for phase in PHASES:
+            if before["seconds"][phase]:
+                ratios.append(f"{phase} {case['seconds'][phase] / before['seconds'][phase]:.2f}x")
+        if case["peak_rss_bytes"] and before["peak_rss_bytes"]:
+            ratios.append(f"peak RSS {case['peak_rss_bytes'] / before['peak_rss_bytes']:.2f}x")
+        lines.append(f"{case['recipes']:>9,} recipes vs {baseline.get('commit') or 'baseline'}: {', '.join(ratios)}")
+    return lines
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="catalog sizes in recipes (default: 1000 10000 100000 1000000)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic catalogs")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="page size of the SQLite asset")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="rows per executemany batch")
+    parser.add_argument("--output", type=Path, help="write the results as JSON to this path")
+    parser.add_argument("--baseline", type=Path, help="earlier --output results to compare against")
+    parser.add_argument(
+        "--macro-queries",
+        action="store_true",
+        help="benchmark recipe_macros R*Tree queries against full scans instead (default size: 1000000)",
+    )
+    parser.add_argument(
+        "--sinks",
+        action="store_true",
+        help="time a seed run with the outputs in turn against --parallel-sinks instead "
+        "(default sizes: 1000 20000 100000)",
+    )
+    parser.add_argument("--case", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.case is not None:
+        # Child process of run_sweep: measure a single size and report it on stdout.
+        print(json.dumps(run_case(args.case, args.workdir, args.seed, args.page_size, args.chunk_size)))
+        return
+    if args.macro_queries and args.sinks:
+        parser.error("--macro-queries and --sinks are separate benchmarks")
+    if args.sizes is None:
+        args.sizes = list(
+            DEFAULT_MACRO_QUERY_SIZES if args.macro_queries else DEFAULT_SINK_SIZES if args.sinks else DEFAULT_SIZES
+        )
+    if any(size < 1 for size in args.sizes):
+        parser.error("--sizes must be positive")
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("format") != RESULTS_FORMAT_VERSION:
+            parser.error(f"{args.baseline} has results format {baseline.get('format')}, not {RESULTS_FORMAT_VERSION}")
+    if args.macro_queries:
+        results = []
+        for recipes in args.sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                result = run_macro_queries(recipes, Path(workdir), args.seed)
+            print("\n".join(describe_macro_queries(result)), flush=True)
+            results.append(result)
+        if args.output is not None:
+            payload = {"format": RESULTS_FORMAT_VERSION, **_environment(), "seed": args.seed, "macro_queries": results}
+            args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            print(f"Wrote benchmark results to {args.output}")
+        return
+    if args.sinks:
+        results = []
+        for recipes in args.sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                result = run_sink_comparison(recipes, Path(workdir), args.seed)
+            print(describe_sink_comparison(result), flush=True)
+            results.append(result)
+        if args.output is not None:
+            payload = {"format": RESULTS_FORMAT_VERSION, **_environment(), "seed": args.seed, "sinks": results}
+            args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            print(f"Wrote benchmark results to {args.output}")
+        return
+
+    results = run_sweep(args.sizes, args.seed, args.page_size, args.chunk_size)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote benchmark results to {args.output}")
+    if baseline is not None:
+        for line in compare_results(results, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
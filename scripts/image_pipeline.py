@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""Prefetch the catalog's recipe images and bundle thumbnails.
+
+Every recipe carries a remote ``image_url`` that the app downloads at full
+size (1260x750) at runtime. This pipeline downloads them once at build time:
+
+1. An ``asyncio.Semaphore`` lets ``concurrency`` of the unique URLs be
+   fetched at once. ``http.client`` blocks, so each request runs on one of
+   ``concurrency`` worker threads, over a connection from ``HttpClient``'s
+   pool of HTTP/1.1 keep-alive connections; images from one CDN reuse a
+   handful of connections instead of opening one (and a TLS handshake) per
+   image.
+2. ``ImageCache`` stores each body under its SHA-256 and keeps a small record
+   per URL pointing at it, with the image's dimensions read from its header.
+   URLs already in the cache are never requested again.
+3. Thumbnails are scaled to fit ``THUMBNAIL_SIZE`` and written as JPEGs
+   named after the source image's hash, so they are only regenerated when the
+   image or the size changes.
+
+``write_image_manifest`` records the thumbnails and both sets of dimensions
+in a JSON manifest (``build/recipe_images.json`` by default), which
+``seed_recipe_database.py --images`` turns into the ``recipe_images`` table of
+every output. A rerun with a warm cache does no network I/O, and
+``StandInServer`` serves generated images over local HTTP so the whole
+pipeline can be exercised offline.
+
+Downloading, caching and reading dimensions use the standard library only.
+Generating thumbnails requires Pillow.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from seed_recipe_database import IMAGES_COLUMNS, IMAGES_MANIFEST_VERSION, default_images_path
+
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 30.0
+MAX_REDIRECTS = 5
+MAX_IMAGE_BYTES = 32 * 1024 * 1024
+USER_AGENT = "recipe-image-pipeline/1"
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+# Bounding box of the bundled thumbnails; keeps the catalog's 1260x750 aspect ratio.
+THUMBNAIL_SIZE = (320, 190)
+THUMBNAIL_QUALITY = 82
+
+
+class HttpError(Exception):
+    """Raised when an image URL cannot be fetched."""
+
+
+class Response(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class HttpClient:
+    """Blocking GET requests over a thread-safe pool of keep-alive ``http.client`` connections.
+
+    A request takes an idle connection to its scheme, host and port, or opens
+    one, and puts it back once the response is read, so the pool never holds
+    more connections than there were requests in flight at once. A kept
+    connection the server has closed in the meantime is retried once on a
+    fresh one.
+    """
+
+    def __init__(self, timeout: float = REQUEST_TIMEOUT) -> None:
+        self.timeout = timeout
+        self.connections = 0
+        self.requests = 0
+        self.received = 0
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._open: List[http.client.HTTPConnection] = []
+        self._ssl = None
+
+    def get(self, url: str) -> Response:
+        """Fetch ``url``, following redirects."""
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request(url)
+            if response.status not in REDIRECT_STATUSES or "location" not in response.headers:
+                return response
+            url = urljoin(url, response.headers["location"])
+        raise HttpError(f"{url}: more than {MAX_REDIRECTS} redirects")
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._open:
+                connection.close()
+            self._open.clear()
+            self._idle.clear()
+
+    def _request(self, url: str) -> Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HttpError(f"{url}: not an http(s) URL")
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if not target.isascii():
+            raise HttpError(f"{url}: URL is not percent-encoded")
+        headers = {"User-Agent": USER_AGENT, "Accept": "image/*", "Accept-Encoding": "identity"}
+        while True:
+            with self._lock:
+                idle = self._idle.get(origin)
+                connection = idle.pop() if idle else None
+            reused = connection is not None
+            if connection is None:
+                connection = self._connect(origin)
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                length = response.getheader("content-length")
+                if length is not None and length.isdigit() and int(length) > MAX_IMAGE_BYTES:
+                    raise HttpError(f"{url}: response of {length} bytes is over the {MAX_IMAGE_BYTES} byte limit")
+                body = response.read(MAX_IMAGE_BYTES + 1)
+                if len(body) > MAX_IMAGE_BYTES:
+                    raise HttpError(f"{url}: response is over the {MAX_IMAGE_BYTES} byte limit")
+            except TimeoutError as exc:
+                connection.close()
+                raise HttpError(f"{url}: no response within {self.timeout:g}s") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                if reused:
+                    continue
+                raise HttpError(f"{url}: {str(exc) or type(exc).__name__}") from exc
+            except BaseException:
+                connection.close()
+                raise
+            with self._lock:
+                self.requests += 1
+                self.received += len(body)
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._idle.setdefault(origin, []).append(connection)
+            return Response(url, response.status, {name.lower(): value for name, value in response.getheaders()}, body)
+
+    def _connect(self, origin: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        if scheme == "https":
+            with self._lock:
+                if self._ssl is None:
+                    import ssl
+
+                    self._ssl = ssl.create_default_context()
+            connection = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        try:
+            connection.connect()
+        except OSError as exc:
+            connection.close()
+            raise HttpError(f"cannot connect to {host}:{port}: {str(exc) or type(exc).__name__}") from exc
+        with self._lock:
+            self.connections += 1
+            self._open.append(connection)
+        return connection
+
+
+def image_size(data: bytes) -> Tuple[int, int] | None:
+    """Width and height from a PNG, GIF, JPEG or WebP header, without decoding the image."""
+    try:
+        if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+            return struct.unpack(">II", data[16:24])
+        if data[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", data[6:10])
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            chunk = data[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", data[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(data[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+            return None
+        if data[:2] == b"\xff\xd8":
+            offset = 2
+            while offset + 4 <= len(data):
+                if data[offset] != 0xFF:
+                    return None
+                marker = data[offset + 1]
+                if marker == 0xFF:
+                    offset += 1
+                    continue
+                if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                    offset += 2
+                    continue
+                # Start-of-frame markers carry the dimensions; C4, C8 and CC are other segments.
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+                    return width, height
+                offset += 2 + struct.unpack(">H", data[offset + 2 : offset + 4])[0]
+    except struct.error:
+        return None
+    return None
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    sha256: str
+    content_type: str
+    width: int
+    height: int
+
+
+class ImageCache:
+    """Content-addressed store of downloaded images, looked up by URL.
+
+    Bodies live under ``objects/`` named by their SHA-256, so URLs serving the
+    same bytes share one file. ``urls/`` holds a JSON record per URL, named by
+    the SHA-256 of the URL, with the body's hash, content type and dimensions.
+    Both are written atomically, so an interrupted run leaves no partial entry.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def object_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / digest
+
+    def record_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "urls" / key[:2] / f"{key}.json"
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for ``url``, or None when it has not been downloaded."""
+        try:
+            record = json.loads(self.record_path(url).read_text(encoding="utf-8"))
+            entry = CacheEntry(**record)
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self.object_path(entry.sha256).exists():
+            return None
+        return entry
+
+    def read(self, entry: CacheEntry) -> bytes:
+        return self.object_path(entry.sha256).read_bytes()
+
+    def put(self, url: str, body: bytes, content_type: str = "") -> CacheEntry:
+        """Store ``body`` as the image for ``url``; raises ValueError when it is not an image."""
+        dimensions = image_size(body)
+        if dimensions is None:
+            raise ValueError(f"{url}: not a PNG, JPEG, GIF or WebP image ({content_type or 'no content type'})")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            _write_atomic(path, body)
+        entry = CacheEntry(url, digest, content_type, *dimensions)
+        _write_atomic(self.record_path(url), json.dumps(entry._asdict(), sort_keys=True).encode("utf-8"))
+        return entry
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+def make_thumbnail(data: bytes, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Tuple[bytes, int, int]:
+    """Scale an image to fit in ``size`` and encode it as a JPEG. Requires Pillow."""
+    from io import BytesIO
+
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as image:
+        thumbnail = ImageOps.exif_transpose(image).convert("RGB")
+    thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+    output = BytesIO()
+    thumbnail.save(output, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=False)
+    return output.getvalue(), thumbnail.width, thumbnail.height
+
+
+def thumbnail_name(digest: str, size: Tuple[int, int]) -> str:
+    return f"{digest[:16]}-{size[0]}x{size[1]}.jpg"
+
+
+class ImageResult(NamedTuple):
+    url: str
+    sha256: str
+    width: int
+    height: int
+    thumbnail: str
+    thumbnail_width: int
+    thumbnail_height: int
+
+
+class Prefetch(NamedTuple):
+    """Outcome of ``prefetch_images``: results and failures by URL, plus network counters."""
+
+    images: Dict[str, ImageResult]
+    failures: Dict[str, str]
+    downloaded: int
+    cached: int
+    connections: int
+    received: int
+    seconds: float
+
+
+async def prefetch_images(
+    urls: Iterable[str],
+    cache: ImageCache,
+    thumbnails: Path,
+    size: Tuple[int, int] = THUMBNAIL_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Prefetch:
+    """Download every URL not in ``cache`` and write its thumbnail into ``thumbnails``.
+
+    An ``asyncio.Semaphore`` admits ``concurrency`` URLs at a time; their
+    downloads and thumbnails run on as many worker threads (the loop's default
+    executor may have fewer), so at most ``concurrency`` connections are open.
+    A URL that fails (HTTP error, timeout, not an image) is reported in
+    ``failures`` and does not stop the others.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    thumbnails = Path(thumbnails)
+    thumbnails.mkdir(parents=True, exist_ok=True)
+    client = HttpClient(timeout)
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    workers = ThreadPoolExecutor(max(concurrency, 1), thread_name_prefix="image")
+    loop = asyncio.get_running_loop()
+
+    async def fetch(url: str) -> Tuple[ImageResult, bool]:
+        entry = cache.get(url)
+        downloaded = entry is None
+        if downloaded:
+            response = await loop.run_in_executor(workers, client.get, url)
+            if response.status != 200:
+                raise HttpError(f"{url}: HTTP {response.status}")
+            entry = cache.put(url, response.body, response.headers.get("content-type", ""))
+        name = thumbnail_name(entry.sha256, size)
+        path = thumbnails / name
+        dimensions = image_size(path.read_bytes()) if path.exists() else None
+        if dimensions is None:
+            data, width, height = await loop.run_in_executor(workers, make_thumbnail, cache.read(entry), size)
+            _write_atomic(path, data)
+            dimensions = (width, height)
+        return ImageResult(url, entry.sha256, entry.width, entry.height, name, *dimensions), downloaded
+
+    async def attempt(url: str) -> Tuple[str, Tuple[ImageResult, bool] | None, str | None]:
+        async with slots:
+            try:
+                return url, await fetch(url), None
+            except (HttpError, OSError, ValueError) as exc:
+                return url, None, str(exc)
+
+    images: Dict[str, ImageResult] = {}
+    failures: Dict[str, str] = {}
+    downloaded = cached = 0
+    try:
+        outcomes = await asyncio.gather(*(attempt(url) for url in dict.fromkeys(urls)))
+    finally:
+        workers.shutdown()
+        client.close()
+    for url, result, error in outcomes:
+        if result is None:
+            failures[url] = error
+            continue
+        images[url], fresh = result
+        downloaded += fresh
+        cached += not fresh
+    return Prefetch(
+        images,
+        failures,
+        downloaded,
+        cached,
+        client.connections,
+        client.received,
+        time.perf_counter() - started,
+    )
+
+
+def catalog_image_urls(database: Path | None = None) -> List[str]:
+    """Image URLs of the built-in catalog's recipes, or of the recipes in a seeded ``database``."""
+    if database is None:
+        from seed_recipe_database import builtin_recipes
+
+        urls = [recipe.image_url for recipe in builtin_recipes()]
+    else:
+        with closing(sqlite3.connect(f"{database.resolve().as_uri()}?mode=ro", uri=True)) as conn:
+            urls = [url for (url,) in conn.execute("SELECT image_url FROM recipes ORDER BY id")]
+    return [url for url in dict.fromkeys(urls) if url]
+
+
+def write_image_manifest(path: Path, images: Mapping[str, ImageResult], size: Tuple[int, int]) -> int:
+    """Write ``images`` as the manifest ``seed_recipe_database.py --images`` reads; returns the rows written."""
+    rows = [dict(zip(IMAGES_COLUMNS, image)) for _, image in sorted(images.items())]
+    manifest = {"format": IMAGES_MANIFEST_VERSION, "thumbnail_size": list(size), "images": rows}
+    _write_atomic(Path(path), (json.dumps(manifest, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+    return len(rows)
+
+
+def prune_thumbnails(directory: Path, keep: Iterable[str]) -> int:
+    """Delete thumbnails in ``directory`` that no recipe uses any more; returns how many."""
+    keep = set(keep)
+    removed = 0
+    for path in Path(directory).glob("????????????????-*x*.jpg"):
+        if path.name not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def default_cache_directory() -> Path:
+    return Path(__file__).resolve().parent / ".image-cache"
+
+
+def default_thumbnail_directory() -> Path:
+    return Path(__file__).resolve().parent.parent / "assets" / "images" / "thumbnails"
+
+
+def synthetic_png(width: int, height: int, shade: int = 0) -> bytes:
+    """A ``width`` x ``height`` gradient as an RGB PNG, encoded with zlib only."""
+    row = b"\x00" + bytes(
+        channel for x in range(width) for channel in (x * 255 // max(width - 1, 1), shade & 0xFF, 255 - (shade & 0xFF))
+    )
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+class StandInServer:
+    """Local HTTP/1.1 server standing in for the image CDN.
+
+    Serves ``images`` (path -> body) from 127.0.0.1 with keep-alive, counting
+    connections and requests. Paths under ``/redirect/`` answer with a redirect
+    to the same path without the prefix, and ``chunked`` paths are sent with
+    chunked transfer encoding, so both code paths of ``HttpClient`` get used.
+    """
+
+    def __init__(self, images: Mapping[str, bytes], chunked: Iterable[str] = ()) -> None:
+        self.images = dict(images)
+        self.chunked = set(chunked)
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                path = urlsplit(self.path).path
+                if path.startswith("/redirect/"):
+                    self.send_response(302)
+                    self.send_header("Location", path[len("/redirect") :])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.images.get(path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                if path in server.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for start in range(0, len(body), 64 * 1024):
+                        piece = body[start : start + 64 * 1024]
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def origin(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def stand_in_check(
+    urls: Sequence[str],
+    size: Tuple[int, int] = THUMBNAIL_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[str, float]:
+    """Run the pipeline twice against a ``StandInServer`` in a scratch directory.
+
+    Each catalog URL is served a generated 1260x750 PNG, a third of them
+    through a redirect and a third chunked. The first run must download every
+    image over at most ``concurrency`` connections and record the right
+    dimensions; the second must not make a single request.
+    """
+    paths = [f"/{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.png" for url in dict.fromkeys(urls)]
+    images = {path: synthetic_png(1260, 750, shade=index * 37) for index, path in enumerate(paths)}
+    with StandInServer(images, chunked=paths[1::3]) as server, tempfile.TemporaryDirectory() as scratch:
+        requested = [
+            f"{server.origin}/redirect{path}" if index % 3 == 2 else f"{server.origin}{path}"
+            for index, path in enumerate(paths)
+        ]
+        cache = ImageCache(Path(scratch) / "cache")
+        thumbnails = Path(scratch) / "thumbnails"
+        first = asyncio.run(prefetch_images(requested, cache, thumbnails, size, concurrency))
+        if first.failures:
+            raise AssertionError(f"stand-in downloads failed: {next(iter(first.failures.values()))}")
+        if first.downloaded != len(paths) or first.connections > concurrency:
+            raise AssertionError(
+                f"expected {len(paths)} downloads over at most {concurrency} connections, "
+                f"got {first.downloaded} over {first.connections}"
+            )
+        scale = min(size[0] / 1260, size[1] / 750)
+        for result in first.images.values():
+            if (result.width, result.height) != (1260, 750) or max(
+                abs(result.thumbnail_width - 1260 * scale), abs(result.thumbnail_height - 750 * scale)
+            ) > 1:
+                raise AssertionError(f"wrong dimensions recorded for {result.url}: {result}")
+        requests = server.requests
+        second = asyncio.run(prefetch_images(requested, cache, thumbnails, size, concurrency))
+        if server.requests != requests or second.downloaded or second.connections:
+            raise AssertionError(f"warm rerun made {server.requests - requests} requests")
+        if second.images != first.images:
+            raise AssertionError("warm rerun returned different results")
+        return {
+            "images": float(len(paths)),
+            "requests": float(requests),
+            "connections": float(server.connections),
+            "received": float(first.received),
+            "cold_seconds": first.seconds,
+            "warm_seconds": second.seconds,
+        }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Prefetch recipe images, bundle thumbnails and write the manifest the seeder reads."
+    )
+    parser.add_argument(
+        "--database",
+        type=Path,
+        help="read the image URLs from this seeded catalog (opened read-only) instead of the built-in recipes",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=default_images_path(),
+        help="manifest for seed_recipe_database.py --images (default: build/recipe_images.json)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=default_cache_directory(),
+        help="content-addressed download cache (default: scripts/.image-cache)",
+    )
+    parser.add_argument(
+        "--thumbnails",
+        type=Path,
+        default=default_thumbnail_directory(),
+        help="directory for the bundled thumbnails (default: assets/images/thumbnails)",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        default=THUMBNAIL_SIZE,
+        metavar=("WIDTH", "HEIGHT"),
+        help=f"thumbnail bounding box (default: {THUMBNAIL_SIZE[0]} {THUMBNAIL_SIZE[1]})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"requests in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=REQUEST_TIMEOUT, help=f"seconds per request (default: {REQUEST_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="run the pipeline twice on the catalog's URLs against a local stand-in server, "
+        "check the rerun does no network I/O, and exit without writing anything",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be positive")
+    if min(args.size) < 1:
+        parser.error("--size must be positive")
+    if find_spec("PIL") is None:
+        parser.error("thumbnails need Pillow; install it with `pip install Pillow`")
+    if args.database is not None and not args.database.is_file():
+        parser.error(f"{args.database} is not a file")
+    size = tuple(args.size)
+
+    try:
+        urls = catalog_image_urls(args.database)
+    except sqlite3.DatabaseError as exc:
+        parser.error(f"cannot read image URLs from {args.database}: {exc}")
+    if args.stand_in:
+        result = stand_in_check(urls, size, args.concurrency)
+        print(
+            f"{int(result['images'])} images: {int(result['requests'])} requests over "
+            f"{int(result['connections'])} connections ({result['received'] / 1024 / 1024:.1f} MiB) "
+            f"in {result['cold_seconds']:.2f}s"
+        )
+        print(f"rerun: no requests, {result['warm_seconds']:.3f}s")
+        return
+    prefetch = asyncio.run(
+        prefetch_images(urls, ImageCache(args.cache), args.thumbnails, size, args.concurrency, args.timeout)
+    )
+    written = write_image_manifest(args.output, prefetch.images, size)
+    removed = prune_thumbnails(args.thumbnails, (image.thumbnail for image in prefetch.images.values()))
+    print(
+        f"{len(prefetch.images) + len(prefetch.failures)} images in {prefetch.seconds:.2f}s: "
+        f"{prefetch.downloaded} downloaded ({prefetch.received / 1024 / 1024:.1f} MiB over "
+        f"{prefetch.connections} connections), {prefetch.cached} from {args.cache}"
+    )
+    print(f"Wrote {written} images to {args.output}; thumbnails in {args.thumbnails}")
+    print(f"Seed them as recipe_images with: seed_recipe_database.py --images {args.output}")
+    if removed:
+        print(f"Removed {removed} unused thumbnails")
+    for error in prefetch.failures.values():
+        print(f"failed: {error}")
+    if prefetch.failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
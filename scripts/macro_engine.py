@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Vectorized macro computation over a whole recipe catalog.
+
+The scalar path in ``seed_recipe_database`` scales every ingredient row with
+``Ingredient.scaled_macros`` and sums the rows per recipe in Python. Here the
+catalog becomes a sparse recipe x ingredient quantity matrix (stored as COO
+arrays) and an ingredient x nutrient matrix, and row macros, recipe totals and
+per-serving values fall out of a handful of NumPy operations. Results are
+bit-for-bit identical to the scalar path, including Python's rounding.
+
+Requires NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Mapping, NamedTuple
+
+import numpy as np
+
+from seed_recipe_database import (
+    INGREDIENT_CATALOG,
+    UNITS,
+    Catalog,
+    Ingredient,
+    IngredientRows,
+    Recipe,
+    default_catalog,
+    unit_factor,
+)
+
+NUTRIENTS = ("calories", "protein", "fat", "carbs")
+
+
+class QuantityMatrix(NamedTuple):
+    """Sparse recipe x ingredient quantity matrix in coordinate (COO) form.
+
+    Entry ``k`` stores ``quantity[k]`` default units of ingredient
+    ``ingredient_index[k]`` in recipe ``recipe_index[k]``. Entries keep the catalog's row order, so
+    ``recipe_index`` is non-decreasing.
+    """
+
+    recipe_index: np.ndarray
+    ingredient_index: np.ndarray
+    quantity: np.ndarray
+    servings: np.ndarray
+
+    @property
+    def recipe_count(self) -> int:
+        return len(self.servings)
+
+
+class MacroTable(NamedTuple):
+    """Macros for every ingredient row, recipe total and serving; columns follow ``NUTRIENTS``."""
+
+    rows: np.ndarray
+    totals: np.ndarray
+    per_serving: np.ndarray
+
+
+def nutrient_matrix(ingredients: Mapping[str, Ingredient]) -> np.ndarray:
+    """Return the ingredient x nutrient matrix of per-unit macros, in catalog order."""
+    return np.array(
+        [
+            (
+                ingredient.calories_per_unit,
+                ingredient.protein_per_unit,
+                ingredient.fat_per_unit,
+                ingredient.carbs_per_unit,
+            )
+            for ingredient in ingredients.values()
+        ],
+        dtype=np.float64,
+    ).reshape(-1, len(NUTRIENTS))
+
+
+def unit_matrix(ingredients: Mapping[str, Ingredient]) -> np.ndarray:
+    """Return the ingredient x unit matrix of ``unit_factor``, in catalog and ``UNITS`` order.
+
+    Units an ingredient cannot be measured in are NaN.
+    """
+    return np.array(
+        [
+            [np.nan if factor is None else factor for factor in (unit_factor(ingredient, unit) for unit in UNITS)]
+            for ingredient in ingredients.values()
+        ],
+        dtype=np.float64,
+    ).reshape(-1, len(UNITS))
+
+
+def quantity_matrix(catalog: Catalog) -> QuantityMatrix:
+    """Collect the catalog's ingredient rows into a COO quantity matrix.
+
+    Quantities are converted to each ingredient's default unit with one
+    ``unit_matrix`` lookup per row.
+    """
+    ingredient_ids = catalog.ingredient_ids()
+    unit_ids = {unit: idx for idx, unit in enumerate(UNITS)}
+    recipe_index: List[int] = []
+    ingredient_index: List[int] = []
+    unit_index: List[int] = []
+    quantity: List[float] = []
+    servings: List[int] = []
+    for recipe_idx, recipe in enumerate(catalog.recipes):
+        servings.append(recipe.servings)
+        rows = recipe.ingredient_rows
+        recipe_index.extend([recipe_idx] * len(rows))
+        ingredient_index.extend(ingredient_ids[name] - 1 for name in rows.ingredient_names())
+        unit_index.extend(unit_ids[unit] for unit in rows.unit_names())
+        quantity.extend(rows.quantity)
+    ingredients = np.array(ingredient_index, dtype=np.int64)
+    factors = unit_matrix(catalog.ingredients)[ingredients, np.array(unit_index, dtype=np.int64)]
+    return QuantityMatrix(
+        np.array(recipe_index, dtype=np.int64),
+        ingredients,
+        np.array(quantity, dtype=np.float64) * factors,
+        np.array(servings, dtype=np.float64),
+    )
+
+
+def round_half_even(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Round like Python's ``round(value, decimals)``, element-wise.
+
+    ``np.round`` rounds ``values * 10**decimals`` after that product has already
+    been rounded to a double, so values close to a tie can go the wrong way.
+    Dekker's error-free product recovers the exact residual of the scaled value
+    against the midpoint, which decides those cases exactly (ties go to even).
+    """
+    scale = 10.0**decimals
+    scaled = values * scale
+    floor = np.floor(scaled)
+    distance = scaled - floor
+    distance -= 0.5
+    rounded = np.rint(scaled)
+    # The rounded product is within half an ulp of the exact one, so only
+    # elements this close to a midpoint can be rounded the wrong way.
+    suspect = np.flatnonzero(np.abs(distance) < 1e-9 * np.maximum(np.abs(scaled), 1.0))
+    if suspect.size:
+        exact = values.ravel()[suspect]
+        near = scaled.ravel()[suspect]
+        base = floor.ravel()[suspect]
+        split = exact * 134217729.0  # 2**27 + 1, Veltkamp split into 26-bit halves
+        high = split - (split - exact)
+        low = exact - high
+        error = (high * scale - near) + low * scale
+        # Sign of the exact ``values * scale - (floor + 0.5)``.
+        excess = (near - (base + 0.5)) + error
+        rounded.ravel()[suspect] = np.where(
+            excess > 0, base + 1, np.where(excess < 0, base, base + np.mod(base, 2))
+        )
+    rounded /= scale
+    return np.copysign(rounded, values, out=rounded)
+
+
+def compute_macros(quantities: QuantityMatrix, nutrients: np.ndarray) -> MacroTable:
+    """Compute row macros, recipe totals and per-serving macros for every recipe."""
+    rows = round_half_even(nutrients[quantities.ingredient_index] * quantities.quantity[:, None], 3)
+    totals = np.empty((quantities.recipe_count, len(NUTRIENTS)), dtype=np.float64)
+    for column in range(len(NUTRIENTS)):
+        # bincount adds the weights in input order, exactly like the scalar
+        # running sum in Recipe.total_macros.
+        totals[:, column] = np.bincount(
+            quantities.recipe_index, weights=rows[:, column], minlength=quantities.recipe_count
+        )
+    totals = round_half_even(totals, 2)
+    per_serving = round_half_even(totals / quantities.servings[:, None], 2)
+    return MacroTable(rows, totals, per_serving)
+
+
+def catalog_macros(catalog: Catalog | None = None) -> MacroTable:
+    if catalog is None:
+        catalog = default_catalog()
+    return compute_macros(quantity_matrix(catalog), nutrient_matrix(catalog.ingredients))
+
+
+def synthetic_quantities(rows: int, ingredient_count: int, seed: int = 0) -> QuantityMatrix:
+    """Random catalog with ``rows`` ingredient rows, two to ten per recipe."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(2, 11, size=rows // 2 + 1)
+    boundaries = np.cumsum(sizes)
+    recipe_count = int(np.searchsorted(boundaries, rows) + 1)
+    recipe_index = np.repeat(np.arange(recipe_count), sizes[:recipe_count])[:rows]
+    return QuantityMatrix(
+        recipe_index.astype(np.int64),
+        rng.integers(0, ingredient_count, size=rows).astype(np.int64),
+        rng.integers(1, 801, size=rows) / 2.0,
+        rng.integers(1, 7, size=recipe_count).astype(np.float64),
+    )
+
+
+def scalar_macros(quantities: QuantityMatrix, ingredients: Mapping[str, Ingredient]) -> MacroTable:
+    """Reference result through ``Ingredient.scaled_macros`` and ``Recipe.per_serving``."""
+    catalog = list(ingredients.values())
+    names = list(ingredients)
+    recipe_rows: List[List[tuple]] = [[] for _ in range(quantities.recipe_count)]
+    rows = []
+    for recipe_idx, ingredient_idx, amount in zip(
+        quantities.recipe_index.tolist(), quantities.ingredient_index.tolist(), quantities.quantity.tolist()
+    ):
+        macros = catalog[ingredient_idx].scaled_macros(amount)
+        rows.append(macros)
+        recipe_rows[recipe_idx].append((names[ingredient_idx], amount, catalog[ingredient_idx].default_unit, macros, None))
+    totals = []
+    per_serving = []
+    for servings, ingredient_rows in zip(quantities.servings.tolist(), recipe_rows):
+        recipe = Recipe("", "", "", "", int(servings), IngredientRows(ingredient_rows), "", 0.0, 0.0, 0.0, False)
+        totals.append(recipe.total_macros())
+        per_serving.append(recipe.per_serving())
+    return MacroTable(
+        np.array(rows, dtype=np.float64).reshape(-1, len(NUTRIENTS)),
+        np.array(totals, dtype=np.float64).reshape(-1, len(NUTRIENTS)),
+        np.array(per_serving, dtype=np.float64).reshape(-1, len(NUTRIENTS)),
+    )
+
+
+def _same(left: MacroTable, right: MacroTable) -> bool:
+    return all(np.array_equal(a, b) for a, b in zip(left, right))
+
+
+def benchmark(rows: int = 1_000_000, seed: int = 0) -> Dict[str, float]:
+    """Time the vectorized and scalar paths on ``rows`` synthetic ingredient rows."""
+    catalog = default_catalog()
+    recipes = list(catalog.recipes)
+    expected = [recipe.per_serving() for recipe in recipes]
+    if catalog_macros(catalog).per_serving.tolist() != [list(values) for values in expected]:
+        raise AssertionError("vectorized per-serving macros differ from the bundled catalog")
+
+    quantities = synthetic_quantities(rows, len(INGREDIENT_CATALOG), seed)
+    nutrients = nutrient_matrix(INGREDIENT_CATALOG)
+
+    started = time.perf_counter()
+    vectorized = compute_macros(quantities, nutrients)
+    vectorized_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scalar = scalar_macros(quantities, INGREDIENT_CATALOG)
+    scalar_seconds = time.perf_counter() - started
+
+    if not _same(vectorized, scalar):
+        raise AssertionError("vectorized macros differ from the scalar path")
+    return {
+        "rows": float(rows),
+        "recipes": float(quantities.recipe_count),
+        "vectorized_seconds": vectorized_seconds,
+        "scalar_seconds": scalar_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized macro computation against the scalar path.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="recipe-ingredient rows (default: 1,000,000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic catalog")
+    args = parser.parse_args()
+    result = benchmark(args.rows, args.seed)
+    print(f"{int(result['rows']):,} rows across {int(result['recipes']):,} recipes")
+    print(f"vectorized: {result['vectorized_seconds']:.3f}s")
+    print(f"scalar:     {result['scalar_seconds']:.3f}s")
+    print(f"speedup:    {result['scalar_seconds'] / result['vectorized_seconds']:.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""Daily meal plans over the recipe catalog.
+
+``findOptimalRecipe`` picks a single dish. A plan picks one recipe and a portion
+for every meal slot (Breakfast, Lunch, Dinner and Snack) so that the day's
+macros come as close as possible to daily targets. Targets and weights are a
+``ScoreConfig``, and closeness is its weighted relative error, so a plan's score
+is the dish score of the whole day.
+
+The per-serving macros of each slot's recipes are loaded once into candidate
+tables (``SlotTable``). For each target profile:
+
+1. Every slot keeps the ``candidates`` recipe/portion options closest to its
+   share of the targets (``MEAL_SLOTS``). The tables are k-d trees, so only
+   the few leaves near that share are scored.
+2. The slots are split into two halves, and the option combinations of each
+   half are summed.
+3. A best-first branch and bound walks the first half's sums in order of a
+   lower bound on the error the second half can still reach. Blocks of them
+   are scored against all of the second half's sums with one matrix product,
+   and the search stops when the bound passes the best plan.
+
+The result is the best plan over the candidates, found exactly. It is not
+guaranteed to be the best plan over the whole catalog. Step 1 ranks each slot
+on its own, so an option outside a slot's candidates can still be part of a
+better day when the other slots make up for it. A larger ``candidates`` widens
+the search. It takes milliseconds even at 1M recipes.
+
+``plan_days`` solves many profiles against the same tables, and ``write_plans``
+stores the plans in the ``meal_plans`` and ``meal_plan_items`` tables of a plan
+database (``build/meal_plans.db`` by default, not the shipped catalog).
+
+Requires NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from seed_recipe_database import MACRO_COLUMNS, Catalog, ScoreConfig, default_database_path
+
+# Meal slots (recipe categories) and the share of the daily targets each aims for.
+MEAL_SLOTS = (("Breakfast", 0.25), ("Lunch", 0.35), ("Dinner", 0.3), ("Snack", 0.1))
+PORTIONS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+DEFAULT_CANDIDATES = 32
+# First-half combinations that plan_day scores against the second half at once.
+PLAN_BLOCK_ROWS = 64
+# Recipes per k-d tree leaf of a SlotTable.
+PLAN_LEAF_SIZE = 128
+# Leaf/portion pairs slot_options sorts before it falls back to sorting all.
+PLAN_LEAF_PREFETCH = 256
+# DishProvider's default daily targets, weighted like the dish score.
+DAILY_TARGETS = ScoreConfig(2000.0, 150.0, 70.0, 250.0)
+# Shares of calories from protein, fat and carbs for profile_grid.
+MACRO_SPLITS = {
+    "balanced": (0.2, 0.3, 0.5),
+    "high_protein": (0.3, 0.25, 0.45),
+    "low_carb": (0.3, 0.45, 0.25),
+}
+CALORIES_PER_GRAM = (4.0, 9.0, 4.0)
+
+PLAN_SCHEMA = """
+DROP TABLE IF EXISTS meal_plan_items;
+DROP TABLE IF EXISTS meal_plans;
+
+CREATE TABLE meal_plans (
+    id INTEGER PRIMARY KEY,
+    target_calories REAL NOT NULL,
+    target_protein REAL NOT NULL,
+    target_fat REAL NOT NULL,
+    target_carbs REAL NOT NULL,
+    weight_calories REAL NOT NULL,
+    weight_protein REAL NOT NULL,
+    weight_fat REAL NOT NULL,
+    weight_carbs REAL NOT NULL,
+    calories REAL NOT NULL,
+    protein REAL NOT NULL,
+    fat REAL NOT NULL,
+    carbs REAL NOT NULL,
+    score REAL NOT NULL
+);
+
+-- recipe_id is an ID of the catalog the plans were made from, which is
+-- usually another database.
+CREATE TABLE meal_plan_items (
+    plan_id INTEGER NOT NULL REFERENCES meal_plans(id) ON DELETE CASCADE,
+    slot TEXT NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    portion REAL NOT NULL,
+    PRIMARY KEY (plan_id, slot)
+) WITHOUT ROWID;
+"""
+
+SLOT_QUERY = """
+SELECT recipes.id, recipes.calories_per_serving, recipes.protein_per_serving,
+       recipes.fat_per_serving, recipes.carbs_per_serving
+FROM recipes
+JOIN categories ON categories.id = recipes.category_id
+WHERE categories.name = ?
+"""
+
+
+class SlotTable(NamedTuple):
+    """Recipe IDs and per-serving macros of one meal slot, grouped into k-d tree leaves.
+
+    Macro columns follow ``MACRO_COLUMNS``. Leaf ``i`` holds rows
+    ``leaf_starts[i]`` up to the next start, and ``leaf_low``/``leaf_high`` are
+    its bounding box.
+    """
+
+    slot: str
+    share: float
+    recipe_ids: np.ndarray
+    macros: np.ndarray
+    leaf_starts: np.ndarray
+    leaf_low: np.ndarray
+    leaf_high: np.ndarray
+
+    def leaf_stops(self) -> np.ndarray:
+        return np.append(self.leaf_starts[1:], len(self.recipe_ids))
+
+
+class PlanItem(NamedTuple):
+    slot: str
+    recipe_id: int
+    portion: float
+
+
+class MealPlan(NamedTuple):
+    """One recipe and portion per slot, with the day's macros and their score against ``config``."""
+
+    config: ScoreConfig
+    items: Tuple[PlanItem, ...]
+    calories: float
+    protein: float
+    fat: float
+    carbs: float
+    score: float
+
+    def describe(self, names: Dict[int, str] | None = None) -> List[str]:
+        names = names or {}
+        lines = [
+            f"{self.calories:.0f} kcal, {self.protein:.1f} g protein, {self.fat:.1f} g fat, "
+            f"{self.carbs:.1f} g carbs (score {self.score:.4f})"
+        ]
+        for item in self.items:
+            name = names.get(item.recipe_id, "")
+            lines.append(f"  {item.slot:<10} {item.portion:g} x #{item.recipe_id} {name}".rstrip())
+        return lines
+
+
+def _slot_table(slot: str, share: float, rows: Sequence[Tuple[int, float, float, float, float]]) -> SlotTable:
+    """Order the rows into k-d tree leaves: split at the median of the widest macro until leaves are small.
+
+    Widths are measured in standard deviations, since the targets that later
+    scale each macro are not known yet.
+    """
+    data = np.array(rows, dtype=np.float64).reshape(-1, 1 + len(MACRO_COLUMNS))
+    macros = data[:, 1:]
+    spread = macros.std(axis=0) if len(macros) else np.ones(len(MACRO_COLUMNS))
+    spread[spread == 0] = 1.0
+    order = np.arange(len(data))
+    starts = []
+    pending = [(0, len(data))] if len(data) else []
+    while pending:
+        start, stop = pending.pop()
+        if stop - start <= PLAN_LEAF_SIZE:
+            starts.append(start)
+            continue
+        rows_index = order[start:stop]
+        points = macros[rows_index]
+        column = int(np.argmax((points.max(axis=0) - points.min(axis=0)) / spread))
+        middle = (stop - start) // 2
+        order[start:stop] = rows_index[np.argpartition(points[:, column], middle)]
+        pending += [(start, start + middle), (start + middle, stop)]
+    data = data[order]
+    leaf_starts = np.array(sorted(starts), dtype=np.int64)
+    macros = np.ascontiguousarray(data[:, 1:])
+    if len(leaf_starts):
+        leaf_low = np.minimum.reduceat(macros, leaf_starts)
+        leaf_high = np.maximum.reduceat(macros, leaf_starts)
+    else:
+        leaf_low = leaf_high = np.zeros((0, len(MACRO_COLUMNS)))
+    return SlotTable(slot, share, data[:, 0].astype(np.int64), macros, leaf_starts, leaf_low, leaf_high)
+
+
+def plan_tables(conn: sqlite3.Connection, slots: Sequence[Tuple[str, float]] = MEAL_SLOTS) -> List[SlotTable]:
+    """Load the candidate tables for ``slots`` from a seeded database."""
+    return [_slot_table(slot, share, conn.execute(SLOT_QUERY, (slot,)).fetchall()) for slot, share in slots]
+
+
+def catalog_plan_tables(catalog: Catalog, slots: Sequence[Tuple[str, float]] = MEAL_SLOTS) -> List[SlotTable]:
+    """Build the candidate tables straight from a catalog; recipe IDs match the seeded ones."""
+    rows: Dict[str, List[Tuple]] = {slot: [] for slot, _ in slots}
+    for recipe_id, recipe in enumerate(catalog.recipes, start=1):
+        slot_rows = rows.get(recipe.category)
+        if slot_rows is not None:
+            slot_rows.append((recipe_id, *recipe.per_serving()))
+    return [_slot_table(slot, share, rows[slot]) for slot, share in slots]
+
+
+def _profile(config: ScoreConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """Targets and the per-macro scale that turns ``ScoreConfig.error`` into a squared distance."""
+    targets = np.array(config[: len(MACRO_COLUMNS)], dtype=np.float64)
+    weights = np.array(config[len(MACRO_COLUMNS) :], dtype=np.float64)
+    return targets, np.sqrt(weights) / targets
+
+
+def _option_distances(
+    table: SlotTable, goal: np.ndarray, scale: np.ndarray, portion_index: np.ndarray, leaves: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Errors against ``goal`` of every recipe in ``leaves[i]`` at portion ``portion_index[i]``."""
+    starts = table.leaf_starts[leaves]
+    lengths = table.leaf_stops()[leaves] - starts
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    recipe_index = np.repeat(starts, lengths) + np.arange(int(lengths.sum())) - offsets
+    portion_index = np.repeat(portion_index, lengths)
+    difference = table.macros[recipe_index] * (np.array(PORTIONS)[portion_index, None] * scale) - goal
+    return portion_index, recipe_index, np.einsum("ij,ij->i", difference, difference)
+
+
+def slot_options(
+    table: SlotTable, config: ScoreConfig, candidates: int = DEFAULT_CANDIDATES
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(recipe_index, portion)`` arrays for the options closest to the slot's share of ``config``.
+
+    Options are ranked by their error against ``share * target``; ties go to
+    the lower recipe ID, then the smaller portion. Leaves are visited per
+    portion in order of the smallest error their bounding box allows, until
+    that bound exceeds the error of the last candidate found so far.
+    """
+    targets, scale = _profile(config)
+    goal = table.share * targets * scale
+    portions = np.array(PORTIONS)[:, None, None]
+    gap = np.maximum(portions * (table.leaf_low * scale) - goal, 0.0) + np.maximum(
+        goal - portions * (table.leaf_high * scale), 0.0
+    )
+    # Shrunk a little: the bound rounds differently from the distances, and
+    # options that tie with the last candidate must still be visited.
+    bounds = np.einsum("pij,pij->pi", gap, gap).ravel() * (1.0 - 1e-9)
+    # Usually only a few leaves are needed, so only the closest are sorted up
+    # front. The result does not depend on the order of equal bounds.
+    if len(bounds) > PLAN_LEAF_PREFETCH:
+        order = np.argpartition(bounds, PLAN_LEAF_PREFETCH)[:PLAN_LEAF_PREFETCH]
+    else:
+        order = np.arange(len(bounds))
+    order = order[np.argsort(bounds[order])]
+    leaf_count = len(table.leaf_starts)
+    found: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    distances = np.empty(0)
+    cutoff = np.inf
+    visited, batch = 0, 4
+    while visited < len(bounds):
+        if visited == len(order):
+            rest = np.ones(len(bounds), dtype=bool)
+            rest[order] = False
+            rest = np.flatnonzero(rest)
+            order = np.concatenate((order, rest[np.argsort(bounds[rest])]))
+        if bounds[order[visited]] > cutoff:
+            break
+        pairs = order[visited : visited + batch]
+        found.append(_option_distances(table, goal, scale, *np.divmod(pairs, leaf_count)))
+        distances = np.concatenate((distances, found[-1][2]))
+        if len(distances) >= candidates:
+            cutoff = np.partition(distances, candidates - 1)[candidates - 1]
+        visited += len(pairs)
+        batch *= 2
+    if not found:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    portion_index, recipe_index, distances = (np.concatenate(parts) for parts in zip(*found))
+    if len(distances) > candidates:
+        chosen = np.flatnonzero(distances <= np.partition(distances, candidates - 1)[candidates - 1])
+        portion_index, recipe_index, distances = portion_index[chosen], recipe_index[chosen], distances[chosen]
+    order = np.lexsort((portion_index, table.recipe_ids[recipe_index], distances))[:candidates]
+    return recipe_index[order], np.array(PORTIONS)[portion_index[order]]
+
+
+def _combine(vectors: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum every combination of one row per array; returns the sums and the row chosen from each array."""
+    sums = np.zeros((1, len(MACRO_COLUMNS)))
+    choices = np.zeros((1, 0), dtype=np.int64)
+    for rows in vectors:
+        sums = (sums[:, None, :] + rows[None, :, :]).reshape(-1, len(MACRO_COLUMNS))
+        choices = np.hstack(
+            (np.repeat(choices, len(rows), axis=0), np.tile(np.arange(len(rows)), len(choices))[:, None])
+        )
+    return sums, choices
+
+
+def plan_day(
+    tables: Sequence[SlotTable], config: ScoreConfig = DAILY_TARGETS, candidates: int = DEFAULT_CANDIDATES
+) -> MealPlan:
+    """Return the best plan over each slot's ``candidates`` options for the daily ``config``.
+
+    The search over the options is exact, but a plan using an option outside
+    them can score better; see the module docstring.
+    """
+    targets, scale = _profile(config)
+    options = []
+    vectors = []
+    for table in tables:
+        if not len(table.recipe_ids):
+            raise ValueError(f"no {table.slot} recipes to plan with")
+        recipe_index, portions = slot_options(table, config, candidates)
+        options.append((recipe_index, portions))
+        vectors.append(table.macros[recipe_index] * portions[:, None] * scale)
+
+    half = len(vectors) // 2
+    first, first_choices = _combine(vectors[:half])
+    second, second_choices = _combine(vectors[half:])
+    # The second half has to supply ``residual``; no combination of it lies
+    # outside its bounding box, which bounds the error from below.
+    residual = targets * scale - first
+    gap = np.maximum(second.min(axis=0) - residual, 0.0) + np.maximum(residual - second.max(axis=0), 0.0)
+    bounds = np.einsum("ij,ij->i", gap, gap)
+    order = np.argsort(bounds, kind="stable")
+    # ||r - c||^2 = ||r||^2 - 2 r.c + ||c||^2, a block of rows at a time.
+    second_norms = np.einsum("ij,ij->i", second, second)
+    best, best_pair = np.inf, (0, 0)
+    for start in range(0, len(order), PLAN_BLOCK_ROWS):
+        rows = order[start : start + PLAN_BLOCK_ROWS]
+        if bounds[rows[0]] >= best:
+            break
+        block = residual[rows]
+        errors = np.einsum("ij,ij->i", block, block)[:, None] - 2.0 * (block @ second.T) + second_norms
+        row, match = divmod(int(errors.argmin()), len(second))
+        if errors[row, match] < best:
+            best, best_pair = errors[row, match], (int(rows[row]), match)
+
+    chosen = np.concatenate((first_choices[best_pair[0]], second_choices[best_pair[1]]))
+    items = []
+    totals = [0.0] * len(MACRO_COLUMNS)
+    for table, (recipe_index, portions), option in zip(tables, options, chosen.tolist()):
+        row = int(recipe_index[option])
+        portion = float(portions[option])
+        items.append(PlanItem(table.slot, int(table.recipe_ids[row]), portion))
+        for column, value in enumerate(table.macros[row].tolist()):
+            totals[column] += portion * value
+    totals = [round(value, 2) for value in totals]
+    return MealPlan(config, tuple(items), *totals, config.score(*totals))
+
+
+def plan_days(
+    tables: Sequence[SlotTable], configs: Iterable[ScoreConfig], candidates: int = DEFAULT_CANDIDATES
+) -> List[MealPlan]:
+    return [plan_day(tables, config, candidates) for config in configs]
+
+
+def profile_grid(calories: Iterable[float] = range(1400, 3201, 200)) -> List[ScoreConfig]:
+    """Daily targets for every calorie level under each of ``MACRO_SPLITS``, with the default weights."""
+    profiles = []
+    for total in calories:
+        for split in MACRO_SPLITS.values():
+            grams = [round(total * share / per_gram, 1) for share, per_gram in zip(split, CALORIES_PER_GRAM)]
+            profiles.append(ScoreConfig(float(total), *grams))
+    return profiles
+
+
+def read_profiles(path: Path) -> List[ScoreConfig]:
+    """Read target profiles from JSON Lines; each object holds ``ScoreConfig`` fields, weights optional."""
+    profiles = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                profile = ScoreConfig(**json.loads(line))
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"{path}:{line_number}: {exc}") from None
+            if min(profile[: len(MACRO_COLUMNS)]) <= 0:
+                raise ValueError(f"{path}:{line_number}: targets must be positive")
+            profiles.append(profile)
+    return profiles
+
+
+def default_plans_path() -> Path:
+    """``build/meal_plans.db`` at the project root, which is not bundled with the app."""
+    return default_database_path().parent.parent.parent / "build" / "meal_plans.db"
+
+
+def write_plans(conn: sqlite3.Connection, plans: Sequence[MealPlan]) -> None:
+    """Replace the ``meal_plans`` and ``meal_plan_items`` tables with ``plans``."""
+    conn.executescript(PLAN_SCHEMA)
+    with conn:
+        conn.executemany(
+            "INSERT INTO meal_plans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (plan_id, *plan.config, plan.calories, plan.protein, plan.fat, plan.carbs, plan.score)
+                for plan_id, plan in enumerate(plans, start=1)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO meal_plan_items VALUES (?, ?, ?, ?)",
+            ((plan_id, *item) for plan_id, plan in enumerate(plans, start=1) for item in plan.items),
+        )
+
+
+def exhaustive_plan_error(
+    tables: Sequence[SlotTable], config: ScoreConfig, candidates: int = DEFAULT_CANDIDATES
+) -> float:
+    """Smallest ``ScoreConfig.error`` over every combination of the candidates, for checking ``plan_day``."""
+    targets, scale = _profile(config)
+    vectors = []
+    for table in tables:
+        recipe_index, portions = slot_options(table, config, candidates)
+        vectors.append(table.macros[recipe_index] * portions[:, None] * scale)
+    best = np.inf
+    for combination in product(*(range(len(rows)) for rows in vectors)):
+        total = sum(rows[option] for rows, option in zip(vectors, combination)) - targets * scale
+        best = min(best, float(total @ total))
+    return best
+
+
+def benchmark(recipes: int = 1_000_000, seed: int = 0, candidates: int = DEFAULT_CANDIDATES) -> Dict[str, float]:
+    """Plan every ``profile_grid`` profile on a synthetic catalog of ``recipes`` recipes.
+
+    A few profiles are also solved by enumerating every candidate combination
+    to check that the branch and bound finds the same optimum.
+    """
+    from benchmark_seeder import synthetic_catalog
+
+    started = time.perf_counter()
+    tables = catalog_plan_tables(synthetic_catalog(recipes, seed, materialize=False))
+    load_seconds = time.perf_counter() - started
+
+    profiles = profile_grid()
+    started = time.perf_counter()
+    plans = plan_days(tables, profiles, candidates)
+    plan_seconds = time.perf_counter() - started
+
+    rows = {(table.slot, int(recipe_id)): row for table in tables for row, recipe_id in enumerate(table.recipe_ids)}
+    for plan in plans[:: len(MACRO_SPLITS) * 3]:
+        config = plan.config
+        targets, scale = _profile(config)
+        found = plan_day(tables, config, min(candidates, 8))
+        total = sum(
+            table.macros[rows[item.slot, item.recipe_id]] * item.portion for table, item in zip(tables, found.items)
+        )
+        difference = (total - targets) * scale
+        expected = exhaustive_plan_error(tables, config, min(candidates, 8))
+        if not np.isclose(difference @ difference, expected, rtol=1e-9, atol=1e-12):
+            raise AssertionError(f"branch and bound missed the best plan for {plan.config}")
+    return {
+        "recipes": float(recipes),
+        "slot_recipes": float(sum(len(table.recipe_ids) for table in tables)),
+        "load_seconds": load_seconds,
+        "plans": float(len(plans)),
+        "plan_seconds": plan_seconds,
+        "worst_score": min(plan.score for plan in plans),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build daily meal plans from the seeded recipe catalog.")
+    parser.add_argument(
+        "database",
+        nargs="?",
+        type=Path,
+        default=default_database_path(),
+        help="seeded SQLite catalog (default: the prebuilt asset)",
+    )
+    profiles = parser.add_mutually_exclusive_group()
+    profiles.add_argument(
+        "--targets",
+        type=float,
+        nargs=4,
+        metavar=("CALORIES", "PROTEIN", "FAT", "CARBS"),
+        help="plan one day for these daily targets and print it (default: 2000 150 70 250)",
+    )
+    profiles.add_argument("--profiles", type=Path, help="JSON Lines of ScoreConfig fields to plan into meal_plans")
+    profiles.add_argument("--grid", action="store_true", help="plan every profile_grid() profile into meal_plans")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=default_plans_path(),
+        help="database that --profiles and --grid write meal_plans to (default: build/meal_plans.db); "
+        "naming the catalog itself adds the tables to it",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=DEFAULT_CANDIDATES,
+        help=f"recipe/portion options kept per slot (default: {DEFAULT_CANDIDATES})",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        nargs="?",
+        const=1_000_000,
+        metavar="RECIPES",
+        help="time plan_day for the profile grid on a synthetic catalog (default: 1,000,000 recipes)",
+    )
+    args = parser.parse_args(argv)
+    if args.candidates < 1:
+        parser.error("--candidates must be positive")
+    if args.targets is not None and min(args.targets) <= 0:
+        parser.error("--targets must be positive")
+
+    if args.benchmark is not None:
+        result = benchmark(args.benchmark, candidates=args.candidates)
+        print(f"{int(result['recipes']):,} recipes, {int(result['slot_recipes']):,} in meal slots")
+        print(f"candidate tables: {result['load_seconds']:.1f}s")
+        print(
+            f"{int(result['plans'])} plans: {result['plan_seconds'] * 1000 / result['plans']:.2f} ms each "
+            f"(lowest score {result['worst_score']:.4f}; matches exhaustive search over the candidates)"
+        )
+        return
+    if not args.database.exists():
+        parser.error(f"{args.database} does not exist; run seed_recipe_database.py --database first")
+
+    with closing(sqlite3.connect(args.database)) as conn:
+        started = time.perf_counter()
+        tables = plan_tables(conn)
+        loaded = time.perf_counter()
+        if args.profiles is not None or args.grid:
+            try:
+                configs = read_profiles(args.profiles) if args.profiles is not None else profile_grid()
+            except ValueError as exc:
+                parser.error(str(exc))
+            plans = plan_days(tables, configs, args.candidates)
+            solved = time.perf_counter()
+            if args.output.resolve() == args.database.resolve():
+                write_plans(conn, plans)
+            else:
+                args.output.parent.mkdir(parents=True, exist_ok=True)
+                partial_path = args.output.with_name(args.output.name + ".partial")
+                partial_path.unlink(missing_ok=True)
+                with closing(sqlite3.connect(partial_path)) as output:
+                    write_plans(output, plans)
+                os.replace(partial_path, args.output)
+            print(
+                f"Wrote {len(plans)} plans to meal_plans in {args.output} "
+                f"(tables {loaded - started:.2f}s, {(solved - loaded) * 1000 / max(len(plans), 1):.2f} ms per plan)"
+            )
+            return
+        config = DAILY_TARGETS._replace(**dict(zip(ScoreConfig._fields, args.targets or ())))
+        plan = plan_day(tables, config, args.candidates)
+        ids = ",".join(str(item.recipe_id) for item in plan.items)
+        names = dict(conn.execute(f"SELECT id, name FROM recipes WHERE id IN ({ids})"))
+        for line in plan.describe(names):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
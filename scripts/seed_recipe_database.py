@@ -2,16 +2,48 @@
 """Seed a SQLite database with categorized recipes and macro-nutrient data."""
 from __future__ import annotations
 
-import sqlite3
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+import io
+import os
+import time
+from array import array
+from collections import namedtuple
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
-OUTPUT_PATH = Path(__file__).resolve().parent.parent / "assets" / "database" / "recipes.sql"
+# Importing this module should only cost the catalog literals and typing.
+# Everything else (sqlite3, pathlib, argparse, csv, json, hashlib, ...) is
+# imported for annotations only or inside the functions that need it, and
+# RECIPES, OUTPUT_PATH and DATABASE_PATH are resolved on first access.
+if TYPE_CHECKING:
+    import queue
+    import sqlite3
+    from multiprocessing.connection import Connection
+    from pathlib import Path
+    from typing import (
+        IO, BinaryIO, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, TextIO, Tuple, TypeVar
+    )
+
+    T = TypeVar("T")
+    RecipeIngredient = Dict[str, float | str | None]
+    ProfileHook = Callable[[str, Dict[str, object]], None]
+
+# Budget for the cumulative ``python -X importtime`` cost of this module. It
+# measures about 28 ms, half of which is typing; the rest leaves headroom for
+# slower machines. tests/test_import_time.py checks it on every run.
+IMPORT_BUDGET_MS = 40.0
+
+# 4 KiB matches the block size of the Android and iOS filesystems.
+DEFAULT_PAGE_SIZE = 4096
+PAGE_SIZES = (512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
 
 SCHEMA = """
 PRAGMA foreign_keys = ON;
 
+DROP TABLE IF EXISTS catalog_manifest;
+DROP TABLE IF EXISTS catalog_version;
+DROP TABLE IF EXISTS recipe_scores;
+DROP TABLE IF EXISTS score_configs;
 DROP TABLE IF EXISTS recipe_ingredients;
 DROP TABLE IF EXISTS recipes;
 DROP TABLE IF EXISTS ingredients;
@@ -63,7 +95,419 @@ CREATE TABLE recipe_ingredients (
     notes TEXT,
     PRIMARY KEY (recipe_id, ingredient_id)
 );
+
+CREATE TABLE score_configs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    target_calories REAL NOT NULL,
+    target_protein REAL NOT NULL,
+    target_fat REAL NOT NULL,
+    target_carbs REAL NOT NULL,
+    weight_calories REAL NOT NULL,
+    weight_protein REAL NOT NULL,
+    weight_fat REAL NOT NULL,
+    weight_carbs REAL NOT NULL
+);
+
+CREATE TABLE recipe_scores (
+    config_id INTEGER NOT NULL REFERENCES score_configs(id) ON DELETE CASCADE,
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+    score REAL NOT NULL,
+    PRIMARY KEY (config_id, recipe_id)
+) WITHOUT ROWID;
+
+CREATE TABLE catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version TEXT NOT NULL
+);
+
+CREATE TABLE catalog_manifest (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Secondary indexes for the app's lookups, created after the bulk load so each
+# is built in one pass: recipes of a category listed by name (covering),
+# the popular carousel ordered by reviews (partial), the recipes that use an
+# ingredient, which the (recipe_id, ingredient_id) key cannot serve, and the
+# best-scoring recipes of a score config (covering, since recipe_scores has no
+# rowid and its index entries carry recipe_id).
+INDEXES = """
+CREATE INDEX recipes_category_idx ON recipes(category_id, name);
+CREATE INDEX recipes_popular_idx ON recipes(review_count DESC) WHERE is_popular = 1;
+CREATE INDEX recipe_ingredients_ingredient_idx ON recipe_ingredients(ingredient_id, recipe_id, quantity, unit);
+CREATE INDEX recipe_scores_rank_idx ON recipe_scores(config_id, score DESC);
+"""
+
+# Opt-in FTS5 index for recipe search. It is contentless (``content=''``), so
+# it stores only the index; matches are joined back to ``recipes`` by rowid.
+# It is filled from the loaded tables with a single INSERT ... SELECT, which
+# keeps the dump from repeating any text.
+SEARCH_COLUMNS = ("name", "description", "instructions", "ingredients", "notes")
+# bm25 weights in SEARCH_COLUMNS order: a hit in the name counts most.
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 6.0, 1.0)
+DEFAULT_TOKENIZER = "unicode61 remove_diacritics 2"
+# Prefix indexes for two- and three-character type-ahead queries.
+DEFAULT_PREFIXES = (2, 3)
+SEARCH_POPULATE = """
+INSERT INTO recipe_search(rowid, name, description, instructions, ingredients, notes)
+SELECT recipes.id, recipes.name, recipes.description, recipes.instructions,
+       group_concat(ingredients.name, ' '), group_concat(recipe_ingredients.notes, ' ')
+FROM recipes
+LEFT JOIN recipe_ingredients ON recipe_ingredients.recipe_id = recipes.id
+LEFT JOIN ingredients ON ingredients.id = recipe_ingredients.ingredient_id
+GROUP BY recipes.id
+"""
+# The weighted bm25 is stored as the table's ``rank`` function, so FTS5 itself
+# returns matches in rank order.
+SEARCH_RANK = f"bm25({', '.join(map(str, SEARCH_WEIGHTS))})"
+SEARCH_QUERY = """
+SELECT recipes.id, recipes.name, recipe_search.rank
+FROM recipe_search
+JOIN recipes ON recipes.id = recipe_search.rowid
+WHERE recipe_search MATCH ?
+ORDER BY recipe_search.rank
+LIMIT ?
+"""
+
+# Opt-in R*Tree over per-serving macros for macro-range and nearest-target
+# queries. Every recipe is a point (equal min and max on each axis). It is
+# filled from the loaded recipes, and triggers keep it in sync with later
+# writes to them, patches included.
+MACRO_COLUMNS = ("calories", "protein", "fat", "carbs")
+MACRO_INDEX_STATEMENTS = (
+    "DROP TABLE IF EXISTS recipe_macros",
+    "CREATE VIRTUAL TABLE recipe_macros USING rtree("
+    "id, min_calories, max_calories, min_protein, max_protein, min_fat, max_fat, min_carbs, max_carbs)",
+    """INSERT INTO recipe_macros
+SELECT id, calories_per_serving, calories_per_serving, protein_per_serving, protein_per_serving,
+       fat_per_serving, fat_per_serving, carbs_per_serving, carbs_per_serving
+FROM recipes""",
+    """CREATE TRIGGER recipe_macros_insert AFTER INSERT ON recipes BEGIN
+    INSERT INTO recipe_macros VALUES(
+        new.id, new.calories_per_serving, new.calories_per_serving, new.protein_per_serving, new.protein_per_serving,
+        new.fat_per_serving, new.fat_per_serving, new.carbs_per_serving, new.carbs_per_serving);
+END""",
+    """CREATE TRIGGER recipe_macros_update
+AFTER UPDATE OF calories_per_serving, protein_per_serving, fat_per_serving, carbs_per_serving ON recipes BEGIN
+    UPDATE recipe_macros SET
+        min_calories = new.calories_per_serving, max_calories = new.calories_per_serving,
+        min_protein = new.protein_per_serving, max_protein = new.protein_per_serving,
+        min_fat = new.fat_per_serving, max_fat = new.fat_per_serving,
+        min_carbs = new.carbs_per_serving, max_carbs = new.carbs_per_serving
+    WHERE id = new.id;
+END""",
+    """CREATE TRIGGER recipe_macros_delete AFTER DELETE ON recipes BEGIN
+    DELETE FROM recipe_macros WHERE id = old.id;
+END""",
+)
+# R*Tree coordinates are 32-bit floats rounded outwards, so box matches are
+# re-checked against the exact per-serving columns.
+MACRO_BOX_QUERY = """
+SELECT recipes.id, recipes.calories_per_serving, recipes.protein_per_serving,
+       recipes.fat_per_serving, recipes.carbs_per_serving
+FROM recipe_macros
+JOIN recipes ON recipes.id = recipe_macros.id
+WHERE {conditions}
+ORDER BY recipes.id
+"""
+# nearest_recipes widens its search box until the radius passes this
+# weighted relative error, then takes every recipe in the box.
+MACRO_SEARCH_RADIUS = 0.05
+MACRO_SEARCH_RADIUS_LIMIT = 1000.0
+
+# Opt-in ingredient substitutes: for every ingredient, the most similar
+# ingredients measured in the same unit, so one unit swaps for one unit, with
+# the per-unit macro change of the swap. Similarity is the cosine of the
+# protein/fat/carbs vectors times the ratio of the smaller calorie count to
+# the larger, between 0 and 1. Computed with NumPy.
+SUBSTITUTES_SCHEMA = """
+DROP TABLE IF EXISTS ingredient_substitutes;
+
+CREATE TABLE ingredient_substitutes (
+    ingredient_id INTEGER NOT NULL REFERENCES ingredients(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    substitute_id INTEGER NOT NULL REFERENCES ingredients(id) ON DELETE CASCADE,
+    similarity REAL NOT NULL,
+    calories_delta REAL NOT NULL,
+    protein_delta REAL NOT NULL,
+    fat_delta REAL NOT NULL,
+    carbs_delta REAL NOT NULL,
+    PRIMARY KEY (ingredient_id, rank)
+) WITHOUT ROWID;
+"""
+SUBSTITUTES_COLUMNS = (
+    "ingredient_id", "rank", "substitute_id", "similarity", "calories_delta", "protein_delta", "fat_delta", "carbs_delta"
+)
+SUBSTITUTES_INSERT = "INSERT INTO ingredient_substitutes VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+DEFAULT_SUBSTITUTES = 10
+# Rows of the ingredient x ingredient similarity matrix computed at once.
+SUBSTITUTE_BLOCK_ROWS = 256
+
+# Opt-in recipe images (--images): the manifest image_pipeline.py writes, one
+# row per image URL with the original's hash and dimensions and the file name
+# and dimensions of its bundled thumbnail. Recipes join it on image_url.
+IMAGES_SCHEMA = """
+DROP TABLE IF EXISTS recipe_images;
+
+CREATE TABLE recipe_images (
+    image_url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    thumbnail TEXT NOT NULL,
+    thumbnail_width INTEGER NOT NULL,
+    thumbnail_height INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+IMAGES_COLUMNS = ("image_url", "sha256", "width", "height", "thumbnail", "thumbnail_width", "thumbnail_height")
+IMAGES_INSERT = "INSERT INTO recipe_images VALUES (?, ?, ?, ?, ?, ?, ?)"
+IMAGES_MANIFEST_VERSION = 1
+
+TABLES = ("categories", "ingredients", "score_configs", "recipes", "recipe_ingredients", "recipe_scores")
+# Tables whose rows come from walking ``catalog.recipes``.
+RECIPE_TABLES = ("recipes", "recipe_ingredients", "recipe_scores")
+
+# Every index of SCHEMA and INDEXES as (table, index, key columns as positions
+# in the table's row tuples, number of leading key columns that are unique,
+# position of the partial-index filter column, number of leading key columns
+# the rows are generated in order of). Used to compute the ``sqlite_stat1``
+# rows that ship in the dump; only prefixes of categories, ingredients, score
+# configs and review counts are kept, so memory does not grow with the catalog.
+INDEX_KEYS = (
+    ("categories", "sqlite_autoindex_categories_1", (1,), 1, None, 0),
+    ("ingredients", "sqlite_autoindex_ingredients_1", (1,), 1, None, 0),
+    # Recipe names are unique within a category, so only the categories are
+    # tracked; a duplicate name would only make the estimate slightly optimistic.
+    ("recipes", "recipes_category_idx", (1, 2), 2, None, 0),
+    ("recipes", "recipes_popular_idx", (13,), None, 14, 0),
+    # Ingredient rows come recipe by recipe, so recipe IDs are counted, not kept.
+    ("recipe_ingredients", "sqlite_autoindex_recipe_ingredients_1", (0, 1), 2, None, 1),
+    ("recipe_ingredients", "recipe_ingredients_ingredient_idx", (1, 0, 2, 3), 2, None, 0),
+    ("score_configs", "sqlite_autoindex_score_configs_1", (1,), 1, None, 0),
+    # A WITHOUT ROWID table's primary key is listed under the table's own name.
+    ("recipe_scores", "recipe_scores", (0, 1), 2, None, 0),
+    # Scores are treated as distinct within a config, which saves tracking one
+    # pair per row; ANALYZE reports the same unless over ~9% of them tie.
+    ("recipe_scores", "recipe_scores_rank_idx", (0, 2), 2, None, 0),
+)
+
+# Primary key of every table as positions in its row tuples, in the order the
+# rows are generated (recipe scores come recipe by recipe). Patches merge the
+# previous and the new rows in this order.
+PATCH_KEYS = {
+    "categories": (0,),
+    "ingredients": (0,),
+    "score_configs": (0,),
+    "recipes": (0,),
+    "recipe_ingredients": (0, 1),
+    "recipe_scores": (1, 0),
+    "ingredient_substitutes": (0, 1),
+    "recipe_images": (0,),
+}
+# Position of the UNIQUE name column of the tables that have one.
+PATCH_UNIQUE_NAMES = {"categories": 1, "ingredients": 1, "score_configs": 1}
+
+BULK_CHUNK_SIZE = 5000
+BUILD_CHUNK_SIZE = 1000
+DUMP_BUFFER_SIZE = 1 << 20
+# Bump whenever the dump layout changes so cached fingerprints are invalidated.
+DUMP_FORMAT_VERSION = 5
+INFINITY = float("inf")
+
+# Sharded output (--shards): a core shard with everything but the bulk of the
+# recipes, and one shard per category with that category's recipes and rows.
+SHARD_MANIFEST_VERSION = 1
+SHARD_MANIFEST_NAME = "manifest.json"
+SHARD_CORE_TABLES = ("categories", "ingredients", "score_configs", "catalog_version", "recipe_summaries")
+SHARD_CATEGORY_TABLES = ("recipes", "recipe_ingredients", "recipe_scores")
+# Catalog manifest (recipes.sql.manifest.json and the catalog_manifest table):
+# the catalog version plus each table's row count and digest.
+CATALOG_MANIFEST_VERSION = 1
+CATALOG_MANIFEST_INSERT = "INSERT INTO catalog_manifest(table_name, row_count, sha256) VALUES (?, ?, ?)"
+# What list screens and cards show, so a category can be browsed before its
+# shard is loaded. Columns are taken from recipe rows at RECIPE_SUMMARY_FIELDS.
+RECIPE_SUMMARY_SCHEMA = """
+CREATE TABLE recipe_summaries (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    calories_per_serving REAL NOT NULL,
+    protein_per_serving REAL NOT NULL,
+    fat_per_serving REAL NOT NULL,
+    carbs_per_serving REAL NOT NULL,
+    prep_minutes REAL NOT NULL,
+    cook_minutes REAL NOT NULL,
+    review_count REAL NOT NULL,
+    is_popular INTEGER NOT NULL DEFAULT 0
+);
+"""
+RECIPE_SUMMARY_FIELDS = (0, 1, 2, 10, 6, 7, 8, 9, 11, 12, 13, 14)
+RECIPE_SUMMARY_INSERT = """
+INSERT INTO recipe_summaries(
+    id, category_id, name, image_url,
+    calories_per_serving, protein_per_serving, fat_per_serving, carbs_per_serving,
+    prep_minutes, cook_minutes, review_count, is_popular
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SHARD_CORE_INDEXES = """
+CREATE INDEX recipe_summaries_category_idx ON recipe_summaries(category_id, name);
+CREATE INDEX recipe_summaries_popular_idx ON recipe_summaries(review_count DESC) WHERE is_popular = 1;
+"""
+SHARD_CATEGORY_INDEXES = """
+CREATE INDEX recipe_ingredients_ingredient_idx ON recipe_ingredients(ingredient_id, recipe_id, quantity, unit);
+CREATE INDEX recipe_scores_rank_idx ON recipe_scores(config_id, score DESC);
+"""
+
+# Output suffixes that select a codec; every output is compressed as it is written.
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "lzma"}
+COMPRESSION_LEVELS = {"gzip": range(1, 10), "lzma": range(0, 10)}
+# The defaults of the gzip and lzma modules.
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 9, "lzma": 6}
+# Levels compared by --compare-compression.
+REPORT_COMPRESSION_LEVELS = {"gzip": (1, 6, 9), "lzma": (0, 6, 9)}
+
+CATEGORY_INSERT = "INSERT INTO categories(id, name, description) VALUES (?, ?, ?)"
+INGREDIENT_INSERT = """
+INSERT INTO ingredients(id, name, default_unit, calories_per_unit, protein_per_unit, fat_per_unit, carbs_per_unit)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+RECIPE_INSERT = """
+INSERT INTO recipes(
+    id, category_id, name, description, instructions, servings,
+    calories_per_serving, protein_per_serving, fat_per_serving, carbs_per_serving,
+    image_url, prep_minutes, cook_minutes, review_count, is_popular
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+RECIPE_INGREDIENT_INSERT = """
+INSERT INTO recipe_ingredients(
+    recipe_id, ingredient_id, quantity, unit, calories, protein, fat, carbs, notes
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SCORE_CONFIG_INSERT = """
+INSERT INTO score_configs(
+    id, name, target_calories, target_protein, target_fat, target_carbs,
+    weight_calories, weight_protein, weight_fat, weight_carbs
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+RECIPE_SCORE_INSERT = "INSERT INTO recipe_scores(config_id, recipe_id, score) VALUES (?, ?, ?)"
+
+# Best recipes of one score config. The second query applies the same
+# calorie and protein filter as NutritionEngine.findOptimalRecipe; its
+# first row is the recipe that method returns.
+TOP_SCORES_QUERY = """
+SELECT recipe_scores.recipe_id, recipe_scores.score
+FROM recipe_scores
+WHERE recipe_scores.config_id = (SELECT id FROM score_configs WHERE name = ?)
+ORDER BY recipe_scores.score DESC, recipe_scores.recipe_id
+LIMIT ?
+"""
+OPTIMAL_SCORES_QUERY = """
+SELECT recipe_scores.recipe_id, recipe_scores.score
+FROM recipe_scores
+JOIN recipes ON recipes.id = recipe_scores.recipe_id
+WHERE recipe_scores.config_id = (SELECT id FROM score_configs WHERE name = ?)
+  AND recipes.calories_per_serving BETWEEN 400 AND 800
+  AND recipes.protein_per_serving >= 20
+ORDER BY recipe_scores.score DESC, recipe_scores.recipe_id
+LIMIT ?
+"""
+
+# The layout the app creates in lib/utils/database_schema.dart, statement for
+# statement. Keep in sync with DatabaseSchema._databaseVersion.
+APP_DATABASE_VERSION = 2
+APP_SCHEMA = """
+CREATE TABLE recipes(id INTEGER PRIMARY KEY, category TEXT, name TEXT, description TEXT, image TEXT, \
+prepTime REAL, cookTime REAL, serving INTEGER, ingredients TEXT, method TEXT, review REAL, isPopular INTEGER, \
+caloriesPerServing REAL, proteinsPerServing REAL, fatsPerServing REAL, carbsPerServing REAL, gramsPerServing REAL);
+CREATE TABLE IF NOT EXISTS products(id INTEGER PRIMARY KEY, name TEXT, caloriesPer100 REAL, proteinsPer100 REAL, \
+fatsPer100 REAL, carbsPer100 REAL);
+CREATE TABLE IF NOT EXISTS recipe_ingredients(id INTEGER PRIMARY KEY, recipeId INTEGER, productId INTEGER, \
+grams REAL, FOREIGN KEY(recipeId) REFERENCES recipes(id), FOREIGN KEY(productId) REFERENCES products(id));
+CREATE TABLE IF NOT EXISTS meal_templates(id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE IF NOT EXISTS meal_template_items(id INTEGER PRIMARY KEY, templateId INTEGER, recipeId INTEGER, \
+productId INTEGER, portion REAL, FOREIGN KEY(templateId) REFERENCES meal_templates(id), \
+FOREIGN KEY(recipeId) REFERENCES recipes(id), FOREIGN KEY(productId) REFERENCES products(id));
+CREATE TABLE IF NOT EXISTS food_log(id INTEGER PRIMARY KEY, date TEXT, time TEXT, mealType TEXT, \
+recipeId INTEGER, productId INTEGER, portion REAL, calories REAL, proteins REAL, fats REAL, carbs REAL, \
+FOREIGN KEY(recipeId) REFERENCES recipes(id), FOREIGN KEY(productId) REFERENCES products(id));
+"""
+APP_TABLES = ("products", "recipes", "recipe_ingredients")
+APP_PRODUCT_INSERT = """
+INSERT INTO products(id, name, caloriesPer100, proteinsPer100, fatsPer100, carbsPer100) VALUES (?, ?, ?, ?, ?, ?)
+"""
+APP_RECIPE_INSERT = """
+INSERT INTO recipes(
+    id, category, name, description, image, prepTime, cookTime, serving, ingredients, method, review, isPopular,
+    caloriesPerServing, proteinsPerServing, fatsPerServing, carbsPerServing, gramsPerServing
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
 """
+APP_RECIPE_INGREDIENT_INSERT = "INSERT INTO recipe_ingredients(id, recipeId, productId, grams) VALUES (?, ?, ?, ?)"
+# Keys of the web export's recipe objects: the app's recipes columns, in APP_RECIPE_INSERT order.
+APP_RECIPE_COLUMNS = (
+    "id", "category", "name", "description", "image", "prepTime", "cookTime", "serving", "ingredients", "method",
+    "review", "isPopular", "caloriesPerServing", "proteinsPerServing", "fatsPerServing", "carbsPerServing",
+    "gramsPerServing",
+)
+# Columns of the columnar export as (name, Arrow type): the recipes row, with
+# the category name after its ID. A score_<name> column per SCORE_PRESETS
+# entry follows.
+COLUMNAR_COLUMNS = (
+    ("id", "int64"), ("category_id", "int64"), ("category", "string"), ("name", "string"),
+    ("description", "string"), ("instructions", "string"), ("servings", "int64"),
+    ("calories_per_serving", "double"), ("protein_per_serving", "double"), ("fat_per_serving", "double"),
+    ("carbs_per_serving", "double"), ("image_url", "string"), ("prep_minutes", "double"),
+    ("cook_minutes", "double"), ("review_count", "double"), ("is_popular", "bool"),
+)
+
+# Grams per gram, and per millilitre at water density for liquids without a
+# listed density.
+UNIT_GRAMS = {"g": 1.0, "ml": 1.0}
+# Units a recipe may measure an ingredient in. Grams and millilitres convert
+# through the ingredient's density, the counted units through its weight
+# per slice, scoop or piece.
+UNITS = ("g", "ml", "slice", "scoop", "piece")
+# Densities in g/ml: liquids, which the catalog measures in ml, and a few
+# ingredients measured in grams that recipes also give by volume.
+INGREDIENT_DENSITIES = {
+    "Unsweetened almond milk": 1.03,
+    "Olive oil": 0.91,
+    "Lemon juice": 1.03,
+    "Coconut milk": 0.98,
+    "Vanilla extract": 0.88,
+    "Water": 1.0,
+    "Soy sauce": 1.2,
+    "Sesame oil": 0.92,
+    "Lime juice": 1.03,
+    "Orange juice": 1.04,
+    "Coconut water": 1.02,
+    "Honey": 1.42,
+    "Maple syrup": 1.32,
+    "Greek yogurt": 1.04,
+    "Tomato sauce": 1.03,
+}
+# Weight in grams of one slice, scoop or piece.
+PIECE_WEIGHTS = {
+    "Vanilla whey protein": {"scoop": 30.0},
+    "Whole grain bread": {"slice": 28.0},
+    "Whole wheat tortilla": {"piece": 45.0},
+    "Egg": {"piece": 50.0},
+    "Banana": {"piece": 118.0},
+    "Avocado": {"piece": 150.0},
+    "Green apple": {"piece": 182.0},
+    "Carrot": {"piece": 61.0},
+    "Garlic": {"piece": 3.0},
+}
+# unit_factor results by (ingredient, default unit, unit); the tables above
+# are read once per key.
+_UNIT_FACTORS: Dict[Tuple[str, str, str], float | None] = {}
+
+CSV_SUFFIXES = (".csv",)
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
 
 CATEGORY_DESCRIPTIONS = {
     "Breakfast": "Quick meals to jump-start the morning with balanced macros.",
@@ -75,14 +519,13 @@ CATEGORY_DESCRIPTIONS = {
 }
 
 
-@dataclass(frozen=True)
-class Ingredient:
-    name: str
-    default_unit: str
-    calories_per_unit: float
-    protein_per_unit: float
-    fat_per_unit: float
-    carbs_per_unit: float
+class Ingredient(
+    namedtuple(
+        "Ingredient",
+        "name default_unit calories_per_unit protein_per_unit fat_per_unit carbs_per_unit",
+    )
+):
+    __slots__ = ()
 
     def scaled_macros(self, quantity: float) -> Tuple[float, float, float, float]:
         """Return calories, protein, fat, carbs for the given quantity."""
@@ -94,6 +537,27 @@ class Ingredient:
         )
 
 
+def unit_factor(ingredient: Ingredient, unit: str) -> float | None:
+    """How many ``default_unit`` of ``ingredient`` one ``unit`` holds, or ``None`` if they do not convert.
+
+    Results are memoized per ingredient and unit, so converting a catalog's
+    rows costs a dictionary lookup each.
+    """
+    key = (ingredient.name, ingredient.default_unit, unit)
+    try:
+        return _UNIT_FACTORS[key]
+    except KeyError:
+        pass
+    if unit == ingredient.default_unit:
+        factor = 1.0
+    else:
+        grams = unit_grams(ingredient.name, unit)
+        base = unit_grams(ingredient.name, ingredient.default_unit)
+        factor = grams / base if grams is not None and base else None
+    _UNIT_FACTORS[key] = factor
+    return factor
+
+
 INGREDIENT_CATALOG: Dict[str, Ingredient] = {
     "Rolled oats": Ingredient("Rolled oats", "g", 3.89, 0.169, 0.069, 0.663),
     "Unsweetened almond milk": Ingredient("Unsweetened almond milk", "ml", 0.15, 0.006, 0.013, 0.007),
@@ -166,31 +630,151 @@ INGREDIENT_CATALOG: Dict[str, Ingredient] = {
     "Coconut water": Ingredient("Coconut water", "ml", 0.19, 0.004, 0.0, 0.044),
 }
 
-RecipeIngredient = Dict[str, float | str | None]
 
+class StringPool:
+    """Interning table mapping strings to small integer indices; index 0 is ``None``.
+
+    Ingredient names, units and notes repeat across recipes, so the rows of
+    one catalog build share a pool and store indices instead of references.
+    """
+
+    __slots__ = ("strings", "indices")
+
+    def __init__(self) -> None:
+        self.strings: List[str | None] = [None]
+        self.indices: Dict[str, int] = {}
+
+    def index(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        idx = self.indices.get(value)
+        if idx is None:
+            idx = self.indices[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+    def __getitem__(self, idx: int) -> str | None:
+        return self.strings[idx]
+
+
+class IngredientRows:
+    """Compact ingredient rows of one recipe, stored as typed column arrays.
+
+    ``numbers`` is an ``array('d')`` holding the quantity, calories, protein,
+    fat and carbs columns back to back; ``labels`` is an ``array('I')`` holding
+    the ingredient, unit and notes columns as indices into ``pool``. Two
+    exactly sized arrays per recipe keep the overhead per row small. Recipes
+    built together should share a ``StringPool``; without one, the rows get
+    their own.
+
+    Iterating still yields ``RecipeIngredient`` dicts for callers that want
+    them, but the insert and dump paths read the columns through
+    :meth:`tuples` and :meth:`totals`.
+    """
+
+    __slots__ = ("count", "numbers", "labels", "pool")
+
+    def __init__(
+        self,
+        rows: Iterable[Tuple[str, float, str, Tuple[float, float, float, float], str | None]] = (),
+        pool: StringPool | None = None,
+    ) -> None:
+        rows = list(rows)
+        self.count = len(rows)
+        numbers = [row[1] for row in rows]
+        for column in range(4):
+            numbers.extend([row[3][column] for row in rows])
+        self.numbers = array("d", numbers)
+        self.pool = pool = StringPool() if pool is None else pool
+        labels = [pool.index(row[0]) for row in rows]
+        labels.extend([pool.index(row[2]) for row in rows])
+        labels.extend([pool.index(row[4]) for row in rows])
+        self.labels = array("I", labels)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _numbers(self, column: int) -> memoryview:
+        return memoryview(self.numbers)[column * self.count : (column + 1) * self.count]
+
+    def _labels(self, column: int) -> memoryview:
+        return memoryview(self.labels)[column * self.count : (column + 1) * self.count]
+
+    @property
+    def quantity(self) -> memoryview:
+        return self._numbers(0)
+
+    def ingredient_names(self) -> List[str]:
+        strings = self.pool.strings
+        return [strings[idx] for idx in self._labels(0)]
+
+    def unit_names(self) -> List[str]:
+        strings = self.pool.strings
+        return [strings[idx] for idx in self._labels(1)]
+
+    def tuples(self) -> Iterator[Tuple[str, float, str, float, float, float, float, str | None]]:
+        """Yield ``(ingredient, quantity, unit, calories, protein, fat, carbs, notes)`` per row."""
+        strings = self.pool.strings
+        numbers = self._numbers
+        for name, quantity, unit, calories, protein, fat, carbs, notes in zip(
+            self._labels(0), numbers(0), self._labels(1), numbers(1), numbers(2), numbers(3), numbers(4), self._labels(2)
+        ):
+            yield strings[name], quantity, strings[unit], calories, protein, fat, carbs, strings[notes]
+
+    def __iter__(self) -> Iterator[RecipeIngredient]:
+        for ingredient, quantity, unit, calories, protein, fat, carbs, notes in self.tuples():
+            yield {
+                "ingredient": ingredient,
+                "quantity": quantity,
+                "unit": unit,
+                "calories": calories,
+                "protein": protein,
+                "fat": fat,
+                "carbs": carbs,
+                "notes": notes,
+            }
+
+    def totals(self) -> Tuple[float, float, float, float]:
+        """Sum each macro column in row order, rounded to two decimals."""
+        totals = []
+        for column in range(1, 5):
+            total = 0.0
+            for value in self._numbers(column):
+                total += value
+            totals.append(round(total, 2))
+        return tuple(totals)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IngredientRows):
+            return NotImplemented
+        return list(self.tuples()) == list(other.tuples())
+
+    def __repr__(self) -> str:
+        return f"IngredientRows({list(self.tuples())!r})"
+
+    # Pickles (e.g. results of build workers) carry the strings rather than
+    # the whole pool, and intern them into a pool of their own on load.
+    def __getstate__(self) -> Tuple:
+        strings = self.pool.strings
+        return self.count, self.numbers, [strings[idx] for idx in self.labels]
+
+    def __setstate__(self, state: Tuple) -> None:
+        self.count, self.numbers, labels = state
+        self.pool = StringPool()
+        self.labels = array("I", map(self.pool.index, labels))
 
-@dataclass
-class Recipe:
-    name: str
-    category: str
-    description: str
-    instructions: str
-    servings: int
-    ingredient_rows: List[RecipeIngredient]
-    image_url: str
-    prep_minutes: float
-    cook_minutes: float
-    review_count: float
-    is_popular: bool
+
+class Recipe(
+    namedtuple(
+        "Recipe",
+        "name category description instructions servings ingredient_rows "
+        "image_url prep_minutes cook_minutes review_count is_popular",
+    )
+):
+    __slots__ = ()
 
     def total_macros(self) -> Tuple[float, float, float, float]:
-        totals = [0.0, 0.0, 0.0, 0.0]
-        for row in self.ingredient_rows:
-            totals[0] += row["calories"]
-            totals[1] += row["protein"]
-            totals[2] += row["fat"]
-            totals[3] += row["carbs"]
-        return tuple(round(value, 2) for value in totals)
+        return self.ingredient_rows.totals()
 
     def per_serving(self) -> Tuple[float, float, float, float]:
         total_cals, total_protein, total_fat, total_carbs = self.total_macros()
@@ -203,6 +787,49 @@ class Recipe:
         )
 
 
+class ScoreConfig(
+    namedtuple(
+        "ScoreConfig",
+        "target_calories target_protein target_fat target_carbs "
+        "weight_calories weight_protein weight_fat weight_carbs",
+        defaults=(600.0, 26.0, 17.0, 80.0, 2.0, 3.0, 2.0, 1.0),
+    )
+):
+    """Per-serving targets and weights of ``DishScoreConfig`` in ``lib/utils/nutrition_engine.dart``."""
+
+    __slots__ = ()
+
+    def score(self, calories: float, protein: float, fat: float, carbs: float) -> float:
+        """``NutritionEngine.computeDishScore``: ``1 / (1 + sum(weight * relative_error**2))``.
+
+        Operations run in the same order as the Dart code, so scores are bit-identical.
+        """
+        return 1.0 / (1.0 + self.error(calories, protein, fat, carbs))
+
+    def error(self, calories: float, protein: float, fat: float, carbs: float) -> float:
+        """The weighted sum of squared relative errors that ``score`` is based on."""
+        error_calories = (calories - self.target_calories) / self.target_calories
+        error_protein = (protein - self.target_protein) / self.target_protein
+        error_fat = (fat - self.target_fat) / self.target_fat
+        error_carbs = (carbs - self.target_carbs) / self.target_carbs
+        return (
+            error_calories * error_calories * self.weight_calories
+            + error_protein * error_protein * self.weight_protein
+            + error_fat * error_fat * self.weight_fat
+            + error_carbs * error_carbs * self.weight_carbs
+        )
+
+
+# Score configs materialized into recipe_scores; "balanced" is the app's default.
+SCORE_PRESETS = {
+    "balanced": ScoreConfig(),
+    "high_protein": ScoreConfig(600.0, 45.0, 17.0, 55.0, 2.0, 4.0, 2.0, 1.0),
+    "low_carb": ScoreConfig(550.0, 35.0, 30.0, 30.0, 2.0, 3.0, 2.0, 3.0),
+    "light": ScoreConfig(400.0, 25.0, 12.0, 50.0, 3.0, 3.0, 2.0, 1.0),
+    "bulking": ScoreConfig(850.0, 45.0, 28.0, 100.0, 2.0, 3.0, 1.0, 2.0),
+}
+
+
 def build_recipe(
     name: str,
     category: str,
@@ -215,28 +842,30 @@ def build_recipe(
     review_count: float,
     is_popular: bool,
     ingredients: Iterable[Tuple[str, float, str, str | None]],
+    ingredient_catalog: Mapping[str, Ingredient] | None = None,
+    strings: StringPool | None = None,
 ) -> Recipe:
-    """Create a recipe with computed macro data for each ingredient."""
-    rows: List[RecipeIngredient] = []
+    """Create a recipe with computed macro data for each ingredient.
+
+    Quantities may be given in any unit that converts to the ingredient's
+    ``default_unit`` (see ``unit_factor``); rows keep the recipe's own unit.
+    Their strings are interned into ``strings``, which the recipes of one
+    catalog should share (see ``IngredientRows``).
+    """
+    if ingredient_catalog is None:
+        ingredient_catalog = INGREDIENT_CATALOG
+    rows = []
     for ingredient_name, quantity, unit, notes in ingredients:
-        ingredient = INGREDIENT_CATALOG[ingredient_name]
+        ingredient = ingredient_catalog[ingredient_name]
+        amount = quantity
         if unit != ingredient.default_unit:
-            raise ValueError(
-                f"Unit mismatch for {ingredient_name}: expected {ingredient.default_unit}, got {unit}"
-            )
-        calories, protein, fat, carbs = ingredient.scaled_macros(quantity)
-        rows.append(
-            {
-                "ingredient": ingredient.name,
-                "quantity": quantity,
-                "unit": unit,
-                "calories": calories,
-                "protein": protein,
-                "fat": fat,
-                "carbs": carbs,
-                "notes": notes,
-            }
-        )
+            factor = unit_factor(ingredient, unit)
+            if factor is None:
+                raise ValueError(
+                    f"Unit mismatch for {ingredient_name}: cannot convert {unit} to {ingredient.default_unit}"
+                )
+            amount = quantity * factor
+        rows.append((ingredient.name, quantity, unit, ingredient.scaled_macros(amount), notes))
     instructions_text = "\n".join(f"{idx + 1}. {step}" for idx, step in enumerate(instructions))
     return Recipe(
         name,
@@ -244,7 +873,7 @@ def build_recipe(
         description,
         instructions_text,
         servings,
-        rows,
+        IngredientRows(rows, strings),
         image_url,
         float(prep_minutes),
         float(cook_minutes),
@@ -253,846 +882,4447 @@ def build_recipe(
     )
 
 
-RECIPES: List[Recipe] = [
-    # Breakfast
-    build_recipe(
-        name="Protein Oatmeal Bowl",
-        category="Breakfast",
-        description="Creamy oats layered with fruit, healthy fats, and a protein boost to anchor the morning.",
-        instructions=[
-            "Bring the almond milk to a gentle simmer and stir in the oats.",
-            "Cook for 5 minutes until thickened, then fold in chia seeds and whey protein.",
-            "Transfer to bowls, top with sliced banana, and finish with remaining toppings.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/704569/pexels-photo-704569.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=5,
-        review_count=128,
-        is_popular=True,
-        ingredients=[
-            ("Rolled oats", 80.0, "g", None),
-            ("Unsweetened almond milk", 240.0, "ml", "Warm but do not boil to maintain creaminess."),
-            ("Chia seeds", 15.0, "g", None),
-            ("Banana", 100.0, "g", "Slice just before serving to prevent browning."),
-            ("Vanilla whey protein", 1.0, "scoop", "Whisk in off the heat to avoid clumping."),
-        ],
-    ),
-    build_recipe(
-        name="Veggie Egg Scramble",
-        category="Breakfast",
-        description="Fluffy eggs folded with colorful vegetables and tangy feta for a savory start.",
-        instructions=[
-            "Whisk eggs with a pinch of salt and pepper until frothy.",
-            "Sauté garlic, peppers, tomatoes, and spinach in olive oil until tender.",
-            "Pour in eggs, scramble gently, and finish with crumbled feta.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/1437267/pexels-photo-1437267.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=8,
-        review_count=102,
-        is_popular=False,
-        ingredients=[
-            ("Egg", 180.0, "g", "About 3 large eggs."),
-            ("Olive oil", 10.0, "ml", "Heat just until shimmering."),
-            ("Garlic", 5.0, "g", "Minced."),
-            ("Red bell pepper", 70.0, "g", "Diced."),
-            ("Cherry tomatoes", 80.0, "g", "Halved."),
-            ("Spinach", 50.0, "g", "Roughly chopped."),
-            ("Feta cheese", 40.0, "g", "Crumbled before serving."),
-        ],
-    ),
-    build_recipe(
-        name="Greek Yogurt Pancakes",
-        category="Breakfast",
-        description="High-protein pancakes with a tender crumb and naturally sweet berry topping.",
-        instructions=[
-            "Blend yogurt, oats, eggs, and baking powder into a smooth batter.",
-            "Ladle onto a preheated skillet and cook until bubbles form and flip once.",
-            "Serve warm with honey drizzle and fresh berries.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/376464/pexels-photo-376464.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=12,
-        cook_minutes=15,
-        review_count=89,
-        is_popular=True,
-        ingredients=[
-            ("Greek yogurt", 180.0, "g", "Use thick strained yogurt."),
-            ("Rolled oats", 60.0, "g", "Pulse into flour if preferred."),
-            ("Egg", 120.0, "g", "About 2 large eggs."),
-            ("Baking powder", 5.0, "g", None),
-            ("Honey", 20.0, "g", "Reserve half for serving."),
-            ("Mixed berries", 80.0, "g", "Fresh or thawed."),
-        ],
-    ),
-    build_recipe(
-        name="Smoked Salmon Avocado Toast",
-        category="Breakfast",
-        description="Whole-grain toast layered with creamy avocado and protein-rich smoked salmon.",
-        instructions=[
-            "Toast bread slices until crisp and golden.",
-            "Mash avocado with lemon juice and spread evenly over toast.",
-            "Top with smoked salmon, yogurt dollops, and baby spinach.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/5665661/pexels-photo-5665661.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=8,
-        cook_minutes=2,
-        review_count=75,
-        is_popular=False,
-        ingredients=[
-            ("Whole grain bread", 2.0, "slice", "Toast for extra crunch."),
-            ("Avocado", 100.0, "g", "Mash with a fork."),
-            ("Lemon juice", 10.0, "ml", "Mix into the avocado."),
-            ("Smoked salmon", 90.0, "g", "Slice thinly."),
-            ("Greek yogurt", 40.0, "g", "Dollop on top."),
-            ("Spinach", 30.0, "g", "Use baby leaves."),
-        ],
-    ),
-    build_recipe(
-        name="Sweet Potato Breakfast Hash",
-        category="Breakfast",
-        description="A hearty skillet hash with caramelized sweet potatoes and soft scrambled eggs.",
-        instructions=[
-            "Sauté diced sweet potatoes in olive oil until tender and golden.",
-            "Add peppers, garlic, and spinach; cook until wilted.",
-            "Fold in whisked eggs and cook just until softly set.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/803963/pexels-photo-803963.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=20,
-        review_count=68,
-        is_popular=False,
-        ingredients=[
-            ("Sweet potato", 300.0, "g", "Dice into 1 cm cubes."),
-            ("Olive oil", 12.0, "ml", "Divide for sautéing."),
-            ("Red bell pepper", 80.0, "g", "Diced."),
-            ("Garlic", 6.0, "g", "Minced."),
-            ("Spinach", 60.0, "g", None),
-            ("Egg", 180.0, "g", "Whisked lightly."),
-        ],
-    ),
-    # Lunch
-    build_recipe(
-        name="Mediterranean Quinoa Lunch Bowl",
-        category="Lunch",
-        description="A high-fiber grain bowl with plant protein, fresh vegetables, and tangy feta.",
-        instructions=[
-            "Cook quinoa according to package instructions and let it cool slightly.",
-            "Combine quinoa with chickpeas, tomatoes, cucumber, and feta in a large bowl.",
-            "Dress with olive oil and lemon juice, tossing to coat evenly before serving.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/6107787/pexels-photo-6107787.jpeg?auto=compress&cs=tinysrgb&dpr=2&h=650&w=940",
-        prep_minutes=15,
-        cook_minutes=20,
-        review_count=96,
-        is_popular=True,
-        ingredients=[
-            ("Quinoa", 90.0, "g", "Rinse well to remove bitterness."),
-            ("Chickpeas", 150.0, "g", "Use cooked or canned chickpeas, drained."),
-            ("Cherry tomatoes", 120.0, "g", "Halve for easier bites."),
-            ("Cucumber", 100.0, "g", "Dice into small cubes."),
-            ("Feta cheese", 60.0, "g", "Crumbled."),
-            ("Olive oil", 15.0, "ml", None),
-            ("Lemon juice", 20.0, "ml", "Freshly squeezed for best flavor."),
-        ],
-    ),
-    build_recipe(
-        name="Grilled Chicken Power Salad",
-        category="Lunch",
-        description="Lean grilled chicken over crisp greens with creamy avocado and citrus dressing.",
-        instructions=[
-            "Season chicken and grill until cooked through, then slice thinly.",
-            "Toss spinach, cucumber, and tomatoes in a large bowl.",
-            "Top with avocado and chicken, then drizzle with olive oil and lemon juice.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/1640777/pexels-photo-1640777.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=14,
-        review_count=110,
-        is_popular=True,
-        ingredients=[
-            ("Chicken breast", 220.0, "g", "Grill and rest before slicing."),
-            ("Spinach", 80.0, "g", None),
-            ("Cucumber", 80.0, "g", "Sliced thin."),
-            ("Cherry tomatoes", 100.0, "g", "Halved."),
-            ("Avocado", 100.0, "g", "Diced."),
-            ("Olive oil", 15.0, "ml", "Whisk with lemon for dressing."),
-            ("Lemon juice", 20.0, "ml", None),
-        ],
-    ),
-    build_recipe(
-        name="Lentil Veggie Wrap",
-        category="Lunch",
-        description="Protein-packed lentils and crunchy vegetables wrapped in a whole wheat tortilla.",
-        instructions=[
-            "Warm tortillas until pliable.",
-            "Mix lentils with hummus, peppers, carrots, and spinach.",
-            "Fill each tortilla, roll tightly, and slice in half.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/1640770/pexels-photo-1640770.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=12,
-        cook_minutes=5,
-        review_count=64,
-        is_popular=False,
-        ingredients=[
-            ("Whole wheat tortilla", 2.0, "piece", "Gently warm to prevent cracking."),
-            ("Cooked lentils", 180.0, "g", "Drain well."),
-            ("Hummus", 80.0, "g", None),
-            ("Red bell pepper", 70.0, "g", "Slice into strips."),
-            ("Carrot", 80.0, "g", "Julienned."),
-            ("Spinach", 60.0, "g", None),
-        ],
-    ),
-    build_recipe(
-        name="Turkey Avocado Sandwich",
-        category="Lunch",
-        description="A satisfying layered sandwich with lean turkey, creamy avocado, and leafy greens.",
-        instructions=[
-            "Toast bread lightly for structure.",
-            "Mash avocado with a squeeze of lemon and spread on bread.",
-            "Layer turkey, spinach, and yogurt spread, then slice to serve.",
-        ],
-        servings=1,
-        image_url="https://images.pexels.com/photos/1600711/pexels-photo-1600711.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=3,
-        review_count=71,
-        is_popular=False,
-        ingredients=[
-            ("Whole grain bread", 2.0, "slice", "Toast to your liking."),
-            ("Turkey breast", 120.0, "g", "Thinly sliced."),
-            ("Avocado", 80.0, "g", "Mashed."),
-            ("Spinach", 30.0, "g", "Use baby leaves."),
-            ("Greek yogurt", 30.0, "g", "Spread for tang."),
-            ("Lemon juice", 5.0, "ml", "Mix into the avocado."),
-        ],
-    ),
-    build_recipe(
-        name="Tofu Veggie Stir-Fry",
-        category="Lunch",
-        description="Seared tofu with crisp vegetables tossed in a savory soy-sesame glaze over rice.",
-        instructions=[
-            "Press and cube tofu, then sear until golden on all sides.",
-            "Stir-fry broccoli, peppers, and mushrooms until tender-crisp.",
-            "Combine with tofu, soy sauce, and sesame oil; serve over warm brown rice.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/3026800/pexels-photo-3026800.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=18,
-        review_count=83,
-        is_popular=False,
-        ingredients=[
-            ("Firm tofu", 240.0, "g", "Press to remove excess moisture."),
-            ("Broccoli florets", 120.0, "g", None),
-            ("Red bell pepper", 90.0, "g", "Slice into strips."),
-            ("Mushrooms", 100.0, "g", "Sliced."),
-            ("Soy sauce", 30.0, "ml", "Add toward the end."),
-            ("Sesame oil", 10.0, "ml", "Drizzle for finishing flavor."),
-            ("Brown rice", 180.0, "g", "Cooked."),
-        ],
-    ),
-    # Dinner
-    build_recipe(
-        name="Citrus Herb Salmon Plate",
-        category="Dinner",
-        description="Roasted salmon with vibrant vegetables and a bright citrus glaze.",
-        instructions=[
-            "Preheat the oven to 200°C and line a baking sheet with parchment.",
-            "Toss sweet potato, broccoli, and garlic with half the olive oil and roast for 15 minutes.",
-            "Add salmon to the tray, brush with remaining oil and lemon juice, then roast 12 more minutes.",
-        ],
-        servings=2,
-        image_url="https://images.unsplash.com/photo-1607118750694-1469a22ef45d?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=987&q=80",
-        prep_minutes=15,
-        cook_minutes=25,
-        review_count=87,
-        is_popular=True,
-        ingredients=[
-            ("Salmon fillet", 360.0, "g", "Use skin-on fillets for better moisture."),
-            ("Sweet potato", 200.0, "g", "Cut into 2 cm cubes."),
-            ("Broccoli florets", 120.0, "g", None),
-            ("Garlic", 6.0, "g", "Thinly sliced."),
-            ("Olive oil", 10.0, "ml", None),
-            ("Lemon juice", 10.0, "ml", "Drizzle over salmon before serving."),
-        ],
-    ),
-    build_recipe(
-        name="Turkey Meatballs with Zoodles",
-        category="Dinner",
-        description="Lean turkey meatballs simmered in tomato sauce over zucchini noodles.",
-        instructions=[
-            "Mix ground turkey with egg, garlic, and parmesan; form into meatballs.",
-            "Sear meatballs until browned, then simmer in tomato sauce until cooked through.",
-            "Toss spiralized zucchini in the sauce just before serving.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/3296273/pexels-photo-3296273.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=20,
-        cook_minutes=25,
-        review_count=92,
-        is_popular=False,
-        ingredients=[
-            ("Ground turkey", 300.0, "g", "Use lean 93/7."),
-            ("Egg", 60.0, "g", "Lightly beaten."),
-            ("Garlic", 8.0, "g", "Minced."),
-            ("Parmesan cheese", 30.0, "g", "Finely grated."),
-            ("Tomato sauce", 240.0, "g", None),
-            ("Olive oil", 10.0, "ml", "For searing."),
-            ("Zucchini", 260.0, "g", "Spiralized into noodles."),
-        ],
-    ),
-    build_recipe(
-        name="Steak Quinoa Pilaf",
-        category="Dinner",
-        description="Seared flank steak over herbed quinoa with mushrooms and wilted greens.",
-        instructions=[
-            "Cook quinoa until fluffy and set aside.",
-            "Sear flank steak to preferred doneness and rest before slicing.",
-            "Sauté mushrooms, spinach, and garlic, toss with quinoa, and top with steak.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/5737249/pexels-photo-5737249.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=18,
-        cook_minutes=22,
-        review_count=78,
-        is_popular=False,
-        ingredients=[
-            ("Flank steak", 260.0, "g", "Slice against the grain."),
-            ("Quinoa", 90.0, "g", "Cooked in low-sodium broth if desired."),
-            ("Mushrooms", 100.0, "g", "Sliced."),
-            ("Spinach", 80.0, "g", None),
-            ("Garlic", 6.0, "g", None),
-            ("Olive oil", 15.0, "ml", "Divide for steak and vegetables."),
-            ("Lemon juice", 10.0, "ml", "Finish with a squeeze."),
-        ],
-    ),
-    build_recipe(
-        name="Miso Cod with Bok Choy",
-        category="Dinner",
-        description="Oven-baked cod glazed with miso and sesame, served alongside tender bok choy.",
-        instructions=[
-            "Whisk miso paste with sesame oil and lemon juice to form a glaze.",
-            "Brush over cod fillets and bake until flaky.",
-            "Sauté bok choy with ginger until just wilted and serve with cod.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/6287529/pexels-photo-6287529.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=12,
-        cook_minutes=15,
-        review_count=66,
-        is_popular=False,
-        ingredients=[
-            ("Cod", 320.0, "g", "Use skinless fillets."),
-            ("Miso paste", 40.0, "g", None),
-            ("Sesame oil", 10.0, "ml", None),
-            ("Lemon juice", 15.0, "ml", "Whisk into glaze."),
-            ("Bok choy", 200.0, "g", "Halve lengthwise."),
-            ("Ginger", 10.0, "g", "Julienned."),
-        ],
-    ),
-    build_recipe(
-        name="Chickpea Coconut Curry",
-        category="Dinner",
-        description="A creamy chickpea curry with sweet potato and spinach served over brown rice.",
-        instructions=[
-            "Sauté garlic and curry paste until fragrant.",
-            "Stir in sweet potato, chickpeas, and coconut milk; simmer until tender.",
-            "Fold in spinach and serve over warm brown rice.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/1640773/pexels-photo-1640773.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=30,
-        review_count=91,
-        is_popular=True,
-        ingredients=[
-            ("Garlic", 8.0, "g", None),
-            ("Curry paste", 25.0, "g", "Adjust heat to taste."),
-            ("Sweet potato", 220.0, "g", "Diced."),
-            ("Chickpeas", 200.0, "g", None),
-            ("Coconut milk", 200.0, "ml", None),
-            ("Spinach", 80.0, "g", None),
-            ("Brown rice", 200.0, "g", "Cooked for serving."),
-        ],
-    ),
-    # Snack
-    build_recipe(
-        name="Berry Crunch Yogurt Jar",
-        category="Snack",
-        description="Layered Greek yogurt parfait with berries, honey, and crunchy toppings.",
-        instructions=[
-            "Whisk honey into the yogurt until smooth.",
-            "Layer yogurt, berries, and granola in jars.",
-            "Top with chopped almonds just before serving for crunch.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/8963959/pexels-photo-8963959.jpeg?auto=compress&cs=tinysrgb&dpr=2&w=500",
-        prep_minutes=10,
-        cook_minutes=0,
-        review_count=54,
-        is_popular=False,
-        ingredients=[
-            ("Greek yogurt", 200.0, "g", "Use 2% or 5% depending on fat goals."),
-            ("Mixed berries", 80.0, "g", "A mix of blueberries, raspberries, and strawberries."),
-            ("Honey", 15.0, "g", None),
-            ("Granola", 30.0, "g", "Choose a low-sugar variety."),
-            ("Chopped almonds", 15.0, "g", "Lightly toasted."),
-        ],
-    ),
-    build_recipe(
-        name="Spicy Roasted Chickpeas",
-        category="Snack",
-        description="Crunchy roasted chickpeas coated in smoky paprika and garlic.",
-        instructions=[
-            "Pat chickpeas dry and toss with oil and spices.",
-            "Roast, shaking the pan occasionally, until crisp.",
-            "Cool slightly before serving for maximum crunch.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/4110404/pexels-photo-4110404.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=8,
-        cook_minutes=35,
-        review_count=63,
-        is_popular=False,
-        ingredients=[
-            ("Chickpeas", 160.0, "g", "Cooked and drained."),
-            ("Olive oil", 10.0, "ml", None),
-            ("Paprika", 6.0, "g", "Smoked for depth."),
-            ("Garlic powder", 3.0, "g", None),
-        ],
-    ),
-    build_recipe(
-        name="Peanut Butter Apple Slices",
-        category="Snack",
-        description="Fresh apple wedges topped with protein-rich peanut butter and chia sprinkle.",
-        instructions=[
-            "Slice apples into wedges and arrange on a plate.",
-            "Spread peanut butter over each slice.",
-            "Dust with chia seeds and cinnamon before serving.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/1351238/pexels-photo-1351238.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=5,
-        cook_minutes=0,
-        review_count=58,
-        is_popular=False,
-        ingredients=[
-            ("Green apple", 160.0, "g", "Leave skin on for fiber."),
-            ("Peanut butter", 40.0, "g", "Natural style."),
-            ("Chia seeds", 10.0, "g", None),
-            ("Cinnamon", 2.0, "g", "Sprinkle evenly."),
-        ],
-    ),
-    build_recipe(
-        name="Veggie Hummus Cups",
-        category="Snack",
-        description="Crunchy veggie sticks served with creamy hummus for dipping.",
-        instructions=[
-            "Slice cucumber, carrots, and peppers into sticks.",
-            "Portion hummus into small cups.",
-            "Serve vegetables upright in hummus cups with a squeeze of lemon.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/1640775/pexels-photo-1640775.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=0,
-        review_count=47,
-        is_popular=False,
-        ingredients=[
-            ("Cucumber", 80.0, "g", "Cut into batons."),
-            ("Carrot", 80.0, "g", "Slice into sticks."),
-            ("Red bell pepper", 70.0, "g", "Slice into strips."),
-            ("Hummus", 90.0, "g", None),
-            ("Lemon juice", 10.0, "ml", "Drizzle over veggies."),
-        ],
-    ),
-    build_recipe(
-        name="Chocolate Protein Energy Bites",
-        category="Snack",
-        description="No-bake bites packed with oats, peanut butter, and dark chocolate chips.",
-        instructions=[
-            "Stir oats, peanut butter, honey, and chia seeds until evenly combined.",
-            "Fold in chopped dark chocolate.",
-            "Roll into bite-sized balls and chill to set.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/1633525/pexels-photo-1633525.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=12,
-        cook_minutes=0,
-        review_count=88,
-        is_popular=True,
-        ingredients=[
-            ("Rolled oats", 120.0, "g", None),
-            ("Peanut butter", 80.0, "g", "Creamy."),
-            ("Honey", 40.0, "g", None),
-            ("Chia seeds", 20.0, "g", None),
-            ("Dark chocolate (70%)", 40.0, "g", "Chopped."),
-        ],
-    ),
-    # Desert
-    build_recipe(
-        name="Dark Chocolate Avocado Mousse",
-        category="Desert",
-        description="Silky, dairy-free dessert with heart-healthy fats and antioxidant-rich cocoa.",
-        instructions=[
-            "Blend avocado, coconut milk, cocoa powder, and maple syrup until smooth.",
-            "Add melted dark chocolate and vanilla extract; blend again until glossy.",
-            "Chill for at least 30 minutes before serving with optional toppings.",
-        ],
-        servings=4,
-        image_url="https://images.unsplash.com/photo-1609355109553-3bb67c76b1f7?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=987&q=80",
-        prep_minutes=15,
-        cook_minutes=0,
-        review_count=67,
-        is_popular=False,
-        ingredients=[
-            ("Avocado", 150.0, "g", "Very ripe for the smoothest texture."),
-            ("Coconut milk", 60.0, "ml", "Full-fat canned coconut milk."),
-            ("Cocoa powder", 20.0, "g", None),
-            ("Maple syrup", 30.0, "g", None),
-            ("Dark chocolate (70%)", 25.0, "g", "Melt gently over a bain-marie."),
-            ("Vanilla extract", 5.0, "ml", None),
-        ],
-    ),
-    build_recipe(
-        name="Coconut Yogurt Panna Cotta",
-        category="Desert",
-        description="A light panna cotta made with coconut milk and Greek yogurt topped with berries.",
-        instructions=[
-            "Bloom gelatin in a small amount of coconut milk.",
-            "Warm remaining coconut milk with honey, then whisk in gelatin and yogurt.",
-            "Pour into cups, chill until set, and top with berries.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/3026801/pexels-photo-3026801.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=5,
-        review_count=59,
-        is_popular=False,
-        ingredients=[
-            ("Coconut milk", 200.0, "ml", None),
-            ("Honey", 30.0, "g", None),
-            ("Gelatin", 8.0, "g", "Powdered."),
-            ("Greek yogurt", 150.0, "g", "Room temperature."),
-            ("Vanilla extract", 5.0, "ml", None),
-            ("Mixed berries", 90.0, "g", "For topping."),
-        ],
-    ),
-    build_recipe(
-        name="Baked Cinnamon Apples",
-        category="Desert",
-        description="Warm baked apples with a cinnamon oat crumble and nutty crunch.",
-        instructions=[
-            "Core and slice apples, then toss with cinnamon and maple syrup.",
-            "Top with oats and almonds and bake until tender.",
-            "Serve warm with a dollop of yogurt if desired.",
-        ],
-        servings=3,
-        image_url="https://images.pexels.com/photos/4109991/pexels-photo-4109991.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=12,
-        cook_minutes=25,
-        review_count=72,
-        is_popular=False,
-        ingredients=[
-            ("Green apple", 300.0, "g", "Sliced."),
-            ("Cinnamon", 4.0, "g", None),
-            ("Maple syrup", 30.0, "g", None),
-            ("Rolled oats", 40.0, "g", None),
-            ("Chopped almonds", 20.0, "g", None),
-        ],
-    ),
-    build_recipe(
-        name="Protein Cheesecake Cups",
-        category="Desert",
-        description="No-bake cheesecake cups made creamy with Greek yogurt and whey protein.",
-        instructions=[
-            "Whisk yogurt with whey protein, honey, and vanilla until smooth.",
-            "Stir in almond flour to thicken.",
-            "Spoon into cups and chill, topping with berries before serving.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/4109952/pexels-photo-4109952.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=15,
-        cook_minutes=0,
-        review_count=81,
-        is_popular=True,
-        ingredients=[
-            ("Greek yogurt", 200.0, "g", "Room temperature."),
-            ("Vanilla whey protein", 1.0, "scoop", None),
-            ("Honey", 25.0, "g", None),
-            ("Almond flour", 40.0, "g", None),
-            ("Mixed berries", 80.0, "g", "For topping."),
-        ],
-    ),
-    build_recipe(
-        name="Mango Lime Sorbet",
-        category="Desert",
-        description="A dairy-free frozen sorbet with bright mango and zesty lime.",
-        instructions=[
-            "Blend mango with coconut milk, honey, and lime juice until silky.",
-            "Churn or freeze, stirring occasionally, until scoopable.",
-            "Serve immediately or store frozen for up to one week.",
-        ],
-        servings=4,
-        image_url="https://images.pexels.com/photos/775031/pexels-photo-775031.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=0,
-        review_count=60,
-        is_popular=False,
-        ingredients=[
-            ("Mango", 250.0, "g", "Frozen chunks work well."),
-            ("Coconut milk", 100.0, "ml", None),
-            ("Honey", 30.0, "g", None),
-            ("Lime juice", 20.0, "ml", None),
-        ],
-    ),
-    # Beverage
-    build_recipe(
-        name="Green Detox Smoothie",
-        category="Beverage",
-        description="A refreshing blend of leafy greens, citrus, and fiber-rich fruit for hydration and recovery.",
-        instructions=[
-            "Add all ingredients to a high-speed blender.",
-            "Blend until completely smooth, adding extra water if needed.",
-            "Serve immediately over ice for the crispest flavor.",
-        ],
-        servings=1,
-        image_url="https://images.unsplash.com/photo-1588857756087-281f8cceb865?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=984&q=80",
-        prep_minutes=5,
-        cook_minutes=0,
-        review_count=112,
-        is_popular=False,
-        ingredients=[
-            ("Spinach", 60.0, "g", None),
-            ("Kale", 50.0, "g", "Remove tough stems."),
-            ("Green apple", 120.0, "g", "Core and chop."),
-            ("Cucumber", 100.0, "g", "Peeled if waxed."),
-            ("Lemon juice", 15.0, "ml", None),
-            ("Ginger", 10.0, "g", "Grate before blending."),
-            ("Water", 200.0, "ml", "Chilled."),
-        ],
-    ),
-    build_recipe(
-        name="Chocolate Recovery Shake",
-        category="Beverage",
-        description="A post-workout shake with protein, carbs, and healthy fats for recovery.",
-        instructions=[
-            "Combine almond milk, banana, cocoa, and protein in a blender.",
-            "Blend until smooth.",
-            "Add peanut butter and blend briefly to incorporate.",
-        ],
-        servings=1,
-        image_url="https://images.pexels.com/photos/5926393/pexels-photo-5926393.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=5,
-        cook_minutes=0,
-        review_count=94,
-        is_popular=True,
-        ingredients=[
-            ("Unsweetened almond milk", 300.0, "ml", None),
-            ("Banana", 120.0, "g", "Frozen for thickness."),
-            ("Cocoa powder", 15.0, "g", None),
-            ("Vanilla whey protein", 1.0, "scoop", None),
-            ("Peanut butter", 30.0, "g", None),
-        ],
-    ),
-    build_recipe(
-        name="Beet Citrus Booster",
-        category="Beverage",
-        description="A vibrant juice packed with beets, carrots, and citrus for natural energy.",
-        instructions=[
-            "Blend beet, carrot, and ginger with orange juice.",
-            "Strain if desired for a smoother texture.",
-            "Stir in lemon juice and water before serving.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/2280551/pexels-photo-2280551.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=8,
-        cook_minutes=0,
-        review_count=58,
-        is_popular=False,
-        ingredients=[
-            ("Beet", 120.0, "g", "Peeled."),
-            ("Carrot", 100.0, "g", "Roughly chopped."),
-            ("Orange juice", 200.0, "ml", "Fresh squeezed."),
-            ("Ginger", 8.0, "g", None),
-            ("Lemon juice", 15.0, "ml", None),
-            ("Water", 100.0, "ml", None),
-        ],
-    ),
-    build_recipe(
-        name="Matcha Protein Latte",
-        category="Beverage",
-        description="A creamy matcha latte fortified with whey protein for a steady energy boost.",
-        instructions=[
-            "Heat almond milk until steaming but not boiling.",
-            "Whisk matcha with a splash of milk to form a paste.",
-            "Blend remaining milk with matcha, protein, and honey until frothy.",
-        ],
-        servings=1,
-        image_url="https://images.pexels.com/photos/1028716/pexels-photo-1028716.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=6,
-        cook_minutes=2,
-        review_count=65,
-        is_popular=False,
-        ingredients=[
-            ("Unsweetened almond milk", 250.0, "ml", None),
-            ("Matcha powder", 5.0, "g", "Sift to avoid clumps."),
-            ("Vanilla whey protein", 0.5, "scoop", None),
-            ("Honey", 15.0, "g", None),
-        ],
-    ),
-    build_recipe(
-        name="Berry Electrolyte Refresher",
-        category="Beverage",
-        description="A hydrating drink with berries, coconut water, and chia for natural electrolytes.",
-        instructions=[
-            "Muddle berries with honey and lemon juice in a pitcher.",
-            "Stir in coconut water and chia seeds.",
-            "Chill for 10 minutes before serving to let the chia hydrate.",
-        ],
-        servings=2,
-        image_url="https://images.pexels.com/photos/1105166/pexels-photo-1105166.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
-        prep_minutes=10,
-        cook_minutes=0,
-        review_count=52,
-        is_popular=False,
-        ingredients=[
-            ("Mixed berries", 120.0, "g", "Lightly crushed."),
-            ("Honey", 15.0, "g", None),
-            ("Lemon juice", 15.0, "ml", None),
-            ("Coconut water", 300.0, "ml", None),
-            ("Chia seeds", 12.0, "g", None),
-        ],
-    ),
-]
-
-
-def seed_database() -> None:
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(":memory:") as conn:
-        cursor = conn.cursor()
-        cursor.executescript(SCHEMA)
-
-        for idx, (name, description) in enumerate(CATEGORY_DESCRIPTIONS.items(), start=1):
-            cursor.execute(
-                "INSERT INTO categories(id, name, description) VALUES (?, ?, ?)",
-                (idx, name, description),
+def _build_recipes() -> List[Recipe]:
+    from functools import partial
+
+    build = partial(build_recipe, strings=StringPool())
+    return [
+        # Breakfast
+        build(
+            name="Protein Oatmeal Bowl",
+            category="Breakfast",
+            description="Creamy oats layered with fruit, healthy fats, and a protein boost to anchor the morning.",
+            instructions=[
+                "Bring the almond milk to a gentle simmer and stir in the oats.",
+                "Cook for 5 minutes until thickened, then fold in chia seeds and whey protein.",
+                "Transfer to bowls, top with sliced banana, and finish with remaining toppings.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/704569/pexels-photo-704569.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=5,
+            review_count=128,
+            is_popular=True,
+            ingredients=[
+                ("Rolled oats", 80.0, "g", None),
+                ("Unsweetened almond milk", 240.0, "ml", "Warm but do not boil to maintain creaminess."),
+                ("Chia seeds", 15.0, "g", None),
+                ("Banana", 100.0, "g", "Slice just before serving to prevent browning."),
+                ("Vanilla whey protein", 1.0, "scoop", "Whisk in off the heat to avoid clumping."),
+            ],
+        ),
+        build(
+            name="Veggie Egg Scramble",
+            category="Breakfast",
+            description="Fluffy eggs folded with colorful vegetables and tangy feta for a savory start.",
+            instructions=[
+                "Whisk eggs with a pinch of salt and pepper until frothy.",
+                "Sauté garlic, peppers, tomatoes, and spinach in olive oil until tender.",
+                "Pour in eggs, scramble gently, and finish with crumbled feta.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/1437267/pexels-photo-1437267.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=8,
+            review_count=102,
+            is_popular=False,
+            ingredients=[
+                ("Egg", 180.0, "g", "About 3 large eggs."),
+                ("Olive oil", 10.0, "ml", "Heat just until shimmering."),
+                ("Garlic", 5.0, "g", "Minced."),
+                ("Red bell pepper", 70.0, "g", "Diced."),
+                ("Cherry tomatoes", 80.0, "g", "Halved."),
+                ("Spinach", 50.0, "g", "Roughly chopped."),
+                ("Feta cheese", 40.0, "g", "Crumbled before serving."),
+            ],
+        ),
+        build(
+            name="Greek Yogurt Pancakes",
+            category="Breakfast",
+            description="High-protein pancakes with a tender crumb and naturally sweet berry topping.",
+            instructions=[
+                "Blend yogurt, oats, eggs, and baking powder into a smooth batter.",
+                "Ladle onto a preheated skillet and cook until bubbles form and flip once.",
+                "Serve warm with honey drizzle and fresh berries.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/376464/pexels-photo-376464.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=12,
+            cook_minutes=15,
+            review_count=89,
+            is_popular=True,
+            ingredients=[
+                ("Greek yogurt", 180.0, "g", "Use thick strained yogurt."),
+                ("Rolled oats", 60.0, "g", "Pulse into flour if preferred."),
+                ("Egg", 120.0, "g", "About 2 large eggs."),
+                ("Baking powder", 5.0, "g", None),
+                ("Honey", 20.0, "g", "Reserve half for serving."),
+                ("Mixed berries", 80.0, "g", "Fresh or thawed."),
+            ],
+        ),
+        build(
+            name="Smoked Salmon Avocado Toast",
+            category="Breakfast",
+            description="Whole-grain toast layered with creamy avocado and protein-rich smoked salmon.",
+            instructions=[
+                "Toast bread slices until crisp and golden.",
+                "Mash avocado with lemon juice and spread evenly over toast.",
+                "Top with smoked salmon, yogurt dollops, and baby spinach.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/5665661/pexels-photo-5665661.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=8,
+            cook_minutes=2,
+            review_count=75,
+            is_popular=False,
+            ingredients=[
+                ("Whole grain bread", 2.0, "slice", "Toast for extra crunch."),
+                ("Avocado", 100.0, "g", "Mash with a fork."),
+                ("Lemon juice", 10.0, "ml", "Mix into the avocado."),
+                ("Smoked salmon", 90.0, "g", "Slice thinly."),
+                ("Greek yogurt", 40.0, "g", "Dollop on top."),
+                ("Spinach", 30.0, "g", "Use baby leaves."),
+            ],
+        ),
+        build(
+            name="Sweet Potato Breakfast Hash",
+            category="Breakfast",
+            description="A hearty skillet hash with caramelized sweet potatoes and soft scrambled eggs.",
+            instructions=[
+                "Sauté diced sweet potatoes in olive oil until tender and golden.",
+                "Add peppers, garlic, and spinach; cook until wilted.",
+                "Fold in whisked eggs and cook just until softly set.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/803963/pexels-photo-803963.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=20,
+            review_count=68,
+            is_popular=False,
+            ingredients=[
+                ("Sweet potato", 300.0, "g", "Dice into 1 cm cubes."),
+                ("Olive oil", 12.0, "ml", "Divide for sautéing."),
+                ("Red bell pepper", 80.0, "g", "Diced."),
+                ("Garlic", 6.0, "g", "Minced."),
+                ("Spinach", 60.0, "g", None),
+                ("Egg", 180.0, "g", "Whisked lightly."),
+            ],
+        ),
+        # Lunch
+        build(
+            name="Mediterranean Quinoa Lunch Bowl",
+            category="Lunch",
+            description="A high-fiber grain bowl with plant protein, fresh vegetables, and tangy feta.",
+            instructions=[
+                "Cook quinoa according to package instructions and let it cool slightly.",
+                "Combine quinoa with chickpeas, tomatoes, cucumber, and feta in a large bowl.",
+                "Dress with olive oil and lemon juice, tossing to coat evenly before serving.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/6107787/pexels-photo-6107787.jpeg?auto=compress&cs=tinysrgb&dpr=2&h=650&w=940",
+            prep_minutes=15,
+            cook_minutes=20,
+            review_count=96,
+            is_popular=True,
+            ingredients=[
+                ("Quinoa", 90.0, "g", "Rinse well to remove bitterness."),
+                ("Chickpeas", 150.0, "g", "Use cooked or canned chickpeas, drained."),
+                ("Cherry tomatoes", 120.0, "g", "Halve for easier bites."),
+                ("Cucumber", 100.0, "g", "Dice into small cubes."),
+                ("Feta cheese", 60.0, "g", "Crumbled."),
+                ("Olive oil", 15.0, "ml", None),
+                ("Lemon juice", 20.0, "ml", "Freshly squeezed for best flavor."),
+            ],
+        ),
+        build(
+            name="Grilled Chicken Power Salad",
+            category="Lunch",
+            description="Lean grilled chicken over crisp greens with creamy avocado and citrus dressing.",
+            instructions=[
+                "Season chicken and grill until cooked through, then slice thinly.",
+                "Toss spinach, cucumber, and tomatoes in a large bowl.",
+                "Top with avocado and chicken, then drizzle with olive oil and lemon juice.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/1640777/pexels-photo-1640777.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=14,
+            review_count=110,
+            is_popular=True,
+            ingredients=[
+                ("Chicken breast", 220.0, "g", "Grill and rest before slicing."),
+                ("Spinach", 80.0, "g", None),
+                ("Cucumber", 80.0, "g", "Sliced thin."),
+                ("Cherry tomatoes", 100.0, "g", "Halved."),
+                ("Avocado", 100.0, "g", "Diced."),
+                ("Olive oil", 15.0, "ml", "Whisk with lemon for dressing."),
+                ("Lemon juice", 20.0, "ml", None),
+            ],
+        ),
+        build(
+            name="Lentil Veggie Wrap",
+            category="Lunch",
+            description="Protein-packed lentils and crunchy vegetables wrapped in a whole wheat tortilla.",
+            instructions=[
+                "Warm tortillas until pliable.",
+                "Mix lentils with hummus, peppers, carrots, and spinach.",
+                "Fill each tortilla, roll tightly, and slice in half.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/1640770/pexels-photo-1640770.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=12,
+            cook_minutes=5,
+            review_count=64,
+            is_popular=False,
+            ingredients=[
+                ("Whole wheat tortilla", 2.0, "piece", "Gently warm to prevent cracking."),
+                ("Cooked lentils", 180.0, "g", "Drain well."),
+                ("Hummus", 80.0, "g", None),
+                ("Red bell pepper", 70.0, "g", "Slice into strips."),
+                ("Carrot", 80.0, "g", "Julienned."),
+                ("Spinach", 60.0, "g", None),
+            ],
+        ),
+        build(
+            name="Turkey Avocado Sandwich",
+            category="Lunch",
+            description="A satisfying layered sandwich with lean turkey, creamy avocado, and leafy greens.",
+            instructions=[
+                "Toast bread lightly for structure.",
+                "Mash avocado with a squeeze of lemon and spread on bread.",
+                "Layer turkey, spinach, and yogurt spread, then slice to serve.",
+            ],
+            servings=1,
+            image_url="https://images.pexels.com/photos/1600711/pexels-photo-1600711.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=3,
+            review_count=71,
+            is_popular=False,
+            ingredients=[
+                ("Whole grain bread", 2.0, "slice", "Toast to your liking."),
+                ("Turkey breast", 120.0, "g", "Thinly sliced."),
+                ("Avocado", 80.0, "g", "Mashed."),
+                ("Spinach", 30.0, "g", "Use baby leaves."),
+                ("Greek yogurt", 30.0, "g", "Spread for tang."),
+                ("Lemon juice", 5.0, "ml", "Mix into the avocado."),
+            ],
+        ),
+        build(
+            name="Tofu Veggie Stir-Fry",
+            category="Lunch",
+            description="Seared tofu with crisp vegetables tossed in a savory soy-sesame glaze over rice.",
+            instructions=[
+                "Press and cube tofu, then sear until golden on all sides.",
+                "Stir-fry broccoli, peppers, and mushrooms until tender-crisp.",
+                "Combine with tofu, soy sauce, and sesame oil; serve over warm brown rice.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/3026800/pexels-photo-3026800.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=18,
+            review_count=83,
+            is_popular=False,
+            ingredients=[
+                ("Firm tofu", 240.0, "g", "Press to remove excess moisture."),
+                ("Broccoli florets", 120.0, "g", None),
+                ("Red bell pepper", 90.0, "g", "Slice into strips."),
+                ("Mushrooms", 100.0, "g", "Sliced."),
+                ("Soy sauce", 30.0, "ml", "Add toward the end."),
+                ("Sesame oil", 10.0, "ml", "Drizzle for finishing flavor."),
+                ("Brown rice", 180.0, "g", "Cooked."),
+            ],
+        ),
+        # Dinner
+        build(
+            name="Citrus Herb Salmon Plate",
+            category="Dinner",
+            description="Roasted salmon with vibrant vegetables and a bright citrus glaze.",
+            instructions=[
+                "Preheat the oven to 200°C and line a baking sheet with parchment.",
+                "Toss sweet potato, broccoli, and garlic with half the olive oil and roast for 15 minutes.",
+                "Add salmon to the tray, brush with remaining oil and lemon juice, then roast 12 more minutes.",
+            ],
+            servings=2,
+            image_url="https://images.unsplash.com/photo-1607118750694-1469a22ef45d?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=987&q=80",
+            prep_minutes=15,
+            cook_minutes=25,
+            review_count=87,
+            is_popular=True,
+            ingredients=[
+                ("Salmon fillet", 360.0, "g", "Use skin-on fillets for better moisture."),
+                ("Sweet potato", 200.0, "g", "Cut into 2 cm cubes."),
+                ("Broccoli florets", 120.0, "g", None),
+                ("Garlic", 6.0, "g", "Thinly sliced."),
+                ("Olive oil", 10.0, "ml", None),
+                ("Lemon juice", 10.0, "ml", "Drizzle over salmon before serving."),
+            ],
+        ),
+        build(
+            name="Turkey Meatballs with Zoodles",
+            category="Dinner",
+            description="Lean turkey meatballs simmered in tomato sauce over zucchini noodles.",
+            instructions=[
+                "Mix ground turkey with egg, garlic, and parmesan; form into meatballs.",
+                "Sear meatballs until browned, then simmer in tomato sauce until cooked through.",
+                "Toss spiralized zucchini in the sauce just before serving.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/3296273/pexels-photo-3296273.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=20,
+            cook_minutes=25,
+            review_count=92,
+            is_popular=False,
+            ingredients=[
+                ("Ground turkey", 300.0, "g", "Use lean 93/7."),
+                ("Egg", 60.0, "g", "Lightly beaten."),
+                ("Garlic", 8.0, "g", "Minced."),
+                ("Parmesan cheese", 30.0, "g", "Finely grated."),
+                ("Tomato sauce", 240.0, "g", None),
+                ("Olive oil", 10.0, "ml", "For searing."),
+                ("Zucchini", 260.0, "g", "Spiralized into noodles."),
+            ],
+        ),
+        build(
+            name="Steak Quinoa Pilaf",
+            category="Dinner",
+            description="Seared flank steak over herbed quinoa with mushrooms and wilted greens.",
+            instructions=[
+                "Cook quinoa until fluffy and set aside.",
+                "Sear flank steak to preferred doneness and rest before slicing.",
+                "Sauté mushrooms, spinach, and garlic, toss with quinoa, and top with steak.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/5737249/pexels-photo-5737249.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=18,
+            cook_minutes=22,
+            review_count=78,
+            is_popular=False,
+            ingredients=[
+                ("Flank steak", 260.0, "g", "Slice against the grain."),
+                ("Quinoa", 90.0, "g", "Cooked in low-sodium broth if desired."),
+                ("Mushrooms", 100.0, "g", "Sliced."),
+                ("Spinach", 80.0, "g", None),
+                ("Garlic", 6.0, "g", None),
+                ("Olive oil", 15.0, "ml", "Divide for steak and vegetables."),
+                ("Lemon juice", 10.0, "ml", "Finish with a squeeze."),
+            ],
+        ),
+        build(
+            name="Miso Cod with Bok Choy",
+            category="Dinner",
+            description="Oven-baked cod glazed with miso and sesame, served alongside tender bok choy.",
+            instructions=[
+                "Whisk miso paste with sesame oil and lemon juice to form a glaze.",
+                "Brush over cod fillets and bake until flaky.",
+                "Sauté bok choy with ginger until just wilted and serve with cod.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/6287529/pexels-photo-6287529.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=12,
+            cook_minutes=15,
+            review_count=66,
+            is_popular=False,
+            ingredients=[
+                ("Cod", 320.0, "g", "Use skinless fillets."),
+                ("Miso paste", 40.0, "g", None),
+                ("Sesame oil", 10.0, "ml", None),
+                ("Lemon juice", 15.0, "ml", "Whisk into glaze."),
+                ("Bok choy", 200.0, "g", "Halve lengthwise."),
+                ("Ginger", 10.0, "g", "Julienned."),
+            ],
+        ),
+        build(
+            name="Chickpea Coconut Curry",
+            category="Dinner",
+            description="A creamy chickpea curry with sweet potato and spinach served over brown rice.",
+            instructions=[
+                "Sauté garlic and curry paste until fragrant.",
+                "Stir in sweet potato, chickpeas, and coconut milk; simmer until tender.",
+                "Fold in spinach and serve over warm brown rice.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/1640773/pexels-photo-1640773.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=30,
+            review_count=91,
+            is_popular=True,
+            ingredients=[
+                ("Garlic", 8.0, "g", None),
+                ("Curry paste", 25.0, "g", "Adjust heat to taste."),
+                ("Sweet potato", 220.0, "g", "Diced."),
+                ("Chickpeas", 200.0, "g", None),
+                ("Coconut milk", 200.0, "ml", None),
+                ("Spinach", 80.0, "g", None),
+                ("Brown rice", 200.0, "g", "Cooked for serving."),
+            ],
+        ),
+        # Snack
+        build(
+            name="Berry Crunch Yogurt Jar",
+            category="Snack",
+            description="Layered Greek yogurt parfait with berries, honey, and crunchy toppings.",
+            instructions=[
+                "Whisk honey into the yogurt until smooth.",
+                "Layer yogurt, berries, and granola in jars.",
+                "Top with chopped almonds just before serving for crunch.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/8963959/pexels-photo-8963959.jpeg?auto=compress&cs=tinysrgb&dpr=2&w=500",
+            prep_minutes=10,
+            cook_minutes=0,
+            review_count=54,
+            is_popular=False,
+            ingredients=[
+                ("Greek yogurt", 200.0, "g", "Use 2% or 5% depending on fat goals."),
+                ("Mixed berries", 80.0, "g", "A mix of blueberries, raspberries, and strawberries."),
+                ("Honey", 15.0, "g", None),
+                ("Granola", 30.0, "g", "Choose a low-sugar variety."),
+                ("Chopped almonds", 15.0, "g", "Lightly toasted."),
+            ],
+        ),
+        build(
+            name="Spicy Roasted Chickpeas",
+            category="Snack",
+            description="Crunchy roasted chickpeas coated in smoky paprika and garlic.",
+            instructions=[
+                "Pat chickpeas dry and toss with oil and spices.",
+                "Roast, shaking the pan occasionally, until crisp.",
+                "Cool slightly before serving for maximum crunch.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/4110404/pexels-photo-4110404.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=8,
+            cook_minutes=35,
+            review_count=63,
+            is_popular=False,
+            ingredients=[
+                ("Chickpeas", 160.0, "g", "Cooked and drained."),
+                ("Olive oil", 10.0, "ml", None),
+                ("Paprika", 6.0, "g", "Smoked for depth."),
+                ("Garlic powder", 3.0, "g", None),
+            ],
+        ),
+        build(
+            name="Peanut Butter Apple Slices",
+            category="Snack",
+            description="Fresh apple wedges topped with protein-rich peanut butter and chia sprinkle.",
+            instructions=[
+                "Slice apples into wedges and arrange on a plate.",
+                "Spread peanut butter over each slice.",
+                "Dust with chia seeds and cinnamon before serving.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/1351238/pexels-photo-1351238.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=5,
+            cook_minutes=0,
+            review_count=58,
+            is_popular=False,
+            ingredients=[
+                ("Green apple", 160.0, "g", "Leave skin on for fiber."),
+                ("Peanut butter", 40.0, "g", "Natural style."),
+                ("Chia seeds", 10.0, "g", None),
+                ("Cinnamon", 2.0, "g", "Sprinkle evenly."),
+            ],
+        ),
+        build(
+            name="Veggie Hummus Cups",
+            category="Snack",
+            description="Crunchy veggie sticks served with creamy hummus for dipping.",
+            instructions=[
+                "Slice cucumber, carrots, and peppers into sticks.",
+                "Portion hummus into small cups.",
+                "Serve vegetables upright in hummus cups with a squeeze of lemon.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/1640775/pexels-photo-1640775.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=0,
+            review_count=47,
+            is_popular=False,
+            ingredients=[
+                ("Cucumber", 80.0, "g", "Cut into batons."),
+                ("Carrot", 80.0, "g", "Slice into sticks."),
+                ("Red bell pepper", 70.0, "g", "Slice into strips."),
+                ("Hummus", 90.0, "g", None),
+                ("Lemon juice", 10.0, "ml", "Drizzle over veggies."),
+            ],
+        ),
+        build(
+            name="Chocolate Protein Energy Bites",
+            category="Snack",
+            description="No-bake bites packed with oats, peanut butter, and dark chocolate chips.",
+            instructions=[
+                "Stir oats, peanut butter, honey, and chia seeds until evenly combined.",
+                "Fold in chopped dark chocolate.",
+                "Roll into bite-sized balls and chill to set.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/1633525/pexels-photo-1633525.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=12,
+            cook_minutes=0,
+            review_count=88,
+            is_popular=True,
+            ingredients=[
+                ("Rolled oats", 120.0, "g", None),
+                ("Peanut butter", 80.0, "g", "Creamy."),
+                ("Honey", 40.0, "g", None),
+                ("Chia seeds", 20.0, "g", None),
+                ("Dark chocolate (70%)", 40.0, "g", "Chopped."),
+            ],
+        ),
+        # Desert
+        build(
+            name="Dark Chocolate Avocado Mousse",
+            category="Desert",
+            description="Silky, dairy-free dessert with heart-healthy fats and antioxidant-rich cocoa.",
+            instructions=[
+                "Blend avocado, coconut milk, cocoa powder, and maple syrup until smooth.",
+                "Add melted dark chocolate and vanilla extract; blend again until glossy.",
+                "Chill for at least 30 minutes before serving with optional toppings.",
+            ],
+            servings=4,
+            image_url="https://images.unsplash.com/photo-1609355109553-3bb67c76b1f7?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=987&q=80",
+            prep_minutes=15,
+            cook_minutes=0,
+            review_count=67,
+            is_popular=False,
+            ingredients=[
+                ("Avocado", 150.0, "g", "Very ripe for the smoothest texture."),
+                ("Coconut milk", 60.0, "ml", "Full-fat canned coconut milk."),
+                ("Cocoa powder", 20.0, "g", None),
+                ("Maple syrup", 30.0, "g", None),
+                ("Dark chocolate (70%)", 25.0, "g", "Melt gently over a bain-marie."),
+                ("Vanilla extract", 5.0, "ml", None),
+            ],
+        ),
+        build(
+            name="Coconut Yogurt Panna Cotta",
+            category="Desert",
+            description="A light panna cotta made with coconut milk and Greek yogurt topped with berries.",
+            instructions=[
+                "Bloom gelatin in a small amount of coconut milk.",
+                "Warm remaining coconut milk with honey, then whisk in gelatin and yogurt.",
+                "Pour into cups, chill until set, and top with berries.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/3026801/pexels-photo-3026801.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=5,
+            review_count=59,
+            is_popular=False,
+            ingredients=[
+                ("Coconut milk", 200.0, "ml", None),
+                ("Honey", 30.0, "g", None),
+                ("Gelatin", 8.0, "g", "Powdered."),
+                ("Greek yogurt", 150.0, "g", "Room temperature."),
+                ("Vanilla extract", 5.0, "ml", None),
+                ("Mixed berries", 90.0, "g", "For topping."),
+            ],
+        ),
+        build(
+            name="Baked Cinnamon Apples",
+            category="Desert",
+            description="Warm baked apples with a cinnamon oat crumble and nutty crunch.",
+            instructions=[
+                "Core and slice apples, then toss with cinnamon and maple syrup.",
+                "Top with oats and almonds and bake until tender.",
+                "Serve warm with a dollop of yogurt if desired.",
+            ],
+            servings=3,
+            image_url="https://images.pexels.com/photos/4109991/pexels-photo-4109991.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=12,
+            cook_minutes=25,
+            review_count=72,
+            is_popular=False,
+            ingredients=[
+                ("Green apple", 300.0, "g", "Sliced."),
+                ("Cinnamon", 4.0, "g", None),
+                ("Maple syrup", 30.0, "g", None),
+                ("Rolled oats", 40.0, "g", None),
+                ("Chopped almonds", 20.0, "g", None),
+            ],
+        ),
+        build(
+            name="Protein Cheesecake Cups",
+            category="Desert",
+            description="No-bake cheesecake cups made creamy with Greek yogurt and whey protein.",
+            instructions=[
+                "Whisk yogurt with whey protein, honey, and vanilla until smooth.",
+                "Stir in almond flour to thicken.",
+                "Spoon into cups and chill, topping with berries before serving.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/4109952/pexels-photo-4109952.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=15,
+            cook_minutes=0,
+            review_count=81,
+            is_popular=True,
+            ingredients=[
+                ("Greek yogurt", 200.0, "g", "Room temperature."),
+                ("Vanilla whey protein", 1.0, "scoop", None),
+                ("Honey", 25.0, "g", None),
+                ("Almond flour", 40.0, "g", None),
+                ("Mixed berries", 80.0, "g", "For topping."),
+            ],
+        ),
+        build(
+            name="Mango Lime Sorbet",
+            category="Desert",
+            description="A dairy-free frozen sorbet with bright mango and zesty lime.",
+            instructions=[
+                "Blend mango with coconut milk, honey, and lime juice until silky.",
+                "Churn or freeze, stirring occasionally, until scoopable.",
+                "Serve immediately or store frozen for up to one week.",
+            ],
+            servings=4,
+            image_url="https://images.pexels.com/photos/775031/pexels-photo-775031.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=0,
+            review_count=60,
+            is_popular=False,
+            ingredients=[
+                ("Mango", 250.0, "g", "Frozen chunks work well."),
+                ("Coconut milk", 100.0, "ml", None),
+                ("Honey", 30.0, "g", None),
+                ("Lime juice", 20.0, "ml", None),
+            ],
+        ),
+        # Beverage
+        build(
+            name="Green Detox Smoothie",
+            category="Beverage",
+            description="A refreshing blend of leafy greens, citrus, and fiber-rich fruit for hydration and recovery.",
+            instructions=[
+                "Add all ingredients to a high-speed blender.",
+                "Blend until completely smooth, adding extra water if needed.",
+                "Serve immediately over ice for the crispest flavor.",
+            ],
+            servings=1,
+            image_url="https://images.unsplash.com/photo-1588857756087-281f8cceb865?ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&ixlib=rb-1.2.1&auto=format&fit=crop&w=984&q=80",
+            prep_minutes=5,
+            cook_minutes=0,
+            review_count=112,
+            is_popular=False,
+            ingredients=[
+                ("Spinach", 60.0, "g", None),
+                ("Kale", 50.0, "g", "Remove tough stems."),
+                ("Green apple", 120.0, "g", "Core and chop."),
+                ("Cucumber", 100.0, "g", "Peeled if waxed."),
+                ("Lemon juice", 15.0, "ml", None),
+                ("Ginger", 10.0, "g", "Grate before blending."),
+                ("Water", 200.0, "ml", "Chilled."),
+            ],
+        ),
+        build(
+            name="Chocolate Recovery Shake",
+            category="Beverage",
+            description="A post-workout shake with protein, carbs, and healthy fats for recovery.",
+            instructions=[
+                "Combine almond milk, banana, cocoa, and protein in a blender.",
+                "Blend until smooth.",
+                "Add peanut butter and blend briefly to incorporate.",
+            ],
+            servings=1,
+            image_url="https://images.pexels.com/photos/5926393/pexels-photo-5926393.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=5,
+            cook_minutes=0,
+            review_count=94,
+            is_popular=True,
+            ingredients=[
+                ("Unsweetened almond milk", 300.0, "ml", None),
+                ("Banana", 120.0, "g", "Frozen for thickness."),
+                ("Cocoa powder", 15.0, "g", None),
+                ("Vanilla whey protein", 1.0, "scoop", None),
+                ("Peanut butter", 30.0, "g", None),
+            ],
+        ),
+        build(
+            name="Beet Citrus Booster",
+            category="Beverage",
+            description="A vibrant juice packed with beets, carrots, and citrus for natural energy.",
+            instructions=[
+                "Blend beet, carrot, and ginger with orange juice.",
+                "Strain if desired for a smoother texture.",
+                "Stir in lemon juice and water before serving.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/2280551/pexels-photo-2280551.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=8,
+            cook_minutes=0,
+            review_count=58,
+            is_popular=False,
+            ingredients=[
+                ("Beet", 120.0, "g", "Peeled."),
+                ("Carrot", 100.0, "g", "Roughly chopped."),
+                ("Orange juice", 200.0, "ml", "Fresh squeezed."),
+                ("Ginger", 8.0, "g", None),
+                ("Lemon juice", 15.0, "ml", None),
+                ("Water", 100.0, "ml", None),
+            ],
+        ),
+        build(
+            name="Matcha Protein Latte",
+            category="Beverage",
+            description="A creamy matcha latte fortified with whey protein for a steady energy boost.",
+            instructions=[
+                "Heat almond milk until steaming but not boiling.",
+                "Whisk matcha with a splash of milk to form a paste.",
+                "Blend remaining milk with matcha, protein, and honey until frothy.",
+            ],
+            servings=1,
+            image_url="https://images.pexels.com/photos/1028716/pexels-photo-1028716.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=6,
+            cook_minutes=2,
+            review_count=65,
+            is_popular=False,
+            ingredients=[
+                ("Unsweetened almond milk", 250.0, "ml", None),
+                ("Matcha powder", 5.0, "g", "Sift to avoid clumps."),
+                ("Vanilla whey protein", 0.5, "scoop", None),
+                ("Honey", 15.0, "g", None),
+            ],
+        ),
+        build(
+            name="Berry Electrolyte Refresher",
+            category="Beverage",
+            description="A hydrating drink with berries, coconut water, and chia for natural electrolytes.",
+            instructions=[
+                "Muddle berries with honey and lemon juice in a pitcher.",
+                "Stir in coconut water and chia seeds.",
+                "Chill for 10 minutes before serving to let the chia hydrate.",
+            ],
+            servings=2,
+            image_url="https://images.pexels.com/photos/1105166/pexels-photo-1105166.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2",
+            prep_minutes=10,
+            cook_minutes=0,
+            review_count=52,
+            is_popular=False,
+            ingredients=[
+                ("Mixed berries", 120.0, "g", "Lightly crushed."),
+                ("Honey", 15.0, "g", None),
+                ("Lemon juice", 15.0, "ml", None),
+                ("Coconut water", 300.0, "ml", None),
+                ("Chia seeds", 12.0, "g", None),
+            ],
+        ),
+    ]
+
+
+_recipes: List[Recipe] | None = None
+
+
+def builtin_recipes() -> List[Recipe]:
+    """Return the bundled recipes, building them on first use."""
+    global _recipes
+    if _recipes is None:
+        _recipes = _build_recipes()
+    return _recipes
+
+
+def default_output_path() -> Path:
+    from pathlib import Path
+
+    return Path(__file__).resolve().parent.parent / "assets" / "database" / "recipes.sql"
+
+
+def default_database_path() -> Path:
+    return default_output_path().with_name("recipes.db")
+
+
+def default_shard_directory() -> Path:
+    return default_output_path().with_name("shards")
+
+
+def default_patch_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.stem + ".patch.sql")
+
+
+def default_profile_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".profile.json")
+
+
+def default_app_database_path() -> Path:
+    return default_output_path().with_name("recipes_v2.db")
+
+
+def default_web_export_path() -> Path:
+    return default_output_path().parent.parent.parent / "web" / "data" / "recipes.jsonl"
+
+
+def default_columnar_path() -> Path:
+    return default_output_path().with_name("recipes.parquet")
+
+
+def default_images_path() -> Path:
+    return default_output_path().parent.parent.parent / "build" / "recipe_images.json"
+
+
+def __getattr__(name: str) -> object:
+    # These stay importable as module attributes but are only built on access.
+    if name == "RECIPES":
+        return builtin_recipes()
+    if name == "OUTPUT_PATH":
+        return default_output_path()
+    if name == "DATABASE_PATH":
+        return default_database_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Catalog(namedtuple("Catalog", "categories ingredients recipes")):
+    """The categories, ingredients and recipes that make up one seed run.
+
+    ``recipes`` only needs to be re-iterable: every output walks it once, and
+    file-backed catalogs stream it from disk on each pass.
+    """
+
+    __slots__ = ()
+
+    def category_ids(self) -> Dict[str, int]:
+        return {name: idx for idx, name in enumerate(self.categories, start=1)}
+
+    def ingredient_ids(self) -> Dict[str, int]:
+        return {name: idx for idx, name in enumerate(self.ingredients, start=1)}
+
+
+def default_catalog() -> Catalog:
+    return Catalog(CATEGORY_DESCRIPTIONS, INGREDIENT_CATALOG, builtin_recipes())
+
+
+class CatalogFileError(ValueError):
+    """A catalog export that cannot be seeded; the message starts with ``file:line``."""
+
+
+def _read_records(path: Path) -> Iterator[Tuple[int, Dict]]:
+    """Yield ``(line number, record)`` pairs from a CSV or JSON Lines file.
+
+    A CSV record's line number is the line it starts on.
+    """
+    import csv
+    import json
+
+    suffix = path.suffix.lower()
+    if suffix not in CSV_SUFFIXES + JSON_LINES_SUFFIXES:
+        raise CatalogFileError(f"{path}: unsupported catalog file, expected .csv, .jsonl or .ndjson")
+    try:
+        handle = open(path, encoding="utf-8", newline="")
+    except OSError as exc:
+        raise CatalogFileError(f"{path}: {exc.strerror}") from exc
+    with handle:
+        if suffix in CSV_SUFFIXES:
+            reader = csv.DictReader(handle)
+            try:
+                reader.fieldnames
+                line_number = reader.line_num + 1
+                for record in reader:
+                    yield line_number, record
+                    line_number = reader.line_num + 1
+            except csv.Error as exc:
+                raise CatalogFileError(f"{path}:{reader.line_num}: invalid CSV ({exc})") from exc
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    raise CatalogFileError(f"{path}:{line_number}: invalid JSON ({exc})") from exc
+                if not isinstance(record, dict):
+                    raise CatalogFileError(f"{path}:{line_number}: expected a JSON object")
+                yield line_number, record
+
+
+def _parse_bool(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _parse_steps(value: object) -> List[str]:
+    if isinstance(value, str):
+        return [step.strip() for step in value.splitlines() if step.strip()]
+    return [str(step) for step in value]
+
+
+def _parse_notes(value: object) -> str | None:
+    return value if value not in (None, "") else None
+
+
+def _parse_number(value: object, field: str) -> float:
+    number = float(value)
+    # NaN compares false both ways, so it fails this check like the infinities.
+    if not -INFINITY < number < INFINITY:
+        raise ValueError(f"{field} must be a finite number, not {value!r}")
+    return number
+
+
+def _parse_text(value: object, field: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{field} must be a non-empty string, not {value!r}")
+    return value
+
+
+def _parse_unit(value: object) -> str:
+    if value not in UNITS:
+        raise ValueError(f"unknown unit {value!r}, expected one of {', '.join(UNITS)}")
+    return value
+
+
+def load_ingredients(path: Path) -> Dict[str, Ingredient]:
+    """Read an ingredient catalog export keyed by ingredient name."""
+    catalog: Dict[str, Ingredient] = {}
+    for line_number, record in _read_records(path):
+        try:
+            ingredient = Ingredient(
+                _parse_text(record["name"], "name"),
+                _parse_unit(record["default_unit"]),
+                _parse_number(record["calories_per_unit"], "calories_per_unit"),
+                _parse_number(record["protein_per_unit"], "protein_per_unit"),
+                _parse_number(record["fat_per_unit"], "fat_per_unit"),
+                _parse_number(record["carbs_per_unit"], "carbs_per_unit"),
             )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogFileError(f"{path}:{line_number}: invalid ingredient ({exc!r})") from exc
+        if ingredient.name in catalog:
+            raise CatalogFileError(f"{path}:{line_number}: duplicate ingredient {ingredient.name!r}")
+        catalog[ingredient.name] = ingredient
+    return catalog
+
+
+def _build_record(
+    source: Path,
+    line_number: int,
+    record: Dict,
+    ingredients: List[Tuple],
+    categories: Mapping[str, str],
+    ingredient_catalog: Mapping[str, Ingredient],
+    strings: StringPool | None = None,
+) -> Recipe:
+    name = record.get("name")
+    try:
+        if record["category"] not in categories:
+            raise ValueError(f"unknown category {record['category']!r}")
+        recipe = build_recipe(
+            name=_parse_text(record["name"], "name"),
+            category=record["category"],
+            description=record.get("description") or "",
+            instructions=_parse_steps(record["instructions"]),
+            servings=int(record["servings"]),
+            image_url=_parse_text(record["image_url"], "image_url"),
+            prep_minutes=_parse_number(record["prep_minutes"], "prep_minutes"),
+            cook_minutes=_parse_number(record["cook_minutes"], "cook_minutes"),
+            review_count=_parse_number(record["review_count"], "review_count"),
+            is_popular=_parse_bool(record.get("is_popular", False)),
+            ingredients=ingredients,
+            ingredient_catalog=ingredient_catalog,
+            strings=strings,
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise CatalogFileError(f"{source}:{line_number}: invalid recipe {name!r} ({exc!r})") from exc
+    if recipe.servings < 1:
+        raise CatalogFileError(f"{source}:{line_number}: recipe {name!r} needs at least one serving")
+    return recipe
+
+
+# Set in each build worker by _init_build_worker so chunks carry only records.
+_build_context: Tuple | None = None
 
-        ingredient_ids: Dict[str, int] = {}
-        for idx, ingredient in enumerate(INGREDIENT_CATALOG.values(), start=1):
-            ingredient_ids[ingredient.name] = idx
-            cursor.execute(
-                """
-                INSERT INTO ingredients(id, name, default_unit, calories_per_unit, protein_per_unit, fat_per_unit, carbs_per_unit)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    idx,
-                    ingredient.name,
-                    ingredient.default_unit,
-                    ingredient.calories_per_unit,
-                    ingredient.protein_per_unit,
-                    ingredient.fat_per_unit,
-                    ingredient.carbs_per_unit,
-                ),
+
+def _init_build_worker(
+    source: Path, categories: Mapping[str, str], ingredient_catalog: Mapping[str, Ingredient]
+) -> None:
+    global _build_context
+    _build_context = (source, categories, ingredient_catalog)
+
+
+def _build_chunk(chunk: List[Tuple[int, Dict, List[Tuple]]]) -> List[Recipe]:
+    source, categories, ingredient_catalog = _build_context
+    strings = StringPool()
+    return [
+        _build_record(source, line_number, record, ingredients, categories, ingredient_catalog, strings)
+        for line_number, record, ingredients in chunk
+    ]
+
+
+class RecipeFileSource:
+    """Re-iterable stream of recipes parsed from a CSV or JSON Lines export.
+
+    Each iteration re-reads the files and holds a single recipe at a time. A
+    recipe's ingredients come either from its own ``ingredients`` field (JSON
+    Lines) or from ``rows_path``, whose rows must be grouped by ``recipe`` name
+    in the same order as the recipes file. Every recipe needs at least one
+    ingredient, and every ingredient must be in the catalog; problems raise
+    ``CatalogFileError`` naming the file and line.
+
+    With ``workers > 1`` records are still read in this process, but validated
+    and built by a process pool in chunks of ``chunk_size`` recipes. Chunks are
+    yielded in submission order, so recipes (and therefore their IDs) come out
+    exactly as in a serial build, and at most ``2 * workers`` chunks are in
+    flight at any time.
+    """
+
+    def __init__(
+        self,
+        recipes_path: Path,
+        ingredient_catalog: Mapping[str, Ingredient],
+        categories: Mapping[str, str] = CATEGORY_DESCRIPTIONS,
+        rows_path: Path | None = None,
+        workers: int = 1,
+        chunk_size: int = BUILD_CHUNK_SIZE,
+    ) -> None:
+        self.recipes_path = recipes_path
+        self.ingredient_catalog = ingredient_catalog
+        self.categories = categories
+        self.rows_path = rows_path
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def _ingredient_row(self, source: Path, line_number: int, row: object) -> Tuple[str, float, str, str | None]:
+        try:
+            if isinstance(row, dict):
+                ingredient, quantity, unit, notes = row["ingredient"], row["quantity"], row["unit"], row.get("notes")
+            else:
+                ingredient, quantity, unit, notes = (*row, None)[:4]
+            quantity = _parse_number(quantity, "quantity")
+            unit = _parse_unit(unit)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogFileError(f"{source}:{line_number}: invalid recipe ingredient ({exc!r})") from exc
+        if ingredient not in self.ingredient_catalog:
+            raise CatalogFileError(f"{source}:{line_number}: unknown ingredient {ingredient!r}")
+        return ingredient, quantity, unit, _parse_notes(notes)
+
+    def _row_groups(self) -> Iterator[Tuple[str, List[Tuple[str, float, str, str | None]]]]:
+        records = _read_records(self.rows_path)
+        for recipe_name, group in groupby(records, key=lambda item: item[1].get("recipe")):
+            yield recipe_name, [self._ingredient_row(self.rows_path, *item) for item in group]
+
+    def _records(self) -> Iterator[Tuple[int, Dict, List[Tuple]]]:
+        groups = self._row_groups() if self.rows_path is not None else None
+        pending = next(groups, None) if groups is not None else None
+        for line_number, record in _read_records(self.recipes_path):
+            name = record.get("name")
+            if groups is None:
+                rows = record.get("ingredients", [])
+                if not isinstance(rows, list):
+                    raise CatalogFileError(f"{self.recipes_path}:{line_number}: ingredients of {name!r} must be a list")
+                ingredients = [self._ingredient_row(self.recipes_path, line_number, row) for row in rows]
+                if not ingredients:
+                    raise CatalogFileError(f"{self.recipes_path}:{line_number}: recipe {name!r} has no ingredients")
+            elif pending is not None and pending[0] == name:
+                ingredients = pending[1]
+                pending = next(groups, None)
+            else:
+                raise CatalogFileError(
+                    f"{self.recipes_path}:{line_number}: recipe {name!r} has no rows in {self.rows_path} "
+                    f"(rows must be grouped by recipe in the order of the recipes file)"
+                )
+            yield line_number, record, ingredients
+        if pending is not None:
+            raise CatalogFileError(
+                f"{self.rows_path}: rows for recipe {pending[0]!r} do not follow the order of {self.recipes_path}"
             )
 
-        for recipe_idx, recipe in enumerate(RECIPES, start=1):
-            per_serving = recipe.per_serving()
-            category_id = list(CATEGORY_DESCRIPTIONS).index(recipe.category) + 1
-            cursor.execute(
-                """
-                INSERT INTO recipes(
-                    id, category_id, name, description, instructions, servings,
-                    calories_per_serving, protein_per_serving, fat_per_serving, carbs_per_serving,
-                    image_url, prep_minutes, cook_minutes, review_count, is_popular
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    recipe_idx,
-                    category_id,
-                    recipe.name,
-                    recipe.description,
-                    recipe.instructions,
-                    recipe.servings,
-                    *per_serving,
-                    recipe.image_url,
-                    recipe.prep_minutes,
-                    recipe.cook_minutes,
-                    recipe.review_count,
-                    1 if recipe.is_popular else 0,
-                ),
+    def _build_parallel(self) -> Iterator[Recipe]:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_build_worker,
+            initargs=(self.recipes_path, self.categories, self.ingredient_catalog),
+        ) as executor:
+            in_flight = deque()
+            for chunk in _chunked(self._records(), self.chunk_size):
+                in_flight.append(executor.submit(_build_chunk, chunk))
+                if len(in_flight) >= 2 * self.workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    def __iter__(self) -> Iterator[Recipe]:
+        if self.workers > 1:
+            return self._build_parallel()
+        # One pool per pass, so it is freed with the recipes of that pass.
+        strings = StringPool()
+        return (
+            _build_record(
+                self.recipes_path, line_number, record, ingredients, self.categories, self.ingredient_catalog, strings
             )
+            for line_number, record, ingredients in self._records()
+        )
 
-            for row in recipe.ingredient_rows:
-                cursor.execute(
-                    """
-                    INSERT INTO recipe_ingredients(
-                        recipe_id, ingredient_id, quantity, unit, calories, protein, fat, carbs, notes
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        recipe_idx,
-                        ingredient_ids[row["ingredient"]],
-                        row["quantity"],
-                        row["unit"],
-                        row["calories"],
-                        row["protein"],
-                        row["fat"],
-                        row["carbs"],
-                        row["notes"],
-                    ),
-                )
 
-        conn.commit()
+def load_catalog_files(
+    ingredients_path: Path,
+    recipes_path: Path,
+    rows_path: Path | None = None,
+    workers: int = 1,
+) -> Catalog:
+    """Build a catalog whose recipes stream from exported CSV/JSON Lines files."""
+    ingredients = load_ingredients(ingredients_path)
+    recipes = RecipeFileSource(recipes_path, ingredients, CATEGORY_DESCRIPTIONS, rows_path, workers)
+    return Catalog(CATEGORY_DESCRIPTIONS, ingredients, recipes)
 
-        schema_statements: List[str] = []
-        for raw_statement in SCHEMA.split(';'):
-            cleaned = raw_statement.strip()
-            if not cleaned or cleaned.upper() == 'PRAGMA FOREIGN_KEYS = ON':
-                continue
-            schema_statements.append(cleaned)
 
-        insert_statements: Dict[str, List[str]] = {
-            'categories': [],
-            'ingredients': [],
-            'recipes': [],
-            'recipe_ingredients': [],
-        }
+def load_images(path: Path) -> List[Tuple]:
+    """Read the manifest ``image_pipeline.py`` writes as ``recipe_images`` rows in URL order."""
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except OSError as exc:
+        raise CatalogFileError(f"{path}: {exc.strerror}") from exc
+    except ValueError as exc:
+        raise CatalogFileError(f"{path}: invalid JSON ({exc})") from exc
+    if not isinstance(manifest, dict) or manifest.get("format") != IMAGES_MANIFEST_VERSION:
+        raise CatalogFileError(f"{path}: not an image manifest of format {IMAGES_MANIFEST_VERSION}")
+    rows: Dict[str, Tuple] = {}
+    for idx, image in enumerate(manifest.get("images", ())):
+        try:
+            row = tuple(image[column] for column in IMAGES_COLUMNS)
+            if not all(isinstance(row[position], str) for position in (0, 1, 4)):
+                raise TypeError("image_url, sha256 and thumbnail must be strings")
+            row = (*row[:2], int(row[2]), int(row[3]), row[4], int(row[5]), int(row[6]))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogFileError(f"{path}: invalid image {idx} ({exc!r})") from exc
+        if row[0] in rows:
+            raise CatalogFileError(f"{path}: duplicate image {row[0]!r}")
+        rows[row[0]] = row
+    return [rows[url] for url in sorted(rows)]
+
+
+def category_rows(categories: Mapping[str, str]) -> Iterator[Tuple]:
+    for idx, (name, description) in enumerate(categories.items(), start=1):
+        yield (idx, name, description)
+
+
+def ingredient_rows(ingredients: Mapping[str, Ingredient]) -> Iterator[Tuple]:
+    for idx, ingredient in enumerate(ingredients.values(), start=1):
+        yield (
+            idx,
+            ingredient.name,
+            ingredient.default_unit,
+            ingredient.calories_per_unit,
+            ingredient.protein_per_unit,
+            ingredient.fat_per_unit,
+            ingredient.carbs_per_unit,
+        )
+
+
+def recipe_row(recipe_id: int, recipe: Recipe, category_ids: Dict[str, int]) -> Tuple:
+    return (
+        recipe_id,
+        category_ids[recipe.category],
+        recipe.name,
+        recipe.description,
+        recipe.instructions,
+        recipe.servings,
+        *recipe.per_serving(),
+        recipe.image_url,
+        recipe.prep_minutes,
+        recipe.cook_minutes,
+        recipe.review_count,
+        1 if recipe.is_popular else 0,
+    )
+
+
+def recipe_ingredient_rows(
+    recipe_id: int, recipe: Recipe, ingredient_ids: Dict[str, int]
+) -> Iterator[Tuple]:
+    for ingredient, quantity, unit, calories, protein, fat, carbs, notes in recipe.ingredient_rows.tuples():
+        yield (recipe_id, ingredient_ids[ingredient], quantity, unit, calories, protein, fat, carbs, notes)
+
+
+def score_config_rows(configs: Mapping[str, ScoreConfig]) -> Iterator[Tuple]:
+    for config_id, (name, config) in enumerate(configs.items(), start=1):
+        yield (config_id, name, *config)
+
+
+def recipe_score_rows(
+    recipe_id: int, per_serving: Tuple[float, float, float, float], configs: Iterable[ScoreConfig]
+) -> Iterator[Tuple]:
+    """Score one recipe's per-serving macros against every config, in config ID order."""
+    for config_id, config in enumerate(configs, start=1):
+        yield (config_id, recipe_id, config.score(*per_serving))
+
+
+def score_catalog(catalog: Catalog, configs: Mapping[str, ScoreConfig] = SCORE_PRESETS) -> Dict[str, array]:
+    """Score every recipe against every config in one pass; scores are in recipe order per config."""
+    scores = {name: array("d") for name in configs}
+    columns = [(config, scores[name]) for name, config in configs.items()]
+    for recipe in catalog.recipes:
+        per_serving = recipe.per_serving()
+        for config, column in columns:
+            column.append(config.score(*per_serving))
+    return scores
+
+
+def unit_grams(name: str, unit: str) -> float | None:
+    """Weight in grams of one ``unit`` of ingredient ``name``, or ``None`` if it is not listed."""
+    if unit == "g":
+        return 1.0
+    if unit == "ml":
+        return INGREDIENT_DENSITIES.get(name)
+    return PIECE_WEIGHTS.get(name, {}).get(unit)
+
+
+def grams_per_unit(ingredient: Ingredient) -> float:
+    """Weight in grams of one ``default_unit`` of the ingredient."""
+    grams = unit_grams(ingredient.name, ingredient.default_unit)
+    if grams is None:
+        grams = UNIT_GRAMS.get(ingredient.default_unit)
+    if grams is None:
+        raise ValueError(
+            f"No gram weight for {ingredient.name} measured in {ingredient.default_unit}; add it to PIECE_WEIGHTS"
+        )
+    return grams
+
+
+def conversion_table(ingredients: Mapping[str, Ingredient]) -> Dict[Tuple[str, str], float]:
+    """Map ``(ingredient, unit)`` to grams for every unit each ingredient can be measured in.
+
+    Bulk conversions then cost one lookup per row. The default unit's entry is
+    ``grams_per_unit`` itself, and every other unit's its listed weight, so no
+    value goes through a division.
+    """
+    table = {}
+    for name, ingredient in ingredients.items():
+        table[name, ingredient.default_unit] = grams_per_unit(ingredient)
+        for unit in UNITS:
+            if unit != ingredient.default_unit and unit_factor(ingredient, unit) is not None:
+                table[name, unit] = unit_grams(name, unit)
+    return table
+
+
+def ingredient_substitutes(ingredients: Mapping[str, Ingredient], count: int = DEFAULT_SUBSTITUTES) -> Iterator[Tuple]:
+    """Yield ``ingredient_substitutes`` rows in ``(ingredient_id, rank)`` order.
+
+    Each ingredient gets up to ``count`` substitutes with the same
+    ``default_unit`` and a similarity above zero, best first; equal
+    similarities go to the lower ID. Similarities are computed with NumPy a
+    block of ingredients at a time, so memory stays at
+    ``SUBSTITUTE_BLOCK_ROWS`` rows of the similarity matrix for any catalog.
+    """
+    import numpy as np
+
+    items = list(ingredients.values())
+    macros = np.array(
+        [(item.calories_per_unit, item.protein_per_unit, item.fat_per_unit, item.carbs_per_unit) for item in items],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    norms = np.linalg.norm(macros[:, 1:], axis=1)
+    directions = np.divide(macros[:, 1:], norms[:, None], out=np.zeros_like(macros[:, 1:]), where=norms[:, None] > 0)
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(item.default_unit, []).append(index)
+
+    # Calorie ratios use the smallest positive double for zero, so two
+    # calorie-free ingredients compare as 1 and one of them against anything
+    # else as (practically) 0, without a masked division.
+    calories = np.where(macros[:, 0] > 0, macros[:, 0], np.finfo(np.float64).tiny)
+    chosen = np.full((len(items), count), -1, dtype=np.int64)
+    similarity = np.zeros((len(items), count))
+    for members in groups.values():
+        members = np.array(members, dtype=np.int64)
+        keep = min(count, len(members) - 1)
+        if keep < 1:
+            continue
+        # Added to the rounded similarity scaled by the item count, so that
+        # every key is distinct (and exact in a double) and ties favour the
+        # lower ID.
+        tiebreak = (len(items) - 1 - members).astype(np.float64)
+        for start in range(0, len(members), SUBSTITUTE_BLOCK_ROWS):
+            rows = members[start : start + SUBSTITUTE_BLOCK_ROWS]
+            cosine = directions[rows] @ directions[members].T
+            # Two ingredients without protein, fat or carbs have the same (empty) profile.
+            cosine[(norms[rows] == 0)[:, None] & (norms[members] == 0)[None, :]] = 1.0
+            keys = np.minimum(calories[rows][:, None], calories[members][None, :])
+            keys /= np.maximum(calories[rows][:, None], calories[members][None, :])
+            keys *= cosine
+            keys *= 1e4
+            np.rint(keys, out=keys)
+            keys *= len(items)
+            keys += tiebreak
+            keys[np.arange(len(rows)), np.arange(start, start + len(rows))] = -1.0
+            top = np.argpartition(keys, len(members) - keep, axis=1)[:, len(members) - keep :]
+            top = np.take_along_axis(top, np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+            best = np.floor(np.take_along_axis(keys, top, axis=1) / len(items))
+            chosen[rows, :keep] = np.where(best > 0, members[top], -1)
+            similarity[rows, :keep] = best / 1e4
+
+    deltas = np.zeros((len(items), count, 4))
+    valid = chosen >= 0
+    deltas[valid] = np.round(macros[chosen[valid]] - macros[np.nonzero(valid)[0]], 3)
+    for index in range(len(items)):
+        for rank in range(count):
+            substitute = int(chosen[index, rank])
+            if substitute < 0:
+                break
+            yield (index + 1, rank + 1, substitute + 1, float(similarity[index, rank]), *deltas[index, rank].tolist())
+
+
+def app_product_rows(ingredients: Mapping[str, Ingredient]) -> Iterator[Tuple]:
+    """``products`` rows: macros per 100 g, with IDs matching ``ingredient_rows``."""
+    for ingredient_id, ingredient in enumerate(ingredients.values(), start=1):
+        scale = 100.0 / grams_per_unit(ingredient)
+        yield (
+            ingredient_id,
+            ingredient.name,
+            round(ingredient.calories_per_unit * scale, 3),
+            round(ingredient.protein_per_unit * scale, 3),
+            round(ingredient.fat_per_unit * scale, 3),
+            round(ingredient.carbs_per_unit * scale, 3),
+        )
+
+
+def app_recipe_rows(
+    recipe_id: int,
+    first_row_id: int,
+    recipe: Recipe,
+    ingredient_ids: Dict[str, int],
+    grams: Mapping[Tuple[str, str], float],
+) -> Tuple[Tuple, List[Tuple]]:
+    """Return the app's ``recipes`` row and ``recipe_ingredients`` rows (IDs from ``first_row_id``).
+
+    ``grams`` is a ``conversion_table``.
+    """
+    import json
+
+    lines = []
+    rows = []
+    total_grams = 0.0
+    for row_id, (ingredient, quantity, unit, *_, notes) in enumerate(
+        recipe.ingredient_rows.tuples(), start=first_row_id
+    ):
+        weight = round(quantity * grams[ingredient, unit], 2)
+        total_grams += weight
+        rows.append((row_id, recipe_id, ingredient_ids[ingredient], weight))
+        lines.append(f"{quantity:g} {unit} {ingredient}" + (f" — {notes}" if notes else ""))
+    recipe_row = (
+        recipe_id,
+        recipe.category,
+        recipe.name,
+        recipe.description,
+        recipe.image_url,
+        recipe.prep_minutes,
+        recipe.cook_minutes,
+        recipe.servings,
+        # The app stores the list with jsonEncode, which leaves non-ASCII as is.
+        json.dumps(lines, ensure_ascii=False, separators=(",", ":")),
+        recipe.instructions,
+        recipe.review_count,
+        1 if recipe.is_popular else 0,
+        *recipe.per_serving(),
+        round(total_grams / recipe.servings, 2),
+    )
+    return recipe_row, rows
+
+
+class TableLoad:
+    __slots__ = ("table", "rows", "seconds")
+
+    def __init__(self, table: str, rows: int = 0, seconds: float = 0.0) -> None:
+        self.table = table
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def describe(self) -> str:
+        return f"{self.table}: {self.rows} rows in {self.seconds:.3f}s ({self.rows_per_second:,.0f} rows/s)"
 
-        for raw_statement in conn.iterdump():
-            statement = raw_statement.strip()
-            if not statement or statement in {'BEGIN TRANSACTION;', 'COMMIT;'}:
-                continue
 
-            upper = statement.upper()
-            if upper.startswith('INSERT INTO "CATEGORIES"'):
-                insert_statements['categories'].append(statement)
-            elif upper.startswith('INSERT INTO "INGREDIENTS"'):
-                insert_statements['ingredients'].append(statement)
-            elif upper.startswith('INSERT INTO "RECIPES"'):
-                insert_statements['recipes'].append(statement)
-            elif upper.startswith('INSERT INTO "RECIPE_INGREDIENTS"'):
-                insert_statements['recipe_ingredients'].append(statement)
+class DumpSection(namedtuple("DumpSection", "offset size rows seconds stats", defaults=(0.0, ()))):
+    """Byte range and row count of one table's INSERT block inside a dump.
 
-        dump_lines: List[str] = ['PRAGMA foreign_keys=ON;', 'BEGIN TRANSACTION;']
-        dump_lines.extend(f"{statement};" for statement in schema_statements)
-        for table in ('categories', 'ingredients', 'recipes', 'recipe_ingredients'):
-            dump_lines.extend(insert_statements[table])
-        dump_lines.append('COMMIT;')
+    ``stats`` holds the ``(index, stat)`` pairs of the table's ``sqlite_stat1`` rows.
+    """
 
-    OUTPUT_PATH.write_text('\n'.join(dump_lines) + '\n', encoding='utf-8')
-    print(f"Seeded SQL dump at {OUTPUT_PATH}")
+    __slots__ = ()
+
+
+class SeedProfile:
+    """Per-phase timings, table metrics and peak memory of one seed run.
+
+    ``phase(name)`` times a block of work and yields a dict for the seconds of
+    its steps; ``add_phase()`` records one that was timed elsewhere. With ``trace_memory``, tracemalloc is started by the first phase
+    and each phase records the peak of traced Python memory while it ran;
+    ``close()`` stops it again. ``table()`` records the rows, bytes and seconds
+    a phase spent on one table. Every record is also passed to each of
+    ``hooks`` as ``hook(kind, record)``, with ``kind`` ``"phase"`` or
+    ``"table"`` and the same dict that goes into ``report()``.
+    """
+
+    def __init__(self, hooks: Iterable[ProfileHook] = (), trace_memory: bool = True) -> None:
+        self.hooks = list(hooks)
+        self.trace_memory = trace_memory
+        self.phases: List[Dict[str, object]] = []
+        self.tables: List[Dict[str, object]] = []
+        self.peak_memory: int | None = None
+        self.started = time.perf_counter()
+        self._tracing = False
+
+    def __enter__(self) -> SeedProfile:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _emit(self, kind: str, record: Dict[str, object]) -> None:
+        for hook in self.hooks:
+            hook(kind, record)
+
+    def phase(self, name: str) -> ContextManager[Dict[str, float]]:
+        from contextlib import contextmanager
+
+        @contextmanager
+        def timed() -> Iterator[Dict[str, float]]:
+            import tracemalloc
+
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.reset_peak()
+            steps: Dict[str, float] = {}
+            started = time.perf_counter()
+            try:
+                yield steps
+            finally:
+                seconds = time.perf_counter() - started
+                self.add_phase(name, seconds, steps, tracemalloc.get_traced_memory()[1] if tracing else None)
+
+        return timed()
+
+    def add_phase(
+        self, name: str, seconds: float, steps: Dict[str, float], peak_memory: int | None = None
+    ) -> None:
+        """Record a phase that was timed elsewhere, such as in a worker process."""
+        if peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak_memory)
+        record = {"phase": name, "seconds": seconds, "peak_memory": peak_memory, "steps": steps}
+        self.phases.append(record)
+        self._emit("phase", record)
+
+    def table(self, phase: str, table: str, rows: int, size: int | None, seconds: float | None) -> None:
+        record = {"phase": phase, "table": table, "rows": rows, "bytes": size, "seconds": seconds}
+        self.tables.append(record)
+        self._emit("table", record)
+
+    def close(self) -> None:
+        if self._tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._tracing = False
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "seconds": time.perf_counter() - self.started,
+            "peak_memory": self.peak_memory,
+            "phases": self.phases,
+            "tables": self.tables,
+        }
+
+    def write_report(self, path: Path) -> None:
+        import json
+
+        path.write_text(json.dumps(self.report(), indent=2) + "\n", encoding="utf-8")
+
+    def describe(self) -> List[str]:
+        lines = []
+        for record in self.phases:
+            line = f"{record['phase']}: {record['seconds']:.3f}s"
+            if record["peak_memory"] is not None:
+                line += f", peak {record['peak_memory'] / 2**20:,.1f} MiB"
+            if record["steps"]:
+                line += " (" + ", ".join(f"{step} {seconds:.3f}s" for step, seconds in record["steps"].items()) + ")"
+            lines.append(line)
+        return lines
+
+
+class RunCount:
+    """Count the distinct values of a sequence that arrives sorted, without keeping them."""
+
+    __slots__ = ("last", "count")
+
+    def __init__(self) -> None:
+        self.last = None
+        self.count = 0
+
+    def add(self, value) -> None:
+        if not self.count or value != self.last:
+            self.last = value
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class IndexStats:
+    """Derive one index's ``sqlite_stat1`` entry from the rows it covers, as ``ANALYZE`` does.
+
+    The entry is the number of index rows followed by, for each key prefix,
+    the average number of rows sharing a prefix value. Only the prefixes
+    before the ``unique`` one need their distinct values tracked, and the
+    first ``ordered`` ones, which the rows arrive sorted by, are only counted.
+    """
+
+    __slots__ = ("table", "name", "columns", "where", "rows", "distinct", "prefixes")
+
+    def __init__(
+        self,
+        table: str,
+        name: str,
+        columns: Tuple[int, ...],
+        unique: int | None,
+        where: int | None,
+        ordered: int = 0,
+    ) -> None:
+        self.table = table
+        self.name = name
+        self.columns = columns
+        self.where = where
+        self.rows = 0
+        tracked = len(columns) if unique is None else unique - 1
+        self.distinct = [RunCount() if depth < ordered else set() for depth in range(tracked)]
+        self.prefixes = [(itemgetter(*columns[:depth]), self.distinct[depth - 1]) for depth in range(1, tracked + 1)]
+
+    def add(self, row: Tuple) -> None:
+        if self.where is not None and not row[self.where]:
+            return
+        self.rows += 1
+        for prefix, seen in self.prefixes:
+            seen.add(prefix(row))
+
+    def stat(self) -> str | None:
+        if not self.rows:
+            return None
+        fields = [self.rows]
+        for depth in range(len(self.columns)):
+            distinct = len(self.distinct[depth]) if depth < len(self.distinct) else self.rows
+            average = (self.rows + distinct - 1) // distinct
+            # SQLite rounds near-unique prefixes down to 1.
+            if average == 2 and self.rows * 10 <= distinct * 11:
+                average = 1
+            fields.append(average)
+        return " ".join(map(str, fields))
+
+
+class FullTextSearch(
+    namedtuple("FullTextSearch", "tokenizer prefixes", defaults=(DEFAULT_TOKENIZER, DEFAULT_PREFIXES))
+):
+    """Settings of the ``recipe_search`` FTS5 table: tokenizer spec and prefix index lengths."""
+
+    __slots__ = ()
+
+    def statements(self) -> List[str]:
+        columns = ", ".join(SEARCH_COLUMNS)
+        prefixes = " ".join(map(str, self.prefixes))
+        options = f"content='', tokenize={sql_literal(self.tokenizer)}"
+        if prefixes:
+            options += f", prefix='{prefixes}'"
+        return [
+            "DROP TABLE IF EXISTS recipe_search",
+            f"CREATE VIRTUAL TABLE recipe_search USING fts5({columns}, {options})",
+            f"INSERT INTO recipe_search(recipe_search, rank) VALUES('rank', '{SEARCH_RANK}')",
+            SEARCH_POPULATE.strip(),
+        ]
+
+
+def prefix_query(text: str) -> str:
+    """Turn typed text into an FTS5 query matching every word as a prefix."""
+    terms = ['"' + word.replace('"', '""') + '"*' for word in text.split()]
+    return " ".join(terms)
+
+
+def search_recipes(conn: sqlite3.Connection, query: str, limit: int = 20) -> List[Tuple[int, str, float]]:
+    """Return ``(id, name, bm25 rank)`` of the best matches for an FTS5 query, best first."""
+    return conn.execute(SEARCH_QUERY, (query, limit)).fetchall()
+
+
+def search_index_size(conn: sqlite3.Connection) -> int | None:
+    """Bytes used by ``recipe_search`` and its shadow tables, or ``None`` without the dbstat table."""
+    import sqlite3
+
+    try:
+        (size,) = conn.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name GLOB 'recipe_search*'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return size
+
+
+def table_sizes(conn: sqlite3.Connection) -> Dict[str, int] | None:
+    """Bytes used by each table together with its indexes, or ``None`` without the dbstat table."""
+    import sqlite3
+
+    try:
+        return dict(
+            conn.execute(
+                "SELECT master.tbl_name, SUM(stat.pgsize) FROM dbstat AS stat "
+                "JOIN sqlite_master AS master ON master.name = stat.name GROUP BY master.tbl_name"
+            )
+        )
+    except sqlite3.OperationalError:
+        return None
+
+
+def check_search(search: FullTextSearch) -> str | None:
+    """Create the FTS5 table in memory and return SQLite's error message if that fails."""
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.executescript(SCHEMA)
+            for statement in search.statements():
+                conn.execute(statement)
+        except sqlite3.OperationalError as exc:
+            return str(exc)
+    return None
+
+
+class MacroBox(namedtuple("MacroBox", MACRO_COLUMNS, defaults=((None, None),) * len(MACRO_COLUMNS))):
+    """Per-serving macro ranges as ``(low, high)`` pairs; ``None`` leaves that side open."""
+
+    __slots__ = ()
+
+
+def check_macro_index() -> str | None:
+    """Create the R*Tree table in memory and return SQLite's error message if that fails."""
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.executescript(SCHEMA)
+            for statement in MACRO_INDEX_STATEMENTS:
+                conn.execute(statement)
+        except sqlite3.OperationalError as exc:
+            return str(exc)
+    return None
+
+
+def _macros_in_box(conn: sqlite3.Connection, box: MacroBox) -> List[Tuple[int, float, float, float, float]]:
+    conditions = []
+    params: List[float] = []
+    for macro, (low, high) in zip(MACRO_COLUMNS, box):
+        if low is not None:
+            conditions.append(f"recipe_macros.max_{macro} >= ? AND recipes.{macro}_per_serving >= ?")
+            params += (low, low)
+        if high is not None:
+            conditions.append(f"recipe_macros.min_{macro} <= ? AND recipes.{macro}_per_serving <= ?")
+            params += (high, high)
+    query = MACRO_BOX_QUERY.format(conditions=" AND ".join(conditions) or "1")
+    return conn.execute(query, params).fetchall()
+
+
+def recipes_in_box(conn: sqlite3.Connection, box: MacroBox) -> List[int]:
+    """Return the IDs of the recipes whose per-serving macros lie inside ``box``, in ID order."""
+    return [row[0] for row in _macros_in_box(conn, box)]
+
+
+def nearest_recipes(
+    conn: sqlite3.Connection, config: ScoreConfig, k: int = 10, box: MacroBox = MacroBox()
+) -> List[Tuple[int, float]]:
+    """Return ``(id, score)`` of the ``k`` recipes inside ``box`` closest to ``config``'s targets.
+
+    Closeness is ``ScoreConfig.error``, so the result matches the first ``k``
+    rows of ``TOP_SCORES_QUERY`` (or, with the ``findOptimalRecipe`` box, of
+    ``OPTIMAL_SCORES_QUERY``). The search box around the targets spans
+    ``radius * target / sqrt(weight)`` on each axis, which holds every recipe
+    with an error up to ``radius**2``; the radius doubles until ``k`` such
+    recipes are found, after which nothing outside the box can rank higher.
+    """
+    from math import sqrt
+
+    targets = (config.target_calories, config.target_protein, config.target_fat, config.target_carbs)
+    weights = (config.weight_calories, config.weight_protein, config.weight_fat, config.weight_carbs)
+    radius = MACRO_SEARCH_RADIUS
+    while True:
+        unbounded = radius > MACRO_SEARCH_RADIUS_LIMIT
+        search = []
+        for (low, high), target, weight in zip(box, targets, weights):
+            if not unbounded and weight > 0:
+                reach = abs(target) * radius / sqrt(weight)
+                low = target - reach if low is None else max(low, target - reach)
+                high = target + reach if high is None else min(high, target + reach)
+            search.append((low, high))
+        rows = _macros_in_box(conn, MacroBox(*search))
+        # Errors this close to the radius could be rounded across it.
+        limit = radius * radius * (1.0 - 1e-9)
+        if unbounded or sum(1 for row in rows if config.error(*row[1:]) <= limit) >= k:
+            ranked = sorted(((-config.score(*row[1:]), row[0]) for row in rows))
+            return [(recipe_id, -score) for score, recipe_id in ranked[:k]]
+        radius *= 2
+
+
+def index_stats() -> Dict[str, List[IndexStats]]:
+    stats: Dict[str, List[IndexStats]] = {table: [] for table in TABLES}
+    for table, index, columns, unique, where, ordered in INDEX_KEYS:
+        stats[table].append(IndexStats(table, index, columns, unique, where, ordered))
+    return stats
+
+
+def _stat_rows(stats: List[IndexStats]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((index.name, stat) for index in stats for stat in [index.stat()] if stat is not None)
+
+
+def _insert_many(cursor: sqlite3.Cursor, statement: str, rows: List[Tuple], load: TableLoad) -> None:
+    started = time.perf_counter()
+    cursor.executemany(statement, rows)
+    load.seconds += time.perf_counter() - started
+    load.rows += len(rows)
+
+
+class CatalogIdentity(namedtuple("CatalogIdentity", "version manifest digests", defaults=(None, None, None))):
+    """What is only known about a catalog once it has been walked.
+
+    ``version`` is the ``catalog_version_id``, ``manifest`` the
+    ``catalog_manifest`` and ``digests`` the ``catalog_digests``.
+    """
+
+    __slots__ = ()
+
+
+class RecipeChunk(namedtuple("RecipeChunk", "recipes recipe_rows ingredient_rows score_rows")):
+    """Consecutive recipes with their rows of ``RECIPE_TABLES``.
+
+    Each field is a list in recipe order: the ``Recipe`` objects, then the
+    ``recipes``, ``recipe_ingredients`` and ``recipe_scores`` rows exactly as
+    they go into the tables.
+    """
+
+    __slots__ = ()
+
+
+def catalog_chunks(catalog: Catalog, size: int = BULK_CHUNK_SIZE) -> Iterator[RecipeChunk]:
+    """Walk ``catalog.recipes`` once, ``size`` recipes at a time, building each row once."""
+    category_ids = catalog.category_ids()
+    ingredient_ids = catalog.ingredient_ids()
+    configs = list(SCORE_PRESETS.values())
+    for chunk in _chunked(enumerate(catalog.recipes, start=1), size):
+        recipes = []
+        rows = []
+        ingredients: List[Tuple] = []
+        scores: List[Tuple] = []
+        for recipe_id, recipe in chunk:
+            row = recipe_row(recipe_id, recipe, category_ids)
+            recipes.append(recipe)
+            rows.append(row)
+            ingredients.extend(recipe_ingredient_rows(recipe_id, recipe, ingredient_ids))
+            scores.extend(recipe_score_rows(recipe_id, row[6:10], configs))
+        yield RecipeChunk(recipes, rows, ingredients, scores)
+
+
+class CatalogSink:
+    """One output of a seed run, fed by a single walk over the catalog.
+
+    ``start`` gets the catalog with an empty ``recipes``; the recipes follow in
+    order through ``add`` as ``RecipeChunk``s. ``finish`` gets the
+    ``CatalogIdentity``, which is only known once the walk is over, and
+    returns the sink's result. ``abort`` discards partial output when the run
+    fails. ``steps`` collects the seconds of the sink's own steps.
+
+    ``run_sinks`` pickles each sink into its own worker process before
+    ``start``, so until then a sink should only hold its settings.
+    """
+
+    # Sinks that compute the identity (``DigestSink``) finish before the others.
+    identifies = False
+    # Only sinks that need the ``Recipe`` objects of a chunk get them from
+    # ``run_sinks``; the others see ``recipes`` as None.
+    uses_recipes = False
+
+    def __init__(self) -> None:
+        self.steps: Dict[str, float] = {}
+
+    def start(self, catalog: Catalog) -> None:
+        pass
+
+    def add(self, chunk: RecipeChunk) -> None:
+        raise NotImplementedError
+
+    def finish(self, identity: CatalogIdentity) -> object:
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        pass
+
+
+def _drive(
+    sink: CatalogSink,
+    catalog: Catalog,
+    identity: CatalogIdentity = CatalogIdentity(),
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> object:
+    """Run one sink over its own walk of the catalog, in this process."""
+    try:
+        sink.start(catalog._replace(recipes=()))
+        for chunk in catalog_chunks(catalog, chunk_size):
+            sink.add(chunk)
+        return sink.finish(identity)
+    except BaseException:
+        sink.abort()
+        raise
+
+
+def _load_tables(cursor: sqlite3.Cursor, catalog: Catalog, loads: Dict[str, TableLoad], chunk_size: int) -> None:
+    """Insert the categories, ingredients and score configs, ``chunk_size`` rows per call."""
+    for chunk in _chunked(category_rows(catalog.categories), chunk_size):
+        _insert_many(cursor, CATEGORY_INSERT, chunk, loads["categories"])
+    for chunk in _chunked(ingredient_rows(catalog.ingredients), chunk_size):
+        _insert_many(cursor, INGREDIENT_INSERT, chunk, loads["ingredients"])
+    _insert_many(cursor, SCORE_CONFIG_INSERT, list(score_config_rows(SCORE_PRESETS)), loads["score_configs"])
+
+
+def _load_chunk(cursor: sqlite3.Cursor, chunk: RecipeChunk, loads: Dict[str, TableLoad]) -> None:
+    _insert_many(cursor, RECIPE_INSERT, chunk.recipe_rows, loads["recipes"])
+    _insert_many(cursor, RECIPE_INGREDIENT_INSERT, chunk.ingredient_rows, loads["recipe_ingredients"])
+    _insert_many(cursor, RECIPE_SCORE_INSERT, chunk.score_rows, loads["recipe_scores"])
+
+
+def load_catalog(
+    conn: sqlite3.Connection,
+    catalog: Catalog,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict[str, TableLoad]:
+    """Bulk-insert the catalog with executemany, ``chunk_size`` rows per call.
+
+    Each table goes through a single prepared statement and category/ingredient
+    IDs are resolved from precomputed maps, so load time stays linear in the
+    number of rows. ``catalog.recipes`` is walked once.
+    """
+    loads = {table: TableLoad(table) for table in TABLES}
+    cursor = conn.cursor()
+    _load_tables(cursor, catalog, loads, chunk_size)
+    for chunk in catalog_chunks(catalog, chunk_size):
+        _load_chunk(cursor, chunk, loads)
+    return loads
+
+
+def compression_codec(path: Path) -> str | None:
+    """Return the codec selected by ``path``'s suffix, or ``None`` for a plain file."""
+    return COMPRESSION_SUFFIXES.get(path.suffix.lower())
+
+
+class CompressedWriter(io.RawIOBase):
+    """Binary sink that compresses everything written to it into ``target``.
+
+    gzip output comes from zlib directly, with a zero timestamp in the header,
+    so the same catalog always compresses to the same bytes. ``tell()`` is the
+    uncompressed offset, which is what dump sections record.
+    """
+
+    def __init__(self, target: BinaryIO, codec: str, level: int | None = None) -> None:
+        import lzma
+        import zlib
+
+        super().__init__()
+        if level is None:
+            level = DEFAULT_COMPRESSION_LEVELS[codec]
+        if codec == "gzip":
+            self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            self.compressor = lzma.LZMACompressor(lzma.FORMAT_XZ, preset=level)
+        self.target = target
+        self.offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        # Lets TextIOWrapper report offsets; seek() itself is not supported.
+        return True
+
+    def tell(self) -> int:
+        return self.offset
+
+    def write(self, data: bytes) -> int:
+        self.target.write(self.compressor.compress(data))
+        size = memoryview(data).nbytes
+        self.offset += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self.target.write(self.compressor.flush())
+            finally:
+                self.target.close()
+                super().close()
+
+
+def open_dump_writer(path: Path, codec: str | None = None, level: int | None = None) -> TextIO:
+    """Open ``path`` for writing SQL text, compressed with ``codec`` if one is given."""
+    if codec is None:
+        return open(path, "w", encoding="utf-8", newline="\n", buffering=DUMP_BUFFER_SIZE)
+    sink = io.BufferedWriter(CompressedWriter(open(path, "wb"), codec, level), DUMP_BUFFER_SIZE)
+    return io.TextIOWrapper(sink, encoding="utf-8", newline="\n")
+
+
+def open_dump_reader(path: Path) -> BinaryIO:
+    """Open a plain or compressed output for reading its uncompressed bytes."""
+    codec = compression_codec(path)
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(path, "rb")
+    if codec == "lzma":
+        import lzma
+
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+
+def compress_file(source: Path, target: Path, codec: str, level: int | None = None) -> None:
+    """Write ``source`` to ``target`` compressed with ``codec``."""
+    import shutil
+
+    with open(source, "rb") as reader, CompressedWriter(open(target, "wb"), codec, level) as writer:
+        shutil.copyfileobj(reader, writer, DUMP_BUFFER_SIZE)
+
+
+def read_dump(path: Path) -> str:
+    """Return the SQL text of a plain or compressed dump."""
+    with open_dump_reader(path) as handle:
+        return handle.read().decode("utf-8")
+
+
+def load_dump(conn: sqlite3.Connection, path: Path) -> None:
+    """Decompress the dump at ``path`` if needed and run it against ``conn``."""
+    conn.executescript(read_dump(path))
+
+
+def decompress_file(path: Path, target: Path) -> None:
+    """Copy a plain or compressed output to ``target`` uncompressed, e.g. to open an asset."""
+    import shutil
+
+    with open_dump_reader(path) as source, open(target, "wb") as handle:
+        shutil.copyfileobj(source, handle, DUMP_BUFFER_SIZE)
+
+
+def _install_output(built_path: Path, path: Path, level: int | None = None) -> None:
+    """Move a finished file to ``path``, compressing it on the way if the suffix asks for it."""
+    codec = compression_codec(path)
+    if codec is None:
+        os.replace(built_path, path)
+        return
+    compressed_path = path.with_name(path.name + ".tmp")
+    try:
+        compress_file(built_path, compressed_path, codec, level)
+        os.replace(compressed_path, path)
+    finally:
+        compressed_path.unlink(missing_ok=True)
+
+
+def sql_literal(value: object) -> str:
+    """Render a Python value as a dump literal that SQLite reads back as the same value.
+
+    NaN and the infinities have no SQL literal and raise ``ValueError``.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, float):
+        if value != value or value in (INFINITY, -INFINITY):
+            raise ValueError(f"{value!r} has no SQL literal; the catalog must only hold finite numbers")
+        text = repr(value)
+        # SQLite's parser (3.40) misrounds some decimals with 11 to 16
+        # significant digits, but reads all 17 back exactly.
+        if 10 < len(text.partition("e")[0].strip("-0.").replace(".", "")) < 17:
+            text = "%.17g" % value
+            if "." not in text and "e" not in text:
+                text += ".0"
+        return text
+    return str(int(value))
+
+
+def insert_statement(table: str, row: Tuple) -> str:
+    return f'INSERT INTO "{table}" VALUES({",".join(map(sql_literal, row))});\n'
+
+
+def schema_statements(script: str = SCHEMA) -> List[str]:
+    statements: List[str] = []
+    for raw_statement in script.split(';'):
+        cleaned = raw_statement.strip()
+        if not cleaned or cleaned.upper() == 'PRAGMA FOREIGN_KEYS = ON':
+            continue
+        statements.append(cleaned)
+    return statements
+
+
+def _write_rows(
+    handle: TextIO, table: str, rows: Iterable[Tuple], load: TableLoad, stats: List[IndexStats] = ()
+) -> None:
+    started = time.perf_counter()
+    for row in rows:
+        handle.write(insert_statement(table, row))
+        for index in stats:
+            index.add(row)
+        load.rows += 1
+    load.seconds += time.perf_counter() - started
+
+
+def _copy_section(handle: TextIO, source: BinaryIO, section: DumpSection, load: TableLoad) -> None:
+    started = time.perf_counter()
+    handle.flush()
+    source.seek(section.offset)
+    remaining = section.size
+    while remaining:
+        block = source.read(min(remaining, DUMP_BUFFER_SIZE))
+        if not block:
+            raise ValueError(f"Previous dump is truncated inside the {load.table} section")
+        handle.buffer.write(block)
+        remaining -= len(block)
+    load.rows += section.rows
+    load.seconds += time.perf_counter() - started
+
+
+class SqlDumpWriter(CatalogSink):
+    """Render the SQL dump into an open text ``handle``; see ``write_sql_dump``.
+
+    Sections in ``reuse`` are copied from ``previous`` instead of being
+    rendered. Rows of the ``deferred`` tables are only spooled during the walk:
+    move the ones that turn out reusable into ``reuse`` before ``finish``, and
+    the others are rendered from the spool.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        previous: BinaryIO | None = None,
+        reuse: Mapping[str, DumpSection] | None = None,
+        search: FullTextSearch | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        deferred: Iterable[str] = (),
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.handle = handle
+        self.previous = previous
+        self.reuse = dict(reuse or {})
+        self.search = search
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.deferred = set(deferred)
+        self.images = images
+
+    def _emit_table(self, table: str, rows: Iterable[Tuple]) -> None:
+        self.offsets[table] = self.handle.tell()
+        if table in self.reuse:
+            _copy_section(self.handle, self.previous, self.reuse[table], self.loads[table])
+        else:
+            _write_rows(self.handle, table, rows, self.loads[table], self.stats[table])
+
+    def start(self, catalog: Catalog) -> None:
+        import tempfile
+
+        self.ingredients = catalog.ingredients
+        self.loads = {table: TableLoad(table) for table in TABLES}
+        self.offsets: Dict[str, int] = {}
+        self.stats = index_stats()
+        started = time.perf_counter()
+        self.handle.write('PRAGMA foreign_keys=ON;\nBEGIN TRANSACTION;\n')
+        for statement in schema_statements():
+            self.handle.write(f"{statement};\n")
+        self.steps["schema"] = time.perf_counter() - started
+        self._emit_table("categories", category_rows(catalog.categories))
+        self._emit_table("ingredients", ingredient_rows(catalog.ingredients))
+        self._emit_table("score_configs", score_config_rows(SCORE_PRESETS))
+
+        # Reused sections ahead of the first rendered or deferred table are
+        # copied right away; the first rendered table streams into the dump
+        # and later ones into spools.
+        self.direct = None
+        self.spools: Dict[str, IO] = {}
+        waiting = False
+        for table in RECIPE_TABLES:
+            if table in self.deferred:
+                self.spools[table] = tempfile.TemporaryFile("w+b")
+            elif table in self.reuse:
+                if not waiting:
+                    self._emit_table(table, ())
+                continue
+            elif not waiting:
+                self.direct = table
+                self.offsets[table] = self.handle.tell()
+            else:
+                self.spools[table] = tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n")
+            waiting = True
+
+    def add(self, chunk: RecipeChunk) -> None:
+        import marshal
+
+        for table, rows in zip(RECIPE_TABLES, chunk[1:]):
+            if table in self.deferred:
+                started = time.perf_counter()
+                marshal.dump(rows, self.spools[table])
+                self.loads[table].seconds += time.perf_counter() - started
+            elif table == self.direct:
+                _write_rows(self.handle, table, rows, self.loads[table], self.stats[table])
+            elif table in self.spools:
+                _write_rows(self.spools[table], table, rows, self.loads[table], self.stats[table])
+
+    def _spooled_rows(self, table: str) -> Iterator[Tuple]:
+        import marshal
+
+        spool = self.spools[table]
+        spool.seek(0)
+        while True:
+            try:
+                rows = marshal.load(spool)
+            except EOFError:
+                return
+            yield from rows
+
+    def finish(self, identity: CatalogIdentity) -> Dict[str, DumpSection]:
+        import shutil
+
+        handle = self.handle
+        try:
+            for table in RECIPE_TABLES:
+                if table in self.offsets:
+                    continue
+                if table in self.reuse or table in self.deferred:
+                    self._emit_table(table, self._spooled_rows(table) if table in self.deferred else ())
+                    continue
+                self.offsets[table] = handle.tell()
+                started = time.perf_counter()
+                self.spools[table].seek(0)
+                shutil.copyfileobj(self.spools[table], handle, DUMP_BUFFER_SIZE)
+                self.loads[table].seconds += time.perf_counter() - started
+        finally:
+            self.abort()
+
+        end = handle.tell()
+        started = time.perf_counter()
+        if identity.version is not None:
+            handle.write(insert_statement("catalog_version", (1, identity.version)))
+        if identity.manifest is not None:
+            for row in manifest_rows(identity.manifest):
+                handle.write(insert_statement("catalog_manifest", row))
+        for statement in schema_statements(INDEXES):
+            handle.write(f"{statement};\n")
+        if self.search is not None:
+            for statement in self.search.statements():
+                handle.write(f"{statement};\n")
+        if self.macro_index:
+            for statement in MACRO_INDEX_STATEMENTS:
+                handle.write(f"{statement};\n")
+        self.steps["indexes"] = time.perf_counter() - started
+        if self.substitutes is not None:
+            started = time.perf_counter()
+            for statement in schema_statements(SUBSTITUTES_SCHEMA):
+                handle.write(f"{statement};\n")
+            for row in ingredient_substitutes(self.ingredients, self.substitutes):
+                handle.write(insert_statement("ingredient_substitutes", row))
+            self.steps["substitutes"] = time.perf_counter() - started
+        if self.images is not None:
+            started = time.perf_counter()
+            for statement in schema_statements(IMAGES_SCHEMA):
+                handle.write(f"{statement};\n")
+            for row in self.images:
+                handle.write(insert_statement("recipe_images", row))
+            self.steps["images"] = time.perf_counter() - started
+
+        sections: Dict[str, DumpSection] = {}
+        boundaries = [self.offsets[table] for table in TABLES] + [end]
+        for idx, table in enumerate(TABLES):
+            load = self.loads[table]
+            table_stats = self.reuse[table].stats if table in self.reuse else _stat_rows(self.stats[table])
+            sections[table] = DumpSection(
+                boundaries[idx], boundaries[idx + 1] - boundaries[idx], load.rows, load.seconds, table_stats
+            )
+        # ``ANALYZE sqlite_master`` creates sqlite_stat1 without scanning any table.
+        started = time.perf_counter()
+        handle.write('ANALYZE sqlite_master;\n')
+        for table, section in sections.items():
+            for index, stat in section.stats:
+                handle.write(insert_statement("sqlite_stat1", (table, index, stat)))
+        handle.write('COMMIT;\n')
+        self.steps["stats"] = time.perf_counter() - started
+        return sections
+
+    def abort(self) -> None:
+        for spool in getattr(self, "spools", {}).values():
+            spool.close()
+        self.spools = {}
+
+
+def write_sql_dump(
+    handle: TextIO,
+    catalog: Catalog,
+    previous: BinaryIO | None = None,
+    reuse: Mapping[str, DumpSection] | None = None,
+    search: FullTextSearch | None = None,
+    version: str | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    timings: Dict[str, float] | None = None,
+    manifest: Mapping | None = None,
+    images: List[Tuple] | None = None,
+) -> Dict[str, DumpSection]:
+    """Stream the SQL dump for the catalog into ``handle`` table by table.
+
+    Literals are rendered straight from the catalog rows, so nothing is built in
+    SQLite first. ``catalog.recipes`` is traversed once for all of
+    ``RECIPE_TABLES``: the first table that is rendered is written as it comes,
+    while the rows of later ones are spooled to temporary files and appended
+    afterwards, which keeps memory flat for any catalog size.
+
+    Tables listed in ``reuse`` are copied byte for byte from ``previous`` (an
+    earlier dump opened in binary mode) instead of being rendered again. The
+    returned sections record where each table landed in the new dump.
+
+    The secondary indexes are created after the data, followed by the
+    ``sqlite_stat1`` rows that ``ANALYZE`` would produce. Those statistics are
+    computed from the rows as they are rendered (or taken from ``reuse``), so
+    the app's query planner has them from the first launch. With ``search``,
+    the ``recipe_search`` FTS5 table is created and filled from the loaded
+    tables before that, with ``macro_index`` the ``recipe_macros`` R*Tree, and
+    with ``substitutes`` up to that many ``ingredient_substitutes`` per ingredient,
+    and with ``images`` (see ``load_images``) the ``recipe_images`` rows.
+    ``version`` (see ``catalog_version_id``) is stored in the ``catalog_version``
+    table for patches to check against, and ``manifest`` (see
+    ``catalog_manifest``) in ``catalog_manifest``. If ``timings`` is given, the seconds
+    spent on the schema, the indexes and other derived structures, the
+    substitutes and the statistics are stored in it; the returned sections
+    carry each table's own.
+    """
+    writer = SqlDumpWriter(handle, previous, reuse, search, macro_index, substitutes, (), images)
+    sections = _drive(writer, catalog, CatalogIdentity(version, manifest))
+    if timings is not None:
+        timings.update(writer.steps)
+    return sections
+
+
+def schema_digest(
+    search: FullTextSearch | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    images: List[Tuple] | None = None,
+) -> str:
+    """Digest of the dump format, the schema and the optional derived structures.
+
+    The image rows do not follow from the catalog, so their values are part of it.
+    """
+    import hashlib
+
+    search_sql = ";".join(search.statements()) if search is not None else ""
+    if macro_index:
+        search_sql += ";".join(MACRO_INDEX_STATEMENTS)
+    if substitutes is not None:
+        search_sql += f"{SUBSTITUTES_SCHEMA}{substitutes}"
+    if images is not None:
+        search_sql += IMAGES_SCHEMA + hashlib.sha256(repr(images).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{DUMP_FORMAT_VERSION}\n{SCHEMA}\n{INDEXES}\n{search_sql}".encode("utf-8")).hexdigest()
+
+
+class DigestSink(CatalogSink):
+    """``catalog_digests`` and row counts, from the chunks of the walk.
+
+    ``finish`` returns ``(digests, counts)``. The categories, ingredients and
+    score configs are hashed in ``start``, so ``table_digests`` can be asked
+    for those before the walk.
+    """
+
+    identifies = True
+
+    def __init__(
+        self,
+        search: FullTextSearch | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.search = search
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.images = images
+
+    def _hash(self, table: str, rows: Iterable[Tuple]) -> None:
+        digest = self.hashes[table]
+        for row in rows:
+            digest.update(repr(row).encode("utf-8"))
+            self.rows[table] += 1
+
+    def start(self, catalog: Catalog) -> None:
+        import hashlib
+
+        self.hashes = {table: hashlib.sha256() for table in TABLES}
+        self.rows = dict.fromkeys(TABLES, 0)
+        self._hash("categories", category_rows(catalog.categories))
+        self._hash("ingredients", ingredient_rows(catalog.ingredients))
+        self._hash("score_configs", score_config_rows(SCORE_PRESETS))
+
+    def table_digests(self) -> Dict[str, str]:
+        """Digests of the schema and of every table hashed so far."""
+        digests = {"schema": schema_digest(self.search, self.macro_index, self.substitutes, self.images)}
+        digests.update((table, self.hashes[table].hexdigest()) for table in TABLES if table not in RECIPE_TABLES)
+        return digests
+
+    def add(self, chunk: RecipeChunk) -> None:
+        self._hash("recipes", chunk.recipe_rows)
+        self._hash("recipe_ingredients", chunk.ingredient_rows)
+
+    def finish(self, identity: CatalogIdentity) -> Tuple[Dict[str, str], Dict[str, int]]:
+        # recipe_scores is derived from the recipes and the score configs, so
+        # its digest combines theirs instead of hashing every score.
+        for table in ("recipes", "score_configs"):
+            self.hashes["recipe_scores"].update(self.hashes[table].digest())
+        self.rows["recipe_scores"] = self.rows["recipes"] * self.rows["score_configs"]
+        digests = {"schema": schema_digest(self.search, self.macro_index, self.substitutes, self.images)}
+        digests.update((table, digest.hexdigest()) for table, digest in self.hashes.items())
+        return digests, dict(self.rows)
+
+
+def catalog_digests(
+    catalog: Catalog,
+    search: FullTextSearch | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    counts: Dict[str, int] | None = None,
+    images: List[Tuple] | None = None,
+) -> Dict[str, str]:
+    """Return a content digest of the schema and of each table's rows.
+
+    Digests are taken over the exact row tuples that end up in the dump, so a
+    table is considered changed whenever any of its values or IDs would change.
+    The schema digest also covers the full-text search settings, the macro
+    index, the substitute count and the image rows; substitutes follow from
+    the ingredients.
+    ``recipe_scores`` is derived from the recipes and the score configs, so its
+    digest combines theirs instead of hashing every score. If ``counts`` is
+    given, each table's row count is stored in it by the same pass.
+    """
+    digests, rows = _drive(DigestSink(search, macro_index, substitutes, images), catalog)
+    if counts is not None:
+        counts.update(rows)
+    return digests
+
+
+def fingerprint_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".fingerprint.json")
+
+
+def read_fingerprint(output_path: Path) -> Dict | None:
+    """Load the fingerprint stored next to ``output_path`` if it still matches the dump.
+
+    Sections are spliced from the previous dump by offset, so the whole file
+    must be the one the fingerprint describes: its size is checked first, then
+    its SHA-256.
+    """
+    import json
+
+    try:
+        fingerprint = json.loads(fingerprint_path(output_path).read_text(encoding="utf-8"))
+        if fingerprint.get("size") != output_path.stat().st_size:
+            return None
+        if fingerprint.get("sha256") != _file_sha256(output_path):
+            return None
+    except (OSError, ValueError):
+        return None
+    return fingerprint
+
+
+def write_fingerprint(
+    output_path: Path,
+    digests: Dict[str, str],
+    sections: Dict[str, DumpSection],
+    compression: str | None = None,
+    inputs: str | None = None,
+) -> None:
+    import json
+
+    fingerprint = {
+        "schema": digests["schema"],
+        "size": output_path.stat().st_size,
+        "sha256": _file_sha256(output_path),
+        "compression": compression,
+        "inputs": inputs,
+        "tables": {
+            table: {
+                "digest": digests[table],
+                "offset": section.offset,
+                "size": section.size,
+                "rows": section.rows,
+                "stats": [list(stat) for stat in section.stats],
+            }
+            for table, section in sections.items()
+        },
+    }
+    fingerprint_path(output_path).write_text(json.dumps(fingerprint, indent=2) + "\n", encoding="utf-8")
+
+
+def catalog_inputs_digest(paths: Iterable[Path | None] = ()) -> str:
+    """Digest of everything a catalog's rows are built from.
+
+    That is this module, which holds the built-in catalog and renders every
+    row, and the export files in ``paths`` (``None`` entries are skipped).
+    """
+    import hashlib
+
+    digest = hashlib.sha256(_file_sha256(__file__).encode("ascii"))
+    for path in paths:
+        if path is not None:
+            digest.update(_file_sha256(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def dump_compression(output_path: Path, compress_level: int | None = None) -> str | None:
+    """The ``codec-level`` a fingerprint records for ``output_path``, or ``None`` if uncompressed."""
+    codec = compression_codec(output_path)
+    if codec is None:
+        return None
+    level = DEFAULT_COMPRESSION_LEVELS[codec] if compress_level is None else compress_level
+    return f"{codec}-{level}"
+
+
+def dump_up_to_date(
+    output_path: Path,
+    inputs: str,
+    search: FullTextSearch | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    compress_level: int | None = None,
+    images: List[Tuple] | None = None,
+) -> bool:
+    """Whether the dump and its manifest were written from ``inputs`` with these settings.
+
+    Only the fingerprint and the dump file are read, so this answers before
+    the catalog is built or walked; see ``catalog_inputs_digest``.
+    """
+    fingerprint = read_fingerprint(output_path)
+    return (
+        fingerprint is not None
+        and fingerprint.get("inputs") == inputs
+        and fingerprint.get("schema") == schema_digest(search, macro_index, substitutes, images)
+        and fingerprint.get("compression") == dump_compression(output_path, compress_level)
+        and default_manifest_path(output_path).exists()
+    )
+
+
+def reusable_sections(fingerprint: Dict | None, digests: Dict[str, str]) -> Dict[str, DumpSection]:
+    """Return the sections of the previous dump whose table digests are unchanged."""
+    if fingerprint is None or fingerprint.get("schema") != digests["schema"]:
+        return {}
+    reuse: Dict[str, DumpSection] = {}
+    for table, entry in fingerprint.get("tables", {}).items():
+        if table in digests and entry.get("digest") == digests[table]:
+            stats = tuple(tuple(stat) for stat in entry.get("stats", ()))
+            reuse[table] = DumpSection(entry["offset"], entry["size"], entry["rows"], stats=stats)
+    return reuse
+
+
+def catalog_version_id(digests: Mapping[str, str]) -> str:
+    """Short identifier of a catalog's contents, derived from its ``catalog_digests``."""
+    import hashlib
+
+    combined = "\n".join(f"{name}={digest}" for name, digest in sorted(digests.items()))
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()[:16]
+
+
+def default_manifest_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def catalog_manifest(version: str, digests: Mapping[str, str], counts: Mapping[str, int]) -> Dict:
+    """Describe a catalog for the app: its version and each table's row count and digest."""
+    return {
+        "format": CATALOG_MANIFEST_VERSION,
+        "catalog_version": version,
+        "tables": {table: {"rows": counts[table], "sha256": digests[table]} for table in TABLES},
+    }
+
+
+def manifest_rows(manifest: Mapping) -> List[Tuple]:
+    """Rows of the ``catalog_manifest`` table for ``manifest``."""
+    return [(table, entry["rows"], entry["sha256"]) for table, entry in manifest["tables"].items()]
+
+
+def read_manifest(path: Path) -> Dict:
+    import json
+
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_manifest(path: Path, manifest: Mapping) -> None:
+    import json
+
+    partial_path = path.with_name(path.name + ".partial")
+    partial_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    os.replace(partial_path, path)
+
+
+def verify_manifest(conn: sqlite3.Connection, manifest: Mapping) -> List[str]:
+    """Return what ``conn`` holds differently from ``manifest``; empty if it is that catalog.
+
+    Only the ``catalog_version`` row and the ``catalog_manifest`` rows stored
+    by the dump, the asset and patches are read, by primary key, so the check
+    costs the same for any catalog size. Tables whose row count or digest
+    differ are listed, followed by ``catalog_version`` when the version
+    differs; schema, search and other derived-table changes only show there.
+    A database without a manifest lists everything.
+    """
+    import sqlite3
+
+    try:
+        (version,) = conn.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone() or (None,)
+        stored = {
+            table: (rows, digest)
+            for table, rows, digest in conn.execute("SELECT table_name, row_count, sha256 FROM catalog_manifest")
+        }
+    except sqlite3.OperationalError:
+        version, stored = None, {}
+    stale = [
+        table for table, entry in manifest["tables"].items() if stored.get(table) != (entry["rows"], entry["sha256"])
+    ]
+    if version != manifest["catalog_version"]:
+        stale.append("catalog_version")
+    return stale
+
+
+class TableDiff:
+    """Merge one table's new rows against its previous rows into patch statements.
+
+    Both sides must arrive in ``PATCH_KEYS`` order, so only the current row of
+    each is held. New keys become INSERTs, rows with changed values become
+    upserts that set just the changed columns, and previous keys that are gone
+    become DELETEs. Rows that give up a UNIQUE name (updated or deleted) are
+    first renamed to a placeholder, so names can move between IDs.
+    """
+
+    __slots__ = (
+        "table", "columns", "key", "conflict", "unique", "previous", "pending",
+        "renames", "upserts", "deletes", "stats", "inserted", "updated", "deleted",
+    )
+
+    def __init__(
+        self,
+        table: str,
+        columns: List[str],
+        previous: Iterator[Tuple],
+        renames: TextIO,
+        upserts: TextIO,
+        deletes: TextIO,
+        stats: List[IndexStats] = (),
+    ) -> None:
+        self.table = table
+        self.columns = columns
+        self.key = itemgetter(*PATCH_KEYS[table])
+        self.conflict = sorted(PATCH_KEYS[table])
+        self.unique = PATCH_UNIQUE_NAMES.get(table)
+        self.previous = previous
+        self.pending = next(previous, None)
+        self.renames = renames
+        self.upserts = upserts
+        self.deletes = deletes
+        self.stats = stats
+        self.inserted = self.updated = self.deleted = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def _where(self, row: Tuple) -> str:
+        return " AND ".join(f"{self.columns[idx]} = {sql_literal(row[idx])}" for idx in self.conflict)
+
+    def _release_name(self, row: Tuple) -> None:
+        column = self.columns[self.unique]
+        self.renames.write(f'UPDATE "{self.table}" SET {column} = char(0) || id WHERE {self._where(row)};\n')
+
+    def _delete(self, row: Tuple) -> None:
+        if self.unique is not None:
+            self._release_name(row)
+        self.deletes.write(f'DELETE FROM "{self.table}" WHERE {self._where(row)};\n')
+        self.deleted += 1
+
+    def add(self, row: Tuple) -> None:
+        for index in self.stats:
+            index.add(row)
+        key = self.key(row)
+        pending = self.pending
+        while pending is not None and self.key(pending) < key:
+            self._delete(pending)
+            pending = next(self.previous, None)
+        if pending is None or self.key(pending) != key:
+            self.pending = pending
+            self.upserts.write(insert_statement(self.table, row))
+            self.inserted += 1
+            return
+        self.pending = next(self.previous, None)
+        if pending == row:
+            return
+        changed = [idx for idx, (old, new) in enumerate(zip(pending, row)) if old != new]
+        if self.unique in changed:
+            self._release_name(pending)
+        conflict = ", ".join(self.columns[idx] for idx in self.conflict)
+        assignments = ", ".join(f"{self.columns[idx]}=excluded.{self.columns[idx]}" for idx in changed)
+        self.upserts.write(
+            f'INSERT INTO "{self.table}" VALUES({",".join(map(sql_literal, row))}) '
+            f"ON CONFLICT({conflict}) DO UPDATE SET {assignments};\n"
+        )
+        self.updated += 1
+
+    def finish(self) -> None:
+        while self.pending is not None:
+            self._delete(self.pending)
+            self.pending = next(self.previous, None)
+
+    def describe(self) -> str:
+        return f"{self.table}: {self.inserted} inserted, {self.updated} updated, {self.deleted} deleted"
+
+    def __getstate__(self) -> Tuple[None, Dict[str, object]]:
+        # Only the counts leave a run_sinks worker; the cursor and spools stay behind.
+        return None, {name: getattr(self, name) for name in ("table", "inserted", "updated", "deleted")}
+
+
+def _table_definitions(conn: sqlite3.Connection) -> Dict[str, str]:
+    return dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'"))
+
+
+def open_previous_catalog(path: Path, snapshot: bool = False) -> sqlite3.Connection:
+    """Open an earlier SQL dump or SQLite database as the base of a patch.
+
+    A plain database file is opened read-only and a compressed one is
+    loaded into memory; a dump is replayed into a private temporary database.
+    With ``snapshot``, a plain database is loaded into memory as well, so the
+    file can be replaced while the patch is built. The tables must have the
+    current schema.
+    """
+    import sqlite3
+    from contextlib import closing
+
+    with open_dump_reader(path) as handle:
+        is_database = handle.read(16) == b"SQLite format 3\x00"
+    if is_database and compression_codec(path) is None and not snapshot:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    elif is_database:
+        conn = sqlite3.connect(":memory:")
+        with open_dump_reader(path) as handle:
+            conn.deserialize(handle.read())
+    else:
+        # An empty name gives a temporary on-disk database that is deleted on close.
+        conn = sqlite3.connect("")
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        load_dump(conn, path)
+    with closing(sqlite3.connect(":memory:")) as reference:
+        reference.executescript(SCHEMA)
+        expected = _table_definitions(reference)
+    found = _table_definitions(conn)
+    for table in TABLES:
+        if found.get(table) != expected[table]:
+            conn.close()
+            raise ValueError(f"{path} has a different {table} table; ship a full dump instead of a patch")
+    return conn
+
+
+class PatchWriter(CatalogSink):
+    """Write the patch from ``previous`` into an open text ``handle``; see ``write_patch``.
+
+    ``finish`` needs the identity's ``version`` and returns the ``TableDiff``s.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        previous: sqlite3.Connection,
+        search: FullTextSearch | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.handle = handle
+        self.previous = previous
+        self.search = search
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.images = images
+
+    def start(self, catalog: Catalog) -> None:
+        import sqlite3
+        import tempfile
+        from contextlib import ExitStack
+
+        previous = self.previous
+        self.ingredients = catalog.ingredients
+        self.columns = {
+            table: [row[1] for row in previous.execute(f'PRAGMA table_info("{table}")')] for table in TABLES
+        }
+        try:
+            self.base_version = previous.execute("SELECT version FROM catalog_version").fetchone()
+        except sqlite3.OperationalError:
+            self.base_version = None
+        self.stats = index_stats()
+        self.spools = ExitStack()
+
+        def spool() -> TextIO:
+            return self.spools.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n"))
+
+        self.renames = spool()
+        self.diffs: Dict[str, TableDiff] = {}
+        for table in TABLES:
+            order = ", ".join(self.columns[table][idx] for idx in PATCH_KEYS[table])
+            rows = previous.execute(f'SELECT * FROM "{table}" ORDER BY {order}')
+            self.diffs[table] = TableDiff(
+                table, self.columns[table], rows, self.renames, spool(), spool(), self.stats[table]
+            )
+        for table, rows in (
+            ("categories", category_rows(catalog.categories)),
+            ("ingredients", ingredient_rows(catalog.ingredients)),
+            ("score_configs", score_config_rows(SCORE_PRESETS)),
+        ):
+            for row in rows:
+                self.diffs[table].add(row)
+
+    def add(self, chunk: RecipeChunk) -> None:
+        recipes, recipe_ingredients, recipe_scores = (self.diffs[table] for table in RECIPE_TABLES)
+        for row in chunk.recipe_rows:
+            recipes.add(row)
+        for row in chunk.score_rows:
+            recipe_scores.add(row)
+        # Rows are keyed by (recipe_id, ingredient_id); a recipe lists them in its own order.
+        for _, rows in groupby(chunk.ingredient_rows, key=itemgetter(0)):
+            for row in sorted(rows, key=itemgetter(1)):
+                recipe_ingredients.add(row)
+
+    def finish(self, identity: CatalogIdentity) -> Dict[str, TableDiff]:
+        import shutil
+        import sqlite3
+
+        handle = self.handle
+        previous = self.previous
+        diffs = self.diffs
+        with self.spools:
+            for diff in diffs.values():
+                diff.finish()
+
+            handle.write("PRAGMA foreign_keys=ON;\nBEGIN TRANSACTION;\n")
+            if self.base_version is not None:
+                handle.write(
+                    "CREATE TEMP TABLE catalog_patch_guard(ok INTEGER NOT NULL CONSTRAINT patch_base_version CHECK (ok));\n"
+                    "INSERT INTO catalog_patch_guard VALUES("
+                    f"(SELECT version = {sql_literal(self.base_version[0])} FROM catalog_version));\n"
+                    "DROP TABLE catalog_patch_guard;\n"
+                )
+            else:
+                # The base predates the version marker: add its table.
+                for statement in schema_statements():
+                    if statement.startswith("CREATE TABLE catalog_version"):
+                        handle.write(statement.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1) + ";\n")
+            sources = [self.renames]
+            sources.extend(diff.upserts for diff in diffs.values())
+            sources.extend(diffs[table].deletes for table in reversed(TABLES))
+            for source in sources:
+                source.seek(0)
+                shutil.copyfileobj(source, handle, DUMP_BUFFER_SIZE)
+
+        if self.substitutes is not None:
+            # After the ingredient changes, which the rows reference. The keys
+            # are distinct, so deletes and upserts can go out in one stream.
+            table = "ingredient_substitutes"
+            if previous.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (table,)).fetchone() is None:
+                for statement in schema_statements(SUBSTITUTES_SCHEMA):
+                    handle.write(f"{statement};\n")
+                rows = iter(())
+            else:
+                rows = previous.execute(f"SELECT * FROM {table} ORDER BY ingredient_id, rank")
+            diffs[table] = TableDiff(table, list(SUBSTITUTES_COLUMNS), rows, handle, handle, handle)
+            for row in ingredient_substitutes(self.ingredients, self.substitutes):
+                diffs[table].add(row)
+            diffs[table].finish()
+        if self.images is not None:
+            table = "recipe_images"
+            if previous.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (table,)).fetchone() is None:
+                for statement in schema_statements(IMAGES_SCHEMA):
+                    handle.write(f"{statement};\n")
+                rows = iter(())
+            else:
+                rows = previous.execute(f"SELECT * FROM {table} ORDER BY image_url")
+            diffs[table] = TableDiff(table, list(IMAGES_COLUMNS), rows, handle, handle, handle)
+            for row in self.images:
+                diffs[table].add(row)
+            diffs[table].finish()
+        handle.write(
+            f'INSERT INTO "catalog_version" VALUES(1,{sql_literal(identity.version)}) '
+            "ON CONFLICT(id) DO UPDATE SET version=excluded.version;\n"
+        )
+        if identity.manifest is not None:
+            # A handful of rows, so they are replaced outright; bases that
+            # predate the manifest get the table.
+            for statement in schema_statements():
+                if statement.startswith("CREATE TABLE catalog_manifest"):
+                    handle.write(statement.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1) + ";\n")
+            handle.write("DELETE FROM catalog_manifest;\n")
+            for row in manifest_rows(identity.manifest):
+                handle.write(insert_statement("catalog_manifest", row))
+        if self.search is not None and any(
+            diffs[table].changed for table in ("ingredients", "recipes", "recipe_ingredients")
+        ):
+            for statement in self.search.statements():
+                handle.write(f"{statement};\n")
+        if (
+            self.macro_index
+            and previous.execute("SELECT 1 FROM sqlite_master WHERE name = 'recipe_macros'").fetchone() is None
+        ):
+            for statement in MACRO_INDEX_STATEMENTS:
+                handle.write(f"{statement};\n")
+        try:
+            base_stats = {table: set() for table in TABLES}
+            for table, index, stat in previous.execute("SELECT tbl, idx, stat FROM sqlite_stat1"):
+                base_stats.setdefault(table, set()).add((index, stat))
+        except sqlite3.OperationalError:
+            base_stats = {}
+        stale = [table for table in TABLES if set(_stat_rows(self.stats[table])) != base_stats.get(table)]
+        if stale:
+            handle.write("ANALYZE sqlite_master;\n")
+            for table in stale:
+                handle.write(f"DELETE FROM sqlite_stat1 WHERE tbl = {sql_literal(table)};\n")
+                for index, stat in _stat_rows(self.stats[table]):
+                    handle.write(insert_statement("sqlite_stat1", (table, index, stat)))
+        handle.write("COMMIT;\n")
+        return diffs
+
+    def abort(self) -> None:
+        if hasattr(self, "spools"):
+            self.spools.close()
+
+
+def write_patch(
+    handle: TextIO,
+    catalog: Catalog,
+    previous: sqlite3.Connection,
+    version: str,
+    search: FullTextSearch | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    manifest: Mapping | None = None,
+    images: List[Tuple] | None = None,
+) -> Dict[str, TableDiff]:
+    """Write a script that turns the ``previous`` catalog into this one.
+
+    Rows are compared by primary key in one pass over ``catalog.recipes``
+    while the previous rows stream from ``previous`` in the same order, so
+    memory stays flat. The script only touches changed rows: placeholder
+    renames, then inserts and upserts parent tables first, then deletes child
+    tables first. It aborts with ``patch_base_version`` unless the target holds
+    the previous catalog version, and ends by storing ``version`` (and
+    ``manifest``) and replacing the ``sqlite_stat1`` rows that differ. With ``search``, the
+    ``recipe_search`` index is rebuilt when recipe text may have changed. With
+    ``macro_index``, a base without ``recipe_macros`` gets it built; where it
+    already exists, its triggers follow the recipe changes. With
+    ``substitutes``, ``ingredient_substitutes`` is diffed like the other
+    tables, or created if the base has none, and so is ``recipe_images`` with
+    ``images``.
+    """
+    writer = PatchWriter(handle, previous, search, macro_index, substitutes, images)
+    return _drive(writer, catalog, CatalogIdentity(version, manifest))
+
+
+class PatchFileSink(CatalogSink):
+    """The ``--diff-from`` patch from ``previous_path`` to ``patch_path``, written by ``PatchWriter``.
+
+    The previous catalog is opened in ``start`` (see ``open_previous_catalog``).
+    """
+
+    def __init__(
+        self,
+        previous_path: Path,
+        patch_path: Path,
+        search: FullTextSearch | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        compress_level: int | None = None,
+        snapshot: bool = False,
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.previous_path = previous_path
+        self.patch_path = patch_path
+        self.partial_path = patch_path.with_name(patch_path.name + ".partial")
+        self.search = search
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.compress_level = compress_level
+        self.snapshot = snapshot
+        self.images = images
+
+    def start(self, catalog: Catalog) -> None:
+        self.previous = open_previous_catalog(self.previous_path, self.snapshot)
+        self.handle = open_dump_writer(self.partial_path, compression_codec(self.patch_path), self.compress_level)
+        self.writer = PatchWriter(
+            self.handle, self.previous, self.search, self.macro_index, self.substitutes, self.images
+        )
+        self.writer.steps = self.steps
+        self.writer.start(catalog)
+
+    def add(self, chunk: RecipeChunk) -> None:
+        self.writer.add(chunk)
+
+    def finish(self, identity: CatalogIdentity) -> Dict[str, TableDiff]:
+        diffs = self.writer.finish(identity)
+        self.handle.close()
+        self.previous.close()
+        os.replace(self.partial_path, self.patch_path)
+        return diffs
+
+    def abort(self) -> None:
+        if hasattr(self, "writer"):
+            self.writer.abort()
+        for resource in (getattr(self, "handle", None), getattr(self, "previous", None)):
+            if resource is not None:
+                resource.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+class DatabaseSink(CatalogSink):
+    """The prebuilt SQLite asset; see ``build_database``. ``finish`` returns the table loads."""
+
+    def __init__(
+        self,
+        database_path: Path,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        search: FullTextSearch | None = None,
+        compress_level: int | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.database_path = database_path
+        self.build_path = database_path.with_name(database_path.name + ".build")
+        self.partial_path = database_path.with_name(database_path.name + ".partial")
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+        self.search = search
+        self.compress_level = compress_level
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.images = images
+
+    def start(self, catalog: Catalog) -> None:
+        import sqlite3
+
+        self.ingredients = catalog.ingredients
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.build_path, self.partial_path):
+            path.unlink(missing_ok=True)
+        started = time.perf_counter()
+        self.conn = sqlite3.connect(self.build_path)
+        self.conn.execute(f"PRAGMA page_size = {self.page_size}")
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.executescript(SCHEMA)
+        loaded = time.perf_counter()
+        self.steps["schema"] = loaded - started
+        self.loads = {table: TableLoad(table) for table in TABLES}
+        self.cursor = self.conn.cursor()
+        _load_tables(self.cursor, catalog, self.loads, self.chunk_size)
+        self.steps["insert"] = time.perf_counter() - loaded
+
+    def add(self, chunk: RecipeChunk) -> None:
+        started = time.perf_counter()
+        _load_chunk(self.cursor, chunk, self.loads)
+        self.steps["insert"] += time.perf_counter() - started
+
+    def finish(self, identity: CatalogIdentity) -> Dict[str, TableLoad]:
+        conn = self.conn
+        try:
+            marks = [time.perf_counter()]
+            if identity.version is not None:
+                conn.execute("INSERT INTO catalog_version(id, version) VALUES (1, ?)", (identity.version,))
+            if identity.manifest is not None:
+                conn.executemany(CATALOG_MANIFEST_INSERT, manifest_rows(identity.manifest))
+            marks.append(time.perf_counter())
+            conn.executescript(INDEXES)
+            if self.search is not None:
+                for statement in self.search.statements():
+                    conn.execute(statement)
+            if self.macro_index:
+                for statement in MACRO_INDEX_STATEMENTS:
+                    conn.execute(statement)
+            if self.substitutes is not None:
+                conn.executescript(SUBSTITUTES_SCHEMA)
+                conn.executemany(SUBSTITUTES_INSERT, ingredient_substitutes(self.ingredients, self.substitutes))
+            if self.images is not None:
+                conn.executescript(IMAGES_SCHEMA)
+                conn.executemany(IMAGES_INSERT, self.images)
+            conn.commit()
+            marks.append(time.perf_counter())
+            conn.execute("ANALYZE")
+            conn.commit()
+            marks.append(time.perf_counter())
+            conn.execute("VACUUM INTO ?", (str(self.partial_path),))
+            conn.close()
+            _install_output(self.partial_path, self.database_path, self.compress_level)
+            marks.append(time.perf_counter())
+        finally:
+            self.abort()
+        self.steps["insert"] += marks[1] - marks[0]
+        self.steps.update((step, end - start) for step, start, end in zip(("indexes", "analyze", "write"), marks[1:], marks[2:]))
+        return self.loads
+
+    def abort(self) -> None:
+        if hasattr(self, "conn"):
+            self.conn.close()
+        self.build_path.unlink(missing_ok=True)
+        self.partial_path.unlink(missing_ok=True)
+
+
+def build_database(
+    database_path: Path,
+    catalog: Catalog,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    timings: Dict[str, float] | None = None,
+    search: FullTextSearch | None = None,
+    version: str | None = None,
+    compress_level: int | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    manifest: Mapping | None = None,
+    images: List[Tuple] | None = None,
+) -> Dict[str, TableLoad]:
+    """Write a ready-to-open SQLite file that the app can copy from its assets.
+
+    The catalog is bulk-loaded into a scratch file with journaling disabled,
+    analyzed, and then compacted with ``VACUUM INTO`` so the shipped file has no
+    free pages and carries planner statistics. With ``search``, the
+    ``recipe_search`` FTS5 table is built as well, with ``macro_index`` the
+    ``recipe_macros`` R*Tree, with ``substitutes`` the ``ingredient_substitutes``
+    table, with ``images`` the ``recipe_images`` table, and ``version`` and ``manifest`` go into ``catalog_version`` and
+    ``catalog_manifest`` as in the dump. A ``.gz`` or ``.xz`` path gets the
+    compacted file compressed at ``compress_level``. If ``timings`` is given, the
+    seconds spent creating the schema (``schema``), loading the rows (``insert``),
+    building the indexes and other derived tables (``indexes``), analyzing
+    (``analyze``) and compacting and installing the file (``write``) are stored in it.
+    """
+    sink = DatabaseSink(
+        database_path, page_size, chunk_size, search, compress_level, macro_index, substitutes, images
+    )
+    loads = _drive(sink, catalog, CatalogIdentity(version, manifest), chunk_size)
+    if timings is not None:
+        timings.update(sink.steps)
+    return loads
+
+
+class AppDatabaseSink(CatalogSink):
+    """The catalog in the app's ``DatabaseSchema`` v2 layout; see ``build_app_database``."""
+
+    uses_recipes = True
+
+    def __init__(
+        self,
+        database_path: Path,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        compress_level: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.database_path = database_path
+        self.build_path = database_path.with_name(database_path.name + ".build")
+        self.partial_path = database_path.with_name(database_path.name + ".partial")
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+        self.compress_level = compress_level
+
+    def start(self, catalog: Catalog) -> None:
+        import sqlite3
+
+        self.grams = conversion_table(catalog.ingredients)
+        self.ingredient_ids = catalog.ingredient_ids()
+        self.loads = {table: TableLoad(table) for table in APP_TABLES}
+        self.next_row_id = 1
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.build_path, self.partial_path):
+            path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(self.build_path)
+        self.conn.execute(f"PRAGMA page_size = {self.page_size}")
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.executescript(APP_SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {APP_DATABASE_VERSION}")
+        self.cursor = self.conn.cursor()
+        for chunk in _chunked(app_product_rows(catalog.ingredients), self.chunk_size):
+            _insert_many(self.cursor, APP_PRODUCT_INSERT, chunk, self.loads["products"])
+
+    def add(self, chunk: RecipeChunk) -> None:
+        recipes = []
+        rows: List[Tuple] = []
+        for recipe, row in zip(chunk.recipes, chunk.recipe_rows):
+            recipe_row, ingredient_rows = app_recipe_rows(
+                row[0], self.next_row_id, recipe, self.ingredient_ids, self.grams
+            )
+            recipes.append(recipe_row)
+            rows.extend(ingredient_rows)
+            self.next_row_id += len(ingredient_rows)
+        _insert_many(self.cursor, APP_RECIPE_INSERT, recipes, self.loads["recipes"])
+        _insert_many(self.cursor, APP_RECIPE_INGREDIENT_INSERT, rows, self.loads["recipe_ingredients"])
+
+    def finish(self, identity: CatalogIdentity) -> Dict[str, TableLoad]:
+        try:
+            self.conn.commit()
+            self.conn.execute("VACUUM INTO ?", (str(self.partial_path),))
+            self.conn.close()
+            _install_output(self.partial_path, self.database_path, self.compress_level)
+        finally:
+            self.abort()
+        return self.loads
+
+    def abort(self) -> None:
+        if hasattr(self, "conn"):
+            self.conn.close()
+        self.build_path.unlink(missing_ok=True)
+        self.partial_path.unlink(missing_ok=True)
+
+
+def build_app_database(
+    database_path: Path,
+    catalog: Catalog,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    compress_level: int | None = None,
+) -> Dict[str, TableLoad]:
+    """Write the catalog in the app's own ``DatabaseSchema`` v2 layout.
+
+    Quantities become grams, products carry macros per 100 g and recipes their
+    ``gramsPerServing``, and ``user_version`` is set to the app's database
+    version, so ``openDatabase`` neither creates nor upgrades anything.
+    """
+    sink = AppDatabaseSink(database_path, page_size, chunk_size, compress_level)
+    return _drive(sink, catalog, chunk_size=chunk_size)
+
+
+def _shard_schema(tables: Iterable[str], extra: str = "") -> str:
+    """CREATE statements of ``tables`` as SCHEMA defines them, followed by ``extra``."""
+    prefixes = tuple(f"CREATE TABLE {table} (" for table in tables)
+    statements = [statement for statement in schema_statements() if statement.startswith(prefixes)]
+    return ";\n".join(statements) + ";\n" + extra
+
+
+def _file_sha256(path: Path | str) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(DUMP_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ShardSink(CatalogSink):
+    """The core shard, one shard per category and their manifest; see ``build_shards``."""
+
+    def __init__(
+        self, directory: Path, page_size: int = DEFAULT_PAGE_SIZE, images: List[Tuple] | None = None
+    ) -> None:
+        super().__init__()
+        self.directory = directory
+        self.page_size = page_size
+        self.images = images
+
+    def start(self, catalog: Catalog) -> None:
+        import sqlite3
+
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        self.category_ids = category_ids = catalog.category_ids()
+        self.summary = itemgetter(*RECIPE_SUMMARY_FIELDS)
+        self.files = files = {"core": "core.db"}
+        files.update((category_id, f"category-{category_id}.db") for category_id in category_ids.values())
+        scripts = {"core": _shard_schema(SHARD_CORE_TABLES[:-1], RECIPE_SUMMARY_SCHEMA)}
+        scripts.update((category_id, _shard_schema(SHARD_CATEGORY_TABLES)) for category_id in category_ids.values())
+        self.loads: Dict[object, Dict[str, TableLoad]] = {
+            key: {table: TableLoad(table) for table in (SHARD_CORE_TABLES if key == "core" else SHARD_CATEGORY_TABLES)}
+            for key in files
+        }
+        self.build_paths = {key: directory / (name + ".build") for key, name in files.items()}
+        self.partial_paths = {key: directory / (name + ".partial") for key, name in files.items()}
+        self.conns: Dict[object, sqlite3.Connection] = {}
+        for key, path in self.build_paths.items():
+            path.unlink(missing_ok=True)
+            self.partial_paths[key].unlink(missing_ok=True)
+            conn = self.conns[key] = sqlite3.connect(path)
+            conn.execute(f"PRAGMA page_size = {self.page_size}")
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(scripts[key])
+
+        self.core = core = self.conns["core"].cursor()
+        core_loads = self.loads["core"]
+        _insert_many(core, CATEGORY_INSERT, list(category_rows(catalog.categories)), core_loads["categories"])
+        _insert_many(core, INGREDIENT_INSERT, list(ingredient_rows(catalog.ingredients)), core_loads["ingredients"])
+        _insert_many(core, SCORE_CONFIG_INSERT, list(score_config_rows(SCORE_PRESETS)), core_loads["score_configs"])
+        if self.images is not None:
+            core.executescript(IMAGES_SCHEMA)
+            core_loads["recipe_images"] = TableLoad("recipe_images")
+            _insert_many(core, IMAGES_INSERT, self.images, core_loads["recipe_images"])
+        self.cursors = {key: conn.cursor() for key, conn in self.conns.items() if key != "core"}
+
+    def add(self, chunk: RecipeChunk) -> None:
+        # Rows of every category shard, in SHARD_CATEGORY_TABLES order.
+        pending: Dict[int, Tuple[List[Tuple], List[Tuple], List[Tuple]]] = {}
+        categories = {}
+        for row in chunk.recipe_rows:
+            categories[row[0]] = row[1]
+            pending.setdefault(row[1], ([], [], []))[0].append(row)
+        for row in chunk.ingredient_rows:
+            pending[categories[row[0]]][1].append(row)
+        for row in chunk.score_rows:
+            pending[categories[row[1]]][2].append(row)
+        summaries = [self.summary(row) for row in chunk.recipe_rows]
+        _insert_many(self.core, RECIPE_SUMMARY_INSERT, summaries, self.loads["core"]["recipe_summaries"])
+        for category_id, (recipes, rows, scores) in pending.items():
+            cursor = self.cursors[category_id]
+            category_loads = self.loads[category_id]
+            _insert_many(cursor, RECIPE_INSERT, recipes, category_loads["recipes"])
+            _insert_many(cursor, RECIPE_INGREDIENT_INSERT, rows, category_loads["recipe_ingredients"])
+            _insert_many(cursor, RECIPE_SCORE_INSERT, scores, category_loads["recipe_scores"])
+
+    def finish(self, identity: CatalogIdentity) -> Dict:
+        import json
+
+        directory, files, loads = self.directory, self.files, self.loads
+        version = identity.version
+        try:
+            if version is not None:
+                self.core.execute("INSERT INTO catalog_version(id, version) VALUES (1, ?)", (version,))
+                loads["core"]["catalog_version"].rows += 1
+            for key, conn in self.conns.items():
+                conn.executescript(SHARD_CORE_INDEXES if key == "core" else SHARD_CATEGORY_INDEXES)
+                conn.commit()
+                conn.execute("ANALYZE")
+                conn.commit()
+                conn.execute("VACUUM INTO ?", (str(self.partial_paths[key]),))
+                conn.close()
+            for key, name in files.items():
+                os.replace(self.partial_paths[key], directory / name)
+        finally:
+            self.abort()
+
+        def entry(key: object) -> Dict:
+            path = directory / files[key]
+            return {
+                "file": files[key],
+                "size": path.stat().st_size,
+                "sha256": _file_sha256(path),
+                "rows": {table: load.rows for table, load in loads[key].items()},
+            }
+
+        manifest_path = directory / SHARD_MANIFEST_NAME
+        try:
+            previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous = {}
+        manifest = {
+            "format": SHARD_MANIFEST_VERSION,
+            "catalog_version": version,
+            "core": entry("core"),
+            "categories": [
+                {"id": category_id, "name": name, **entry(category_id)}
+                for name, category_id in self.category_ids.items()
+            ],
+        }
+        partial_manifest = manifest_path.with_name(manifest_path.name + ".partial")
+        partial_manifest.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(partial_manifest, manifest_path)
+        current = set(files.values())
+        for stale in previous.get("categories", ()):
+            if stale.get("file") not in current:
+                (directory / stale["file"]).unlink(missing_ok=True)
+        return manifest
+
+    def abort(self) -> None:
+        for conn in getattr(self, "conns", {}).values():
+            conn.close()
+        for path in list(getattr(self, "build_paths", {}).values()) + list(getattr(self, "partial_paths", {}).values()):
+            path.unlink(missing_ok=True)
+
+
+def build_shards(
+    directory: Path,
+    catalog: Catalog,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    version: str | None = None,
+    images: List[Tuple] | None = None,
+) -> Dict:
+    """Write the catalog as a core shard, one shard per category and a manifest.
+
+    ``core.db`` holds the categories, ingredients, score configs, a
+    ``recipe_summaries`` row per recipe and, with ``images``, the
+    ``recipe_images`` rows; each ``category-<id>.db`` holds the
+    full ``recipes``, ``recipe_ingredients`` and ``recipe_scores`` rows of one
+    category, with the same columns as the single-file asset.
+    ``catalog.recipes`` is walked once and every shard is built like the
+    asset (bulk load, indexes, ``ANALYZE``, ``VACUUM INTO``). The manifest
+    lists each file with its size, SHA-256 and row counts, and is replaced
+    last, so a reader never sees it point at a missing shard. Shards of
+    categories that no longer exist are removed. Returns the manifest.
+    """
+    return _drive(ShardSink(directory, page_size, images), catalog, CatalogIdentity(version), chunk_size)
+
+
+class DumpFileSink(CatalogSink):
+    """The SQL dump at ``output_path`` and its fingerprint, reusing unchanged sections.
+
+    Which sections are reusable is only known once every table is digested.
+    The categories, ingredients and score configs are digested in ``start``;
+    the recipe tables the fingerprint still has are spooled during the walk
+    (see ``SqlDumpWriter``) and either copied or rendered in ``finish``.
+    ``finish`` returns ``(sections, reused tables)``, or ``None`` if the dump
+    was already up to date.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        search: FullTextSearch | None = None,
+        macro_index: bool = False,
+        substitutes: int | None = None,
+        compress_level: int | None = None,
+        force: bool = False,
+        inputs: str | None = None,
+        images: List[Tuple] | None = None,
+    ) -> None:
+        super().__init__()
+        self.output_path = output_path
+        self.partial_path = output_path.with_name(output_path.name + ".partial")
+        self.search = search
+        self.macro_index = macro_index
+        self.substitutes = substitutes
+        self.compress_level = compress_level
+        self.force = force
+        self.inputs = inputs
+        self.images = images
+
+    def start(self, catalog: Catalog) -> None:
+        output_path = self.output_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        codec = compression_codec(output_path)
+        self.compression = dump_compression(output_path, self.compress_level)
+        self.fingerprint = None if self.force else read_fingerprint(output_path)
+        digests = DigestSink(self.search, self.macro_index, self.substitutes, self.images)
+        digests.start(catalog)
+        static = digests.table_digests()
+        reuse = reusable_sections(self.fingerprint, static)
+        deferred: List[str] = []
+        if self.fingerprint is not None and self.fingerprint.get("schema") == static["schema"]:
+            deferred = [table for table in RECIPE_TABLES if table in self.fingerprint.get("tables", {})]
+        # Reused sections are copied from the uncompressed bytes, so a
+        # compressed previous dump works as well.
+        self.previous = open_dump_reader(output_path) if reuse or deferred else None
+        self.handle = open_dump_writer(self.partial_path, codec, self.compress_level)
+        self.writer = SqlDumpWriter(
+            self.handle, self.previous, reuse, self.search, self.macro_index, self.substitutes, deferred, self.images
+        )
+        self.writer.steps = self.steps
+        self.writer.start(catalog)
+
+    def add(self, chunk: RecipeChunk) -> None:
+        self.writer.add(chunk)
+
+    def finish(self, identity: CatalogIdentity) -> Tuple[Dict[str, DumpSection], List[str]] | None:
+        reuse = reusable_sections(self.fingerprint, identity.digests)
+        if len(reuse) == len(TABLES) and self.fingerprint.get("compression") == self.compression:
+            self.abort()
+            if self.fingerprint.get("inputs") != self.inputs:
+                # Same rows from changed inputs: record them, so the next run
+                # can tell it is up to date without walking the catalog.
+                sections = {table: reuse[table] for table in TABLES}
+                write_fingerprint(self.output_path, identity.digests, sections, self.compression, self.inputs)
+            return None
+        writer = self.writer
+        writer.reuse.update((table, reuse[table]) for table in writer.deferred if table in reuse)
+        sections = writer.finish(identity)
+        # Flushing the buffers (and compressing their tail) is part of the write.
+        started = time.perf_counter()
+        self.handle.close()
+        if self.previous is not None:
+            self.previous.close()
+        os.replace(self.partial_path, self.output_path)
+        write_fingerprint(self.output_path, identity.digests, sections, self.compression, self.inputs)
+        self.steps["write"] = time.perf_counter() - started
+        return sections, [table for table in TABLES if table in writer.reuse]
+
+    def abort(self) -> None:
+        if hasattr(self, "writer"):
+            self.writer.abort()
+        for resource in (getattr(self, "handle", None), getattr(self, "previous", None)):
+            if resource is not None:
+                resource.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+class WebJsonLinesSink(CatalogSink):
+    """The recipes for the web build, one JSON object per line; ``finish`` returns the count.
+
+    Objects are keyed by ``APP_RECIPE_COLUMNS`` with the app database's
+    values, except that ``ingredients`` is a list and ``isPopular`` a boolean.
+    A ``.gz`` or ``.xz`` path is compressed at ``compress_level``.
+    """
+
+    uses_recipes = True
+
+    def __init__(self, path: Path, compress_level: int | None = None) -> None:
+        super().__init__()
+        self.path = path
+        self.partial_path = path.with_name(path.name + ".partial")
+        self.compress_level = compress_level
+
+    def start(self, catalog: Catalog) -> None:
+        self.grams = conversion_table(catalog.ingredients)
+        self.ingredient_ids = catalog.ingredient_ids()
+        self.recipes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.handle = open_dump_writer(self.partial_path, compression_codec(self.path), self.compress_level)
+
+    def add(self, chunk: RecipeChunk) -> None:
+        import json
+
+        lines = []
+        for recipe, row in zip(chunk.recipes, chunk.recipe_rows):
+            app_row, _ = app_recipe_rows(row[0], 1, recipe, self.ingredient_ids, self.grams)
+            record = dict(zip(APP_RECIPE_COLUMNS, app_row))
+            record["ingredients"] = json.loads(record["ingredients"])
+            record["isPopular"] = bool(record["isPopular"])
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.handle.writelines(lines)
+        self.recipes += len(lines)
+
+    def finish(self, identity: CatalogIdentity) -> int:
+        self.handle.close()
+        os.replace(self.partial_path, self.path)
+        return self.recipes
+
+    def abort(self) -> None:
+        if hasattr(self, "handle"):
+            self.handle.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+class ParquetSink(CatalogSink):
+    """The recipes as a Parquet file for analytics; ``finish`` returns the row count.
+
+    Columns follow ``COLUMNAR_COLUMNS`` plus a ``score_<name>`` column per
+    ``SCORE_PRESETS`` entry, and every chunk of the walk becomes one row group.
+    Requires pyarrow.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self.partial_path = path.with_name(path.name + ".partial")
+
+    def start(self, catalog: Catalog) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.categories = {category_id: name for name, category_id in catalog.category_ids().items()}
+        columns = list(COLUMNAR_COLUMNS) + [(f"score_{name}", "double") for name in SCORE_PRESETS]
+        self.schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in columns])
+        self.rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = pq.ParquetWriter(self.partial_path, self.schema, compression="zstd")
+
+    def add(self, chunk: RecipeChunk) -> None:
+        import pyarrow as pa
+
+        columns = [list(column) for column in zip(*chunk.recipe_rows)]
+        columns[-1] = [bool(value) for value in columns[-1]]
+        columns.insert(2, [self.categories[category_id] for category_id in columns[1]])
+        # recipe_scores rows come per recipe in config ID order.
+        scores = [row[2] for row in chunk.score_rows]
+        configs = len(SCORE_PRESETS)
+        columns.extend(scores[idx::configs] for idx in range(configs))
+        self.writer.write_table(pa.Table.from_pydict(dict(zip(self.schema.names, columns)), schema=self.schema))
+        self.rows += len(chunk.recipe_rows)
+
+    def finish(self, identity: CatalogIdentity) -> int:
+        self.writer.close()
+        os.replace(self.partial_path, self.path)
+        return self.rows
+
+    def abort(self) -> None:
+        if hasattr(self, "writer"):
+            self.writer.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+def _launch_from_dump(dump_path: Path, target: Path) -> None:
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(target)) as conn:
+        load_dump(conn, dump_path)
+        conn.execute("SELECT COUNT(*) FROM recipes").fetchone()
+
+
+def _launch_from_asset(database_path: Path, target: Path) -> None:
+    import sqlite3
+    from contextlib import closing
+
+    decompress_file(database_path, target)
+    with closing(sqlite3.connect(target)) as conn:
+        conn.execute("SELECT COUNT(*) FROM recipes").fetchone()
+
+
+def _median_launch(launch: Callable[[Path, Path], None], path: Path, target: Path, repeats: int) -> float:
+    import statistics
+
+    timings = []
+    for _ in range(repeats):
+        target.unlink(missing_ok=True)
+        started = time.perf_counter()
+        launch(path, target)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def compare_load_times(dump_path: Path, database_path: Path, repeats: int = 5) -> Dict[str, float]:
+    """Time a simulated first launch from the SQL dump and from the binary asset.
+
+    The dump path replays the text into a fresh database file; the asset path
+    copies the prebuilt file. Either may be compressed and is decompressed as
+    part of the launch. Both finish with the first query the app issues.
+    Returns the median time in seconds for each path.
+    """
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as workdir:
+        target = Path(workdir) / "recipes.db"
+        return {
+            "sql_dump": _median_launch(_launch_from_dump, dump_path, target, repeats),
+            "binary_asset": _median_launch(_launch_from_asset, database_path, target, repeats),
+        }
+
+
+class CompressionResult(namedtuple("CompressionResult", "output codec level size seconds")):
+    """Size of one output under one codec and level, and the median seconds to decompress and load it."""
+
+    __slots__ = ()
+
+    def describe(self, plain_size: int) -> str:
+        codec = "plain" if self.codec is None else f"{self.codec} -{self.level}"
+        return (
+            f"{self.output} {codec}: {self.size / 1024:,.1f} KiB ({self.size / plain_size:.1%}), "
+            f"decompress + load {self.seconds * 1000:.2f} ms"
+        )
+
+
+def compare_compression(
+    dump_path: Path,
+    database_path: Path | None = None,
+    levels: Mapping[str, Iterable[int]] = REPORT_COMPRESSION_LEVELS,
+    repeats: int = 3,
+) -> List[CompressionResult]:
+    """Compress the outputs with every codec and level and time loading each variant.
+
+    The dump is replayed and the asset copied out, as in ``compare_load_times``;
+    the first result per output is the uncompressed file.
+    """
+    import tempfile
+    from pathlib import Path
+
+    outputs = [("sql_dump", dump_path, _launch_from_dump, ".sql")]
+    if database_path is not None:
+        outputs.append(("binary_asset", database_path, _launch_from_asset, ".db"))
+    results: List[CompressionResult] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        target = Path(workdir) / "recipes.db"
+        for output, path, launch, suffix in outputs:
+            plain = Path(workdir) / f"plain{suffix}"
+            decompress_file(path, plain)
+            results.append(
+                CompressionResult(output, None, None, plain.stat().st_size, _median_launch(launch, plain, target, repeats))
+            )
+            for codec, codec_levels in levels.items():
+                compressed_suffix = next(key for key, value in COMPRESSION_SUFFIXES.items() if value == codec)
+                for level in codec_levels:
+                    compressed = Path(workdir) / f"level{level}{suffix}{compressed_suffix}"
+                    compress_file(plain, compressed, codec, level)
+                    seconds = _median_launch(launch, compressed, target, repeats)
+                    results.append(CompressionResult(output, codec, level, compressed.stat().st_size, seconds))
+    return results
+
+
+def measure_import_time(repeats: int = 5) -> float:
+    """Return the median cumulative import time of this module in milliseconds.
+
+    Each sample runs ``python -X importtime`` in a fresh interpreter with
+    bytecode caching enabled; a warm-up run makes sure the module is compiled.
+    """
+    import statistics
+    import subprocess
+    import sys
+
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    samples = []
+    for _ in range(repeats + 1):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                samples.append(int(fields[1]) / 1000)
+    return statistics.median(samples[1:])
+
+
+def compare_row_memory(rows: int = 200_000) -> Dict[str, float]:
+    """Return bytes per recipe-ingredient row for dict rows and ``IngredientRows``.
+
+    Rows cycle through the bundled recipes and get freshly computed macros, the
+    way ``build_recipe`` produces them; memory is measured with tracemalloc.
+    """
+    import tracemalloc
+
+    templates = [
+        [(ingredient, quantity, unit, notes) for ingredient, quantity, unit, *_, notes in recipe.ingredient_rows.tuples()]
+        for recipe in builtin_recipes()
+    ]
+
+    def dict_rows(template: List[Tuple]) -> List[RecipeIngredient]:
+        built = []
+        for name, quantity, unit, notes in template:
+            quantity *= 1.0
+            calories, protein, fat, carbs = INGREDIENT_CATALOG[name].scaled_macros(quantity)
+            built.append(
+                {
+                    "ingredient": name,
+                    "quantity": quantity,
+                    "unit": unit,
+                    "calories": calories,
+                    "protein": protein,
+                    "fat": fat,
+                    "carbs": carbs,
+                    "notes": notes,
+                }
+            )
+        return built
+
+    strings = StringPool()
+
+    def array_rows(template: List[Tuple]) -> IngredientRows:
+        built = []
+        for name, quantity, unit, notes in template:
+            quantity *= 1.0
+            built.append((name, quantity, unit, INGREDIENT_CATALOG[name].scaled_macros(quantity), notes))
+        return IngredientRows(built, strings)
+
+    results: Dict[str, float] = {}
+    for label, build in (("dict_rows", dict_rows), ("array_rows", array_rows)):
+        tracemalloc.start()
+        recipes = []
+        count = 0
+        while count < rows:
+            template = templates[len(recipes) % len(templates)]
+            recipes.append(build(template))
+            count += len(template)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = size / count
+        del recipes
+    return results
+
+
+def _phase(profile: SeedProfile | None, name: str) -> ContextManager[Dict[str, float]]:
+    """``profile.phase(name)``, or a context that records nothing without a profile."""
+    if profile is None:
+        from contextlib import nullcontext
+
+        return nullcontext({})
+    return profile.phase(name)
+
+
+def _profile_database(profile: SeedProfile, phase: str, database_path: Path, loads: Mapping[str, TableLoad]) -> None:
+    import sqlite3
+    from contextlib import closing
+
+    sizes = None
+    if compression_codec(database_path) is None:
+        with closing(sqlite3.connect(database_path)) as conn:
+            sizes = table_sizes(conn)
+    for table, load in loads.items():
+        profile.table(phase, table, load.rows, None if sizes is None else sizes.get(table, 0), load.seconds)
+
+
+class SinkRun(namedtuple("SinkRun", "result seconds steps peak_memory")):
+    """One sink's result from ``run_sinks``, with the seconds it was busy, its steps and peak traced memory."""
+
+    __slots__ = ()
+
+
+def _timed_chunks(catalog: Catalog, chunk_size: int, steps: Dict[str, float]) -> Iterator[RecipeChunk]:
+    chunks = catalog_chunks(catalog, chunk_size)
+    while True:
+        started = time.perf_counter()
+        chunk = next(chunks, None)
+        steps["chunks"] += time.perf_counter() - started
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _sink_worker(
+    sink: CatalogSink,
+    commands: Connection,
+    replies: Connection,
+    catalog: Catalog,
+    trace_memory: bool,
+    inherited: Iterable[Connection] = (),
+) -> None:
+    """Run ``sink`` in a worker process on the pickled messages of ``run_sinks``.
+
+    ``inherited`` are the parent's ends of the pipes, which a forked worker
+    holds copies of; they are closed first, so a worker never keeps another
+    worker's command pipe open.
+    """
+    import pickle
+    import tracemalloc
+
+    for connection in inherited:
+        connection.close()
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    try:
+        started = time.perf_counter()
+        sink.start(catalog)
+        seconds = time.perf_counter() - started
+        replies.send(("started", None))
+        while True:
+            kind, payload = pickle.loads(commands.recv_bytes())
+            if kind == "abort":
+                sink.abort()
+                return
+            started = time.perf_counter()
+            if kind == "chunk":
+                sink.add(payload)
+                seconds += time.perf_counter() - started
+                continue
+            result = sink.finish(payload)
+            seconds += time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            replies.send(("finished", SinkRun(result, seconds, sink.steps, peak)))
+            return
+    except BaseException as exc:
+        sink.abort()
+        try:
+            replies.send(("failed", exc))
+        except Exception:
+            # The exception itself does not pickle.
+            replies.send(("failed", RuntimeError(f"{type(exc).__name__}: {exc}")))
+
+
+def _run_sinks_here(
+    catalog: Catalog,
+    sinks: Mapping[str, CatalogSink],
+    identify: Callable[[Mapping[str, object]], CatalogIdentity],
+    chunk_size: int,
+    steps: Dict[str, float],
+) -> Tuple[CatalogIdentity, Dict[str, SinkRun]]:
+    seconds = dict.fromkeys(sinks, 0.0)
+
+    def timed(name: str, step: Callable[..., T], *args: object) -> T:
+        started = time.perf_counter()
+        result = step(*args)
+        seconds[name] += time.perf_counter() - started
+        return result
+
+    try:
+        for name, sink in sinks.items():
+            timed(name, sink.start, catalog._replace(recipes=()))
+        for chunk in _timed_chunks(catalog, chunk_size, steps):
+            for name, sink in sinks.items():
+                timed(name, sink.add, chunk)
+        results = {
+            name: timed(name, sink.finish, CatalogIdentity()) for name, sink in sinks.items() if sink.identifies
+        }
+        identity = identify(results)
+        for name, sink in sinks.items():
+            if name not in results:
+                results[name] = timed(name, sink.finish, identity)
+    except BaseException:
+        for sink in sinks.values():
+            sink.abort()
+        raise
+    return identity, {name: SinkRun(results[name], seconds[name], sink.steps, None) for name, sink in sinks.items()}
+
+
+def run_sinks(
+    catalog: Catalog,
+    sinks: Mapping[str, CatalogSink],
+    identify: Callable[[Mapping[str, object]], CatalogIdentity],
+    chunk_size: int = BULK_CHUNK_SIZE,
+    processes: bool = False,
+    trace_memory: bool = False,
+    timings: Dict[str, float] | None = None,
+) -> Tuple[CatalogIdentity, Dict[str, SinkRun]]:
+    """Walk ``catalog.recipes`` once and feed every chunk to all of ``sinks``.
+
+    The sinks take turns in this process. After the walk, the sinks that
+    ``identifies`` finish first, and ``identify`` turns their results (by
+    name) into the ``CatalogIdentity`` that the others finish with. If any
+    sink fails, the others are aborted and the first error is raised.
+
+    With ``processes``, each sink runs in its own worker process instead, so
+    on enough CPUs a run takes about as long as the walk or the slowest sink,
+    whichever is longer. A chunk is pickled once and handed to every worker by
+    a feeder thread with a short queue, so a slow sink only holds the walk
+    back once its queue is full. Pickling every chunk costs more than the
+    sinks save on small catalogs or few CPUs (see ``benchmark_seeder.py
+    --sinks``), so it is opt-in. Only then is ``peak_memory`` recorded per
+    sink; with ``trace_memory``, each worker traces its own peak. If ``timings`` is given, the seconds spent
+    building the chunks (``chunks``) are stored in it. Returns the identity
+    and each sink's ``SinkRun``.
+    """
+    import multiprocessing
+    import pickle
+    import queue
+    import threading
+    from multiprocessing.connection import wait
+
+    steps = {"chunks": 0.0}
+    if not processes:
+        identity, runs = _run_sinks_here(catalog, sinks, identify, chunk_size, steps)
+        if timings is not None:
+            timings.update(steps)
+        return identity, runs
+
+    workers = {}
+    for name, sink in sinks.items():
+        command_reader, command_writer = multiprocessing.Pipe(duplex=False)
+        reply_reader, reply_writer = multiprocessing.Pipe(duplex=False)
+        inherited = [end for _, writer, reader, _ in workers.values() for end in (writer, reader)]
+        inherited += [command_writer, reply_reader]
+        process = multiprocessing.Process(
+            target=_sink_worker,
+            args=(sink, command_reader, reply_writer, catalog._replace(recipes=()), trace_memory, inherited),
+            name=f"seed-{name}",
+            daemon=True,
+        )
+        process.start()
+        command_reader.close()
+        reply_writer.close()
+        workers[name] = (process, command_writer, reply_reader, queue.Queue(maxsize=4))
+
+    def feed(connection: Connection, messages: queue.Queue) -> None:
+        # Keeps draining after the worker is gone, so put() never blocks on it.
+        alive = True
+        while True:
+            message = messages.get()
+            if message is None:
+                return
+            if alive:
+                try:
+                    connection.send_bytes(message)
+                except OSError:
+                    alive = False
+
+    # Started after the workers, so none is forked with a feeder running.
+    feeders = [
+        threading.Thread(target=feed, args=(command_writer, messages), daemon=True)
+        for _, command_writer, _, messages in workers.values()
+    ]
+    for feeder in feeders:
+        feeder.start()
+    replies = {reply_reader: name for name, (_, _, reply_reader, _) in workers.items()}
+
+    def receive(name: str) -> object:
+        process, _, reply_reader, _ = workers[name]
+        try:
+            kind, payload = reply_reader.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"the {name} sink exited with code {process.exitcode}") from None
+        if kind == "failed":
+            raise payload
+        return payload
+
+    def send(kind: str, payload: object, names: Iterable[str]) -> None:
+        message = pickle.dumps((kind, payload), pickle.HIGHEST_PROTOCOL)
+        for name in names:
+            workers[name][3].put(message)
+
+    with_recipes = [name for name, sink in sinks.items() if sink.uses_recipes]
+    without_recipes = [name for name in sinks if name not in with_recipes]
+
+    runs: Dict[str, SinkRun] = {}
+    try:
+        # Every sink has started before the walk, so none of them sees an
+        # output that another one has already replaced.
+        for name in sinks:
+            receive(name)
+        for chunk in _timed_chunks(catalog, chunk_size, steps):
+            # Unpickling the recipes costs more than all of their rows.
+            if with_recipes:
+                send("chunk", chunk, with_recipes)
+            if without_recipes:
+                send("chunk", chunk._replace(recipes=None), without_recipes)
+            # Workers only reply this early when they fail.
+            for reply_reader in wait(list(replies), timeout=0):
+                receive(replies[reply_reader])
+        first = [name for name, sink in sinks.items() if sink.identifies]
+        send("finish", CatalogIdentity(), first)
+        for name in first:
+            runs[name] = receive(name)
+        identity = identify({name: runs[name].result for name in first})
+        others = [name for name in sinks if name not in runs]
+        send("finish", identity, others)
+        for name in others:
+            runs[name] = receive(name)
+    except BaseException:
+        send("abort", None, [name for name in sinks if name not in runs])
+        raise
+    finally:
+        for _, _, _, messages in workers.values():
+            messages.put(None)
+        for feeder in feeders:
+            feeder.join()
+        for process, command_writer, reply_reader, _ in workers.values():
+            command_writer.close()
+            process.join(timeout=60)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            reply_reader.close()
+    if timings is not None:
+        timings.update(steps)
+    return identity, {name: runs[name] for name in sinks}
+
+
+def seed_database(
+    output_path: Path | None = None,
+    database_path: Path | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    force: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    catalog: Catalog | None = None,
+    search: FullTextSearch | None = None,
+    app_database_path: Path | None = None,
+    previous_path: Path | None = None,
+    patch_path: Path | None = None,
+    compress_level: int | None = None,
+    shard_directory: Path | None = None,
+    macro_index: bool = False,
+    substitutes: int | None = None,
+    profile: SeedProfile | None = None,
+    web_path: Path | None = None,
+    columnar_path: Path | None = None,
+    processes: bool = False,
+    catalog_files: Tuple[Path, Path, Path | None] | None = None,
+    workers: int = 1,
+    images: List[Tuple] | None = None,
+) -> None:
+    """Write the SQL dump and whichever of the other outputs have a path.
+
+    Every output is a ``CatalogSink`` fed by a single walk over the catalog
+    (see ``run_sinks``). They take turns in this process, or with
+    ``processes`` get a worker process each. With ``profile``, the walk and every sink are timed and each
+    output's tables are recorded with their row counts and sizes
+    (uncompressed SQL bytes for the dump, bytes on disk for the databases).
+
+    Without ``catalog``, the catalog is loaded from ``catalog_files`` (the
+    arguments of ``load_catalog_files``, read by ``workers`` processes) or is
+    the built-in one. If the dump is the only output and its fingerprint shows
+    it was written from the same inputs and settings, nothing is loaded or
+    walked (see ``dump_up_to_date``). ``images`` (see ``load_images``) go into
+    the dump, the patch, the database and the core shard as ``recipe_images``.
+    """
+    if output_path is None:
+        output_path = default_output_path()
+    inputs = None
+    if catalog is None:
+        inputs = catalog_inputs_digest(catalog_files or ())
+        extra_outputs = (database_path, app_database_path, previous_path, shard_directory, web_path, columnar_path)
+        if (
+            not force
+            and all(path is None for path in extra_outputs)
+            and dump_up_to_date(output_path, inputs, search, macro_index, substitutes, compress_level, images)
+        ):
+            print(f"SQL dump at {output_path} is up to date")
+            return
+        with _phase(profile, "catalog"):
+            catalog = default_catalog() if catalog_files is None else load_catalog_files(*catalog_files, workers)
+
+    sinks: Dict[str, CatalogSink] = {"digests": DigestSink(search, macro_index, substitutes, images)}
+    if previous_path is not None:
+        if patch_path is None:
+            patch_path = default_patch_path(output_path)
+        # The previous catalog may be one of the outputs, which are replaced
+        # while the patch is still being written.
+        outputs = [path.resolve() for path in (output_path, database_path, app_database_path) if path is not None]
+        sinks["patch"] = PatchFileSink(
+            previous_path,
+            patch_path,
+            search,
+            macro_index,
+            substitutes,
+            compress_level,
+            snapshot=previous_path.resolve() in outputs,
+            images=images,
+        )
+    sinks["dump"] = DumpFileSink(
+        output_path, search, macro_index, substitutes, compress_level, force, inputs, images
+    )
+    if database_path is not None:
+        sinks["database"] = DatabaseSink(
+            database_path, page_size, chunk_size, search, compress_level, macro_index, substitutes, images
+        )
+    if app_database_path is not None:
+        sinks["app_database"] = AppDatabaseSink(app_database_path, page_size, chunk_size, compress_level)
+    if shard_directory is not None:
+        sinks["shards"] = ShardSink(shard_directory, page_size, images)
+    if web_path is not None:
+        sinks["web"] = WebJsonLinesSink(web_path, compress_level)
+    if columnar_path is not None:
+        sinks["columnar"] = ParquetSink(columnar_path)
+
+    def identify(results: Mapping[str, object]) -> CatalogIdentity:
+        digests, counts = results["digests"]
+        version = catalog_version_id(digests)
+        return CatalogIdentity(version, catalog_manifest(version, digests, counts), digests)
+
+    trace_memory = profile is not None and profile.trace_memory
+    with _phase(profile, "walk") as steps:
+        identity, runs = run_sinks(catalog, sinks, identify, chunk_size, processes, trace_memory, steps)
+    if profile is not None:
+        for name, run in runs.items():
+            profile.add_phase(name, run.seconds, run.steps, run.peak_memory)
+    version = identity.version
+
+    if "patch" in runs:
+        for diff in runs["patch"].result.values():
+            print(diff.describe())
+            if profile is not None:
+                profile.table("patch", diff.table, diff.inserted + diff.updated + diff.deleted, None, None)
+        print(f"Wrote patch from {previous_path} at {patch_path} (catalog version {version})")
+
+    if runs["dump"].result is None:
+        print(f"SQL dump at {output_path} is up to date")
+    else:
+        sections, reused = runs["dump"].result
+        for table, section in sections.items():
+            state = "reused" if table in reused else "rebuilt"
+            print(f"{TableLoad(table, section.rows, section.seconds).describe()} [{state}]")
+            if profile is not None:
+                profile.table("dump", table, section.rows, section.size, section.seconds)
+        print(f"Seeded SQL dump at {output_path}")
+    write_manifest(default_manifest_path(output_path), identity.manifest)
+
+    if database_path is not None:
+        loads = runs["database"].result
+        for load in loads.values():
+            print(load.describe())
+        if profile is not None:
+            _profile_database(profile, "database", database_path, loads)
+        print(f"Seeded SQLite database at {database_path} (page size {page_size})")
+        if search is not None and compression_codec(database_path) is None:
+            report_search_index(database_path)
+
+    if app_database_path is not None:
+        loads = runs["app_database"].result
+        for load in loads.values():
+            print(load.describe())
+        if profile is not None:
+            _profile_database(profile, "app_database", app_database_path, loads)
+        print(f"Seeded app database at {app_database_path} (DatabaseSchema v{APP_DATABASE_VERSION})")
+
+    if shard_directory is not None:
+        manifest = runs["shards"].result
+        for shard in [manifest["core"], *manifest["categories"]]:
+            label = shard.get("name", "core")
+            print(f"{shard['file']} ({label}): {shard['size'] / 1024:,.1f} KiB, {shard['rows']}")
+        print(f"Seeded {len(manifest['categories']) + 1} shards at {shard_directory}")
+
+    if web_path is not None:
+        print(f"Wrote {runs['web'].result} recipes for the web build to {web_path}")
+
+    if columnar_path is not None:
+        print(f"Wrote {runs['columnar'].result} recipes to {columnar_path}")
+
+
+def report_search_index(database_path: Path) -> None:
+    """Print how much of the database file the ``recipe_search`` index takes."""
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(database_path)) as conn:
+        size = search_index_size(conn)
+    total = database_path.stat().st_size
+    if size is None:
+        print("recipe_search size unknown: this SQLite build has no dbstat table")
+    else:
+        print(f"recipe_search index: {size / 1024:,.1f} KiB ({size / total:.1%} of {total / 1024:,.1f} KiB)")
+
+
+def main(argv: List[str] | None = None) -> None:
+    import argparse
+    from pathlib import Path
+
+    output_path = default_output_path()
+    database_path = default_database_path()
+    app_database_path = default_app_database_path()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=BULK_CHUNK_SIZE,
+        help=f"rows per executemany batch (default: {BULK_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=output_path,
+        help="path of the SQL dump to write",
+    )
+    parser.add_argument(
+        "--database",
+        type=Path,
+        nargs="?",
+        const=database_path,
+        help=f"also write a prebuilt SQLite asset (default path: {database_path})",
+    )
+    parser.add_argument(
+        "--app-database",
+        type=Path,
+        nargs="?",
+        const=app_database_path,
+        help=f"also write the catalog in the app's DatabaseSchema v2 layout (default path: {app_database_path})",
+    )
+    parser.add_argument(
+        "--shards",
+        type=Path,
+        nargs="?",
+        const=default_shard_directory(),
+        metavar="DIRECTORY",
+        help="also write a core shard, one shard per category and a manifest (default: assets/database/shards)",
+    )
+    parser.add_argument(
+        "--web-export",
+        type=Path,
+        nargs="?",
+        const=default_web_export_path(),
+        metavar="PATH",
+        help="also write the recipes as JSON Lines for the web build (default: web/data/recipes.jsonl)",
+    )
+    parser.add_argument(
+        "--columnar",
+        type=Path,
+        nargs="?",
+        const=default_columnar_path(),
+        metavar="PATH",
+        help="also write the recipes with their scores as Parquet (default: assets/database/recipes.parquet; "
+        "needs pyarrow)",
+    )
+    parser.add_argument(
+        "--parallel-sinks",
+        action="store_true",
+        help="feed every output from its own worker process instead of in turn in this process; pays off "
+        "for large catalogs with several outputs on several CPUs",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        choices=PAGE_SIZES,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"page size of the SQLite asset (default: {DEFAULT_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--compare-load",
+        action="store_true",
+        help="time first-launch loading from the SQL dump against the SQLite asset",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        help="level for outputs ending in .gz (1-9, default 9) or .xz (0-9, default 6)",
+    )
+    parser.add_argument(
+        "--compare-compression",
+        action="store_true",
+        help="report size against decompress-and-load time of the outputs for each codec and level",
+    )
+    parser.add_argument(
+        "--ingredients",
+        type=Path,
+        help="ingredient catalog export (.csv or .jsonl) to seed instead of the built-in catalog",
+    )
+    parser.add_argument(
+        "--recipes",
+        type=Path,
+        help="recipe export (.csv or .jsonl); requires --ingredients, and --recipe-ingredients unless every "
+        "JSON Lines recipe lists its own ingredients",
+    )
+    parser.add_argument(
+        "--recipe-ingredients",
+        type=Path,
+        help="recipe ingredient rows grouped by recipe, in the same order as --recipes",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes used to build recipes from --recipes (0: one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--fts",
+        action="store_true",
+        help="add the recipe_search FTS5 table (needs an SQLite build with FTS5 on the device)",
+    )
+    parser.add_argument(
+        "--fts-tokenizer",
+        default=DEFAULT_TOKENIZER,
+        help=f"FTS5 tokenizer spec (default: {DEFAULT_TOKENIZER!r}; e.g. 'porter unicode61' or 'trigram')",
+    )
+    parser.add_argument(
+        "--fts-prefix",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_PREFIXES),
+        metavar="LENGTH",
+        help="prefix lengths to index for type-ahead (default: 2 3; none to disable)",
+    )
+    parser.add_argument(
+        "--rtree",
+        action="store_true",
+        help="add the recipe_macros R*Tree over per-serving macros (needs an SQLite build with R*Tree on the device)",
+    )
+    parser.add_argument(
+        "--substitutes",
+        type=int,
+        nargs="?",
+        const=DEFAULT_SUBSTITUTES,
+        metavar="COUNT",
+        help=f"add ingredient_substitutes, up to COUNT per ingredient (default: {DEFAULT_SUBSTITUTES}; needs NumPy)",
+    )
+    parser.add_argument(
+        "--images",
+        type=Path,
+        nargs="?",
+        const=default_images_path(),
+        metavar="MANIFEST",
+        help="add recipe_images from the manifest image_pipeline.py writes (default: build/recipe_images.json)",
+    )
+    parser.add_argument(
+        "--diff-from",
+        type=Path,
+        metavar="PREVIOUS",
+        help="also write a patch that updates PREVIOUS (an earlier dump or database) to this catalog",
+    )
+    parser.add_argument(
+        "--patch-output",
+        type=Path,
+        help="path of the --diff-from patch (default: recipes.patch.sql next to --output)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild the dump even if the catalog fingerprint is unchanged",
+    )
+    parser.add_argument(
+        "--verify-manifest",
+        type=Path,
+        metavar="DATABASE",
+        help="check DATABASE against the manifest next to --output, list the stale tables and exit",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=True,
+        metavar="REPORT",
+        help="time every phase, count rows and bytes per table and trace peak memory; "
+        "write the JSON report to REPORT (default: <output>.profile.json)",
+    )
+    parser.add_argument(
+        "--no-trace-memory",
+        action="store_true",
+        help="with --profile, skip tracemalloc, which slows the Python-heavy phases several times over",
+    )
+    parser.add_argument(
+        "--check-import-time",
+        action="store_true",
+        help=f"measure the module import time against its {IMPORT_BUDGET_MS:g} ms budget and exit",
+    )
+    parser.add_argument(
+        "--compare-row-memory",
+        type=int,
+        nargs="?",
+        const=200_000,
+        metavar="ROWS",
+        help="compare memory per recipe-ingredient row for dict rows and IngredientRows, then exit",
+    )
+    args = parser.parse_args(argv)
+    if args.compare_row_memory is not None:
+        per_row = compare_row_memory(args.compare_row_memory)
+        for label, size in per_row.items():
+            print(f"{label}: {size:.1f} bytes per row")
+        print(f"IngredientRows use {per_row['dict_rows'] / per_row['array_rows']:.1f}x less memory")
+        return
+    if args.check_import_time:
+        elapsed = measure_import_time()
+        print(f"import seed_recipe_database: {elapsed:.2f} ms (budget {IMPORT_BUDGET_MS:g} ms)")
+        if elapsed > IMPORT_BUDGET_MS:
+            raise SystemExit(1)
+        return
+    if args.verify_manifest is not None:
+        import sqlite3
+        from contextlib import closing
+
+        manifest_path = default_manifest_path(args.output)
+        try:
+            manifest = read_manifest(manifest_path)
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot read the manifest at {manifest_path}: {exc}")
+        try:
+            with closing(sqlite3.connect(f"{args.verify_manifest.resolve().as_uri()}?mode=ro", uri=True)) as conn:
+                stale = verify_manifest(conn, manifest)
+        except sqlite3.DatabaseError as exc:
+            parser.error(f"cannot read {args.verify_manifest}: {exc}")
+        version = manifest["catalog_version"]
+        if stale:
+            print(f"{args.verify_manifest} differs from catalog version {version}: {', '.join(stale)}")
+            raise SystemExit(1)
+        print(f"{args.verify_manifest} matches catalog version {version}")
+        return
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    if args.compare_load and args.database is None:
+        parser.error("--compare-load requires --database")
+    if (args.ingredients is None) != (args.recipes is None):
+        parser.error("--ingredients and --recipes must be given together")
+    if args.recipe_ingredients is not None and args.recipes is None:
+        parser.error("--recipe-ingredients requires --recipes")
+    if (
+        args.recipes is not None
+        and args.recipe_ingredients is None
+        and args.recipes.suffix.lower() not in JSON_LINES_SUFFIXES
+    ):
+        parser.error("--recipes in CSV requires --recipe-ingredients")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    if args.patch_output is not None and args.diff_from is None:
+        parser.error("--patch-output requires --diff-from")
+    if args.no_trace_memory and args.profile is None:
+        parser.error("--no-trace-memory requires --profile")
+    if args.compress_level is not None:
+        for path in (args.output, args.database, args.app_database, args.patch_output, args.web_export):
+            codec = None if path is None else compression_codec(path)
+            if codec is not None and args.compress_level not in COMPRESSION_LEVELS[codec]:
+                levels = COMPRESSION_LEVELS[codec]
+                parser.error(f"--compress-level for {codec} must be between {levels[0]} and {levels[-1]}")
+    search = None
+    if args.fts:
+        if any(not 1 <= length <= 999 for length in args.fts_prefix):
+            parser.error("--fts-prefix lengths must be between 1 and 999")
+        search = FullTextSearch(args.fts_tokenizer, tuple(args.fts_prefix))
+        error = check_search(search)
+        if error is not None:
+            parser.error(f"invalid FTS5 settings: {error}")
+    if args.rtree:
+        error = check_macro_index()
+        if error is not None:
+            parser.error(f"R*Tree is unavailable: {error}")
+    if args.substitutes is not None:
+        import importlib.util
+
+        if args.substitutes < 1:
+            parser.error("--substitutes must be positive")
+        if importlib.util.find_spec("numpy") is None:
+            parser.error("--substitutes needs NumPy")
+    if args.columnar is not None:
+        import importlib.util
+
+        if importlib.util.find_spec("pyarrow") is None:
+            parser.error("--columnar needs pyarrow")
+    profile = None
+    if args.profile is not None:
+        profile = SeedProfile(trace_memory=not args.no_trace_memory)
+    catalog_files = None
+    if args.recipes is not None:
+        catalog_files = (args.ingredients, args.recipes, args.recipe_ingredients)
+        for path in catalog_files:
+            if path is not None and not path.is_file():
+                parser.error(f"{path} is not a file")
+    if args.images is not None and not args.images.is_file():
+        parser.error(f"{args.images} is not a file; write it with image_pipeline.py")
+    try:
+        images = None if args.images is None else load_images(args.images)
+        seed_database(
+            args.output,
+            args.database,
+            args.chunk_size,
+            args.force,
+            args.page_size,
+            None,
+            search,
+            args.app_database,
+            args.diff_from,
+            args.patch_output,
+            args.compress_level,
+            args.shards,
+            args.rtree,
+            args.substitutes,
+            profile,
+            args.web_export,
+            args.columnar,
+            args.parallel_sinks,
+            catalog_files,
+            args.workers or os.cpu_count() or 1,
+            images,
+        )
+    except CatalogFileError as exc:
+        parser.error(str(exc))
+    if profile is not None:
+        profile.close()
+        report_path = default_profile_path(args.output) if args.profile is True else args.profile
+        profile.write_report(report_path)
+        for line in profile.describe():
+            print(line)
+        print(f"Wrote profile to {report_path}")
+    if args.compare_load:
+        timings = compare_load_times(args.output, args.database)
+        for label, seconds in timings.items():
+            print(f"first launch via {label}: {seconds * 1000:.2f} ms")
+        if timings["binary_asset"]:
+            print(f"binary asset is {timings['sql_dump'] / timings['binary_asset']:.1f}x faster")
+    if args.compare_compression:
+        results = compare_compression(args.output, args.database)
+        plain_sizes = {result.output: result.size for result in results if result.codec is None}
+        for result in results:
+            print(result.describe(plain_sizes[result.output]))
 
 
 if __name__ == "__main__":
-    seed_database()
+    main()
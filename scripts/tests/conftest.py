@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts are standalone modules, not a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,26 @@
+import json
+import sqlite3
+from contextlib import closing
+
+from seed_recipe_database import (
+    default_database_path,
+    default_manifest_path,
+    default_output_path,
+    read_manifest,
+    seed_database,
+    verify_manifest,
+)
+
+
+def test_committed_dump_matches_the_seeder(tmp_path):
+    # Regenerate with `python3 scripts/seed_recipe_database.py --database --force`.
+    seed_database(tmp_path / "recipes.sql", force=True)
+    assert (tmp_path / "recipes.sql").read_bytes() == default_output_path().read_bytes()
+    manifest = json.loads(default_manifest_path(tmp_path / "recipes.sql").read_text(encoding="utf-8"))
+    assert manifest == read_manifest(default_manifest_path(default_output_path()))
+
+
+def test_committed_database_matches_the_manifest():
+    manifest = read_manifest(default_manifest_path(default_output_path()))
+    with closing(sqlite3.connect(f"{default_database_path().as_uri()}?mode=ro", uri=True)) as conn:
+        assert verify_manifest(conn, manifest) == []
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from seed_recipe_database import CatalogFileError, load_catalog_files
+
+INGREDIENTS = """name,default_unit,calories_per_unit,protein_per_unit,fat_per_unit,carbs_per_unit
+Rolled oats,g,3.8,0.13,0.07,0.66
+Egg,piece,72,6.3,4.8,0.4
+"""
+
+RECIPES = """name,category,description,instructions,servings,image_url,prep_minutes,cook_minutes,review_count,is_popular
+Oats,Breakfast,Plain oats,"Boil
+Stir",1,https://example.com/oats.jpg,2,5,10,1
+Eggs,Breakfast,Two eggs,Fry,1,https://example.com/eggs.jpg,1,4,3,0
+"""
+
+ROWS = """recipe,ingredient,quantity,unit,notes
+Oats,Rolled oats,80,g,
+Eggs,Egg,2,piece,Large
+"""
+
+
+@pytest.fixture
+def exports(tmp_path):
+    def write(name, text):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    return write
+
+
+def recipe_names(catalog):
+    return [recipe.name for recipe in catalog.recipes]
+
+
+def test_csv_exports_load(exports):
+    catalog = load_catalog_files(
+        exports("ingredients.csv", INGREDIENTS), exports("recipes.csv", RECIPES), exports("rows.csv", ROWS)
+    )
+    assert recipe_names(catalog) == ["Oats", "Eggs"]
+
+
+def test_json_lines_recipes_carry_their_ingredients(exports):
+    record = {
+        "name": "Oats",
+        "category": "Breakfast",
+        "instructions": ["Boil"],
+        "servings": 1,
+        "image_url": "https://example.com/oats.jpg",
+        "prep_minutes": 1,
+        "cook_minutes": 1,
+        "review_count": 0,
+        "ingredients": [["Rolled oats", 80, "g"]],
+    }
+    catalog = load_catalog_files(exports("ingredients.csv", INGREDIENTS), exports("recipes.jsonl", json.dumps(record)))
+    assert recipe_names(catalog) == ["Oats"]
+
+    del record["ingredients"]
+    catalog = load_catalog_files(exports("ingredients.csv", INGREDIENTS), exports("recipes.jsonl", json.dumps(record)))
+    with pytest.raises(CatalogFileError, match=r"recipes\.jsonl:1: recipe 'Oats' has no ingredients"):
+        recipe_names(catalog)
+
+
+@pytest.mark.parametrize(
+    "rows, message",
+    [
+        (ROWS.replace(",80,", ",eighty,"), r"rows\.csv:2: invalid recipe ingredient"),
+        (ROWS.replace("Egg,2", "Duck egg,2"), r"rows\.csv:3: unknown ingredient 'Duck egg'"),
+        (ROWS.replace("Oats,Rolled oats,80,g,\n", ""), r"recipes\.csv:2: recipe 'Oats' has no rows"),
+        (ROWS + "Toast,Egg,1,piece,\n", r"rows for recipe 'Toast' do not follow"),
+        (ROWS.replace(",80,", ",inf,"), r"rows\.csv:2: invalid recipe ingredient .*quantity must be a finite number"),
+        (ROWS.replace("80,g", "80,cup"), r"rows\.csv:2: invalid recipe ingredient .*unknown unit 'cup'"),
+    ],
+    ids=["unreadable", "unknown ingredient", "missing rows", "out of order", "infinity", "unknown unit"],
+)
+def test_bad_rows_name_file_and_line(exports, rows, message):
+    catalog = load_catalog_files(
+        exports("ingredients.csv", INGREDIENTS), exports("recipes.csv", RECIPES), exports("rows.csv", rows)
+    )
+    with pytest.raises(CatalogFileError, match=message):
+        recipe_names(catalog)
+
+
+def test_bad_recipe_reports_its_first_line(exports):
+    recipes = RECIPES.replace("Fry,1,", "Fry,one,")
+    catalog = load_catalog_files(
+        exports("ingredients.csv", INGREDIENTS), exports("recipes.csv", recipes), exports("rows.csv", ROWS)
+    )
+    with pytest.raises(CatalogFileError, match=r"recipes\.csv:4: invalid recipe 'Eggs'"):
+        recipe_names(catalog)
+
+
+@pytest.mark.parametrize(
+    "recipes, message",
+    [
+        (RECIPES.replace(",2,5,10,", ",2,nan,10,"), r"recipes\.csv:2: invalid recipe .*cook_minutes must be a finite"),
+        (RECIPES.replace(",1,4,3,", ",1,4,-inf,"), r"recipes\.csv:4: invalid recipe .*review_count must be a finite"),
+        (RECIPES.replace("https://example.com/eggs.jpg", ""), r"recipes\.csv:4: invalid recipe .*image_url must be"),
+    ],
+    ids=["nan", "infinity", "empty image_url"],
+)
+def test_bad_recipe_fields_are_rejected(exports, recipes, message):
+    catalog = load_catalog_files(
+        exports("ingredients.csv", INGREDIENTS), exports("recipes.csv", recipes), exports("rows.csv", ROWS)
+    )
+    with pytest.raises(CatalogFileError, match=message):
+        recipe_names(catalog)
+
+
+@pytest.mark.parametrize("name", [None, "", " "], ids=["missing", "empty", "blank"])
+def test_recipe_needs_a_name(exports, name):
+    record = {
+        "category": "Breakfast",
+        "instructions": ["Boil"],
+        "servings": 1,
+        "image_url": "https://example.com/oats.jpg",
+        "prep_minutes": 1,
+        "cook_minutes": 1,
+        "review_count": 0,
+        "ingredients": [["Rolled oats", 80, "g"]],
+    }
+    if name is not None:
+        record["name"] = name
+    catalog = load_catalog_files(exports("ingredients.csv", INGREDIENTS), exports("recipes.jsonl", json.dumps(record)))
+    with pytest.raises(CatalogFileError, match=r"recipes\.jsonl:1: invalid recipe .*name"):
+        recipe_names(catalog)
+
+
+@pytest.mark.parametrize(
+    "ingredients, message",
+    [
+        (INGREDIENTS.replace("3.8", "lots"), r"ingredients\.csv:2: invalid ingredient"),
+        (INGREDIENTS.replace("3.8", "NaN"), r"ingredients\.csv:2: invalid ingredient .*calories_per_unit must be"),
+        (INGREDIENTS.replace("6.3", "inf"), r"ingredients\.csv:3: invalid ingredient .*protein_per_unit must be"),
+        (INGREDIENTS.replace("Egg,piece", "Egg,dozen"), r"ingredients\.csv:3: invalid ingredient .*unknown unit 'dozen'"),
+        (INGREDIENTS.replace("Egg,piece", ",piece"), r"ingredients\.csv:3: invalid ingredient .*name must be"),
+    ],
+    ids=["unreadable", "nan", "infinity", "unknown unit", "empty name"],
+)
+def test_bad_ingredient_is_rejected(exports, ingredients, message):
+    with pytest.raises(CatalogFileError, match=message):
+        load_catalog_files(exports("ingredients.csv", ingredients), exports("recipes.csv", RECIPES))
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+
+import seed_recipe_database
+from seed_recipe_database import TABLES, default_catalog, seed_database
+
+
+def changed_catalog():
+    catalog = default_catalog()
+    recipes = list(catalog.recipes)
+    recipes[3] = recipes[3]._replace(review_count=recipes[3].review_count + 1)
+    return catalog._replace(recipes=recipes)
+
+
+def seed(path, capsys, **options):
+    capsys.readouterr()
+    seed_database(path, **options)
+    states = re.findall(r"^(\w+): .*\[(reused|rebuilt)\]$", capsys.readouterr().out, re.MULTILINE)
+    return dict(states)
+
+
+def test_spliced_dump_equals_a_full_rebuild(tmp_path, capsys):
+    dump = tmp_path / "spliced" / "recipes.sql"
+    seed(dump, capsys, catalog=default_catalog())
+    states = seed(dump, capsys, catalog=changed_catalog())
+    # recipe_scores is digested from the recipes, so it is rebuilt with them.
+    rendered = {table for table, state in states.items() if state == "rebuilt"}
+    assert rendered == {"recipes", "recipe_scores"}
+    assert len(states) == len(TABLES)
+
+    rebuilt = tmp_path / "full" / "recipes.sql"
+    seed(rebuilt, capsys, catalog=changed_catalog(), force=True)
+    assert dump.read_bytes() == rebuilt.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "name, change",
+    [
+        ("DUMP_FORMAT_VERSION", lambda version: version + 1),
+        ("SCHEMA", lambda schema: schema + "\n"),
+    ],
+)
+def test_format_or_schema_change_rebuilds_every_section(tmp_path, capsys, monkeypatch, name, change):
+    dump = tmp_path / "recipes.sql"
+    seed(dump, capsys, catalog=default_catalog())
+    monkeypatch.setattr(seed_recipe_database, name, change(getattr(seed_recipe_database, name)))
+    states = seed(dump, capsys, catalog=changed_catalog())
+    assert states == dict.fromkeys(TABLES, "rebuilt")
@@ -0,0 +1,89 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from image_pipeline import ImageResult, catalog_image_urls, stand_in_check, write_image_manifest
+from seed_recipe_database import CatalogFileError, default_catalog, load_images, seed_database
+
+
+def catalog_images(urls, shade=0):
+    return {
+        url: ImageResult(url, f"{idx + shade:064x}", 1260, 750, f"{idx + shade:016x}-320x190.jpg", 319, 190)
+        for idx, url in enumerate(urls)
+    }
+
+
+def image_rows(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT * FROM recipe_images ORDER BY image_url").fetchall()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_prefetch_stays_within_its_connections(concurrency):
+    pytest.importorskip("PIL")
+    result = stand_in_check(catalog_image_urls()[:9], (64, 38), concurrency)
+    assert result["images"] == 9
+    assert result["connections"] <= concurrency
+
+
+def test_manifest_round_trip(tmp_path):
+    images = catalog_images(catalog_image_urls())
+    assert write_image_manifest(tmp_path / "images.json", images, (320, 190)) == len(images)
+    rows = load_images(tmp_path / "images.json")
+    assert rows == [tuple(images[url]) for url in sorted(images)]
+
+
+def test_manifest_errors_name_the_file(tmp_path):
+    path = tmp_path / "images.json"
+    path.write_text('{"format": 1, "images": [{"image_url": "x"}]}', encoding="utf-8")
+    with pytest.raises(CatalogFileError, match="images.json: invalid image 0"):
+        load_images(path)
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(CatalogFileError, match="not an image manifest"):
+        load_images(path)
+
+
+def test_every_output_carries_the_images(tmp_path):
+    urls = catalog_image_urls()
+    write_image_manifest(tmp_path / "images.json", catalog_images(urls), (320, 190))
+    rows = load_images(tmp_path / "images.json")
+    seed_database(
+        tmp_path / "recipes.sql",
+        tmp_path / "recipes.db",
+        catalog=default_catalog(),
+        shard_directory=tmp_path / "shards",
+        images=rows,
+    )
+
+    assert image_rows(tmp_path / "recipes.db") == rows
+    assert image_rows(tmp_path / "shards" / "core.db") == rows
+    with closing(sqlite3.connect(":memory:")) as conn:
+        conn.executescript((tmp_path / "recipes.sql").read_text(encoding="utf-8"))
+        assert conn.execute("SELECT * FROM recipe_images ORDER BY image_url").fetchall() == rows
+        missing = conn.execute(
+            "SELECT count(*) FROM recipes LEFT JOIN recipe_images USING (image_url) WHERE sha256 IS NULL"
+        ).fetchone()
+        assert missing == (0,)
+
+
+def test_changed_images_rewrite_the_dump_and_patch(tmp_path):
+    urls = catalog_image_urls()
+    seed_database(tmp_path / "old.sql", tmp_path / "old.db", catalog=default_catalog())
+    # A base without the table gets it; then one image is added and the others change.
+    for shade, used in ((7, urls[:-1]), (9, urls)):
+        rows = [tuple(image) for _, image in sorted(catalog_images(used, shade).items())]
+        patch_path = tmp_path / "update.patch.sql"
+        seed_database(
+            tmp_path / "old.sql",
+            tmp_path / "new.db",
+            catalog=default_catalog(),
+            previous_path=tmp_path / "old.db",
+            patch_path=patch_path,
+            images=rows,
+        )
+        assert f"{shade:064x}" in (tmp_path / "old.sql").read_text(encoding="utf-8")
+
+        with closing(sqlite3.connect(tmp_path / "old.db")) as conn:
+            conn.executescript(patch_path.read_text(encoding="utf-8"))
+        assert image_rows(tmp_path / "old.db") == image_rows(tmp_path / "new.db") == rows
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import seed_recipe_database
+from seed_recipe_database import IMPORT_BUDGET_MS, measure_import_time
+
+# Imported inside the functions that use them; pulling one in at import time
+# costs more than the whole budget allows for.
+DEFERRED_MODULES = (
+    "csv",
+    "dataclasses",
+    "hashlib",
+    "json",
+    "multiprocessing",
+    "numpy",
+    "pathlib",
+    "shutil",
+    "sqlite3",
+    "subprocess",
+    "tempfile",
+)
+
+
+def test_import_defers_heavy_modules():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, seed_recipe_database; print(*sys.modules)"],
+        cwd=os.path.dirname(os.path.abspath(seed_recipe_database.__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(result.stdout.split())
+    assert "seed_recipe_database" in loaded
+    assert sorted(loaded.intersection(DEFERRED_MODULES)) == []
+
+
+# Wall-clock timings depend on the machine and its load, so the budget is only
+# checked on request.
+@pytest.mark.skipif(not os.environ.get("SEED_IMPORT_TIMING"), reason="set SEED_IMPORT_TIMING=1 to time the import")
+def test_import_stays_within_budget():
+    assert measure_import_time(repeats=3) <= IMPORT_BUDGET_MS
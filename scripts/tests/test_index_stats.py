@@ -0,0 +1,81 @@
+import io
+import random
+import sqlite3
+import tracemalloc
+
+import pytest
+
+from benchmark_seeder import synthetic_catalog
+from seed_recipe_database import IndexStats, catalog_chunks, default_catalog, index_stats, write_sql_dump
+
+
+def analyzed(conn):
+    # ANALYZE sqlite_master creates sqlite_stat1 without computing anything.
+    conn.execute("ANALYZE sqlite_master")
+    conn.execute("DELETE FROM sqlite_stat1")
+    conn.execute("ANALYZE")
+    return conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1 ORDER BY tbl, idx").fetchall()
+
+
+@pytest.mark.parametrize(
+    "catalog", [default_catalog, lambda: synthetic_catalog(2_000, seed=3)], ids=["builtin", "synthetic"]
+)
+def test_dump_ships_the_stats_analyze_computes(catalog):
+    handle = io.StringIO()
+    write_sql_dump(handle, catalog())
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(handle.getvalue())
+    shipped = conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1 ORDER BY tbl, idx").fetchall()
+    assert shipped
+    assert shipped == analyzed(conn)
+
+
+def distributions():
+    rng = random.Random(11)
+    yield [(0, 0)]
+    yield [(row, row) for row in range(500)]
+    yield [(row % 7, row) for row in range(500)]
+    yield [(rng.randrange(40), rng.randrange(3)) for _ in range(2_000)]
+    # Near-unique prefixes: ANALYZE reports 1 instead of 2 once at most
+    # one row in ten repeats a value.
+    for repeats in (45, 46, 50, 100):
+        yield [(row, 0) for row in range(500)] + [(row, 1) for row in range(repeats)]
+
+
+@pytest.mark.parametrize("rows", list(distributions()))
+@pytest.mark.parametrize("where", [None, 2])
+def test_index_stats_match_analyze(rows, where):
+    rows = [(a, b, (a + b) % 3 == 0) for a, b in rows]
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (a, b, flag)")
+    conn.execute("CREATE INDEX t_ab ON t (a, b)" + (" WHERE flag" if where is not None else ""))
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?)", rows)
+    stats = IndexStats("t", "t_ab", (0, 1), None, where)
+    for row in rows:
+        stats.add(row)
+    expected = [("t", "t_ab", stats.stat())] if stats.stat() is not None else []
+    # A table with only partial indexes also gets its row count under idx NULL.
+    assert expected == [row for row in analyzed(conn) if row[1] is not None]
+
+
+def stats_memory(recipes):
+    tracemalloc.start()
+    try:
+        stats = index_stats()
+        for chunk in catalog_chunks(synthetic_catalog(recipes, seed=5, materialize=False), 500):
+            for table, rows in zip(("recipes", "recipe_ingredients", "recipe_scores"), chunk[1:]):
+                for row in rows:
+                    for index in stats[table]:
+                        index.add(row)
+        del chunk, rows
+        held = tracemalloc.get_traced_memory()[0]
+        del stats
+        return held - tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_index_stats_memory_does_not_grow_with_the_catalog():
+    small, large = stats_memory(2_000), stats_memory(20_000)
+    # Keeping one entry per recipe would take over 1 MiB more for the larger catalog.
+    assert large - small < 256 * 1024
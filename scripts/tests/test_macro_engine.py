@@ -0,0 +1,55 @@
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from macro_engine import round_half_even  # noqa: E402
+
+
+def assert_rounds_like_python(values, decimals):
+    rounded = round_half_even(np.array(values, dtype=np.float64), decimals).tolist()
+    expected = [round(value, decimals) for value in values]
+    assert rounded == expected
+    # round() keeps the sign of values that round to zero.
+    assert [math.copysign(1.0, value) for value in rounded] == [math.copysign(1.0, value) for value in expected]
+
+
+@pytest.mark.parametrize(
+    "value, decimals, expected",
+    [
+        (0.5, 0, 0.0),
+        (1.5, 0, 2.0),
+        (2.5, 0, 2.0),
+        (-2.5, 0, -2.0),
+        (0.125, 2, 0.12),
+        (0.375, 2, 0.38),
+        (-0.125, 2, -0.12),
+        # Not exact in binary: just below the tie, so they round down.
+        (2.675, 2, 2.67),
+        (1.0005, 3, 1.0),
+        (-0.0004, 3, -0.0),
+    ],
+)
+def test_half_way_values(value, decimals, expected):
+    result = round_half_even(np.array([value]), decimals)[0]
+    assert result == expected == round(value, decimals)
+    assert math.copysign(1.0, result) == math.copysign(1.0, expected)
+
+
+@pytest.mark.parametrize("decimals", [0, 1, 2, 3])
+def test_decimal_midpoints_match_round(decimals):
+    rng = random.Random(decimals)
+    values = [(rng.randint(-10**7, 10**7) + 0.5) / 10**decimals for _ in range(20_000)]
+    assert_rounds_like_python(values, decimals)
+
+
+def test_scaled_macros_match_round():
+    # compute_macros rounds nutrient * quantity products to 3 decimals.
+    rng = random.Random(7)
+    values = [
+        round(rng.uniform(0, 10), rng.randint(1, 4)) * round(rng.uniform(0, 500), rng.randint(0, 2))
+        for _ in range(50_000)
+    ]
+    assert_rounds_like_python(values, 3)
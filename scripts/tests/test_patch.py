@@ -0,0 +1,60 @@
+import shutil
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from seed_recipe_database import TABLES, Catalog, default_catalog, seed_database
+
+
+def edited_catalog():
+    """The built-in catalog with names moved between IDs and rows deleted, changed and added."""
+    catalog = default_catalog()
+    # Swapping neighbours moves their UNIQUE names to each other's IDs.
+    names = list(catalog.categories)
+    names[0], names[1] = names[1], names[0]
+    names.remove("Beverage")
+    categories = {name: catalog.categories[name] for name in names}
+    recipes = [recipe for recipe in catalog.recipes if recipe.category != "Beverage"]
+    used = {name for recipe in recipes for name in recipe.ingredient_rows.ingredient_names()}
+    ingredients = [name for name in catalog.ingredients if name in used]
+    assert len(ingredients) < len(catalog.ingredients)
+    ingredients[0], ingredients[2] = ingredients[2], ingredients[0]
+    recipes[3] = recipes[3]._replace(servings=recipes[3].servings + 1, description="Now serves one more.")
+    recipes.append(recipes[0]._replace(name="Second helping"))
+    del recipes[5]
+    return Catalog(categories, {name: catalog.ingredients[name] for name in ingredients}, recipes)
+
+
+def table_rows(path):
+    with closing(sqlite3.connect(path)) as conn:
+        tables = [*TABLES, "catalog_version", "catalog_manifest", "sqlite_stat1"]
+        return {table: sorted(map(repr, conn.execute(f"SELECT * FROM {table}"))) for table in tables}
+
+
+@pytest.mark.parametrize("base", ["database", "dump"])
+def test_patch_turns_previous_catalog_into_new_one(tmp_path, base):
+    seed_database(tmp_path / "old.sql", tmp_path / "old.db", catalog=default_catalog())
+    target = tmp_path / "patched.db"
+    shutil.copy(tmp_path / "old.db", target)
+    previous = tmp_path / ("old.db" if base == "database" else "old.sql")
+    patch_path = tmp_path / "update.patch.sql"
+    seed_database(
+        tmp_path / "new.sql", tmp_path / "new.db", catalog=edited_catalog(), previous_path=previous, patch_path=patch_path
+    )
+
+    with closing(sqlite3.connect(target)) as conn:
+        conn.executescript(patch_path.read_text(encoding="utf-8"))
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert table_rows(target) == table_rows(tmp_path / "new.db")
+
+
+def test_patch_refuses_another_base(tmp_path):
+    seed_database(tmp_path / "old.sql", tmp_path / "old.db", catalog=default_catalog())
+    patch_path = tmp_path / "update.patch.sql"
+    seed_database(tmp_path / "new.sql", catalog=edited_catalog(), previous_path=tmp_path / "old.db", patch_path=patch_path)
+
+    with closing(sqlite3.connect(tmp_path / "new.db")) as conn:
+        conn.executescript((tmp_path / "new.sql").read_text(encoding="utf-8"))
+        with pytest.raises(sqlite3.IntegrityError, match="patch_base_version"):
+            conn.executescript(patch_path.read_text(encoding="utf-8"))
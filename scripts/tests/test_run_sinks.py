@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from seed_recipe_database import CatalogIdentity, CatalogSink, default_catalog, run_sinks, seed_database
+
+
+class PipeCount(CatalogSink):
+    """Counts the pipes open in the process that runs it."""
+
+    def start(self, catalog):
+        self.pipes = 0
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                self.pipes += os.readlink(f"/proc/self/fd/{fd}").startswith("pipe:")
+            except OSError:
+                pass  # the descriptor listdir used
+
+    def add(self, chunk):
+        pass
+
+    def finish(self, identity):
+        return self.pipes
+
+
+def identify(results):
+    return CatalogIdentity()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_workers_only_hold_their_own_pipes():
+    sinks = {f"sink{idx}": PipeCount() for idx in range(4)}
+    _, runs = run_sinks(default_catalog(), sinks, identify, processes=True)
+    counts = [runs[name].result for name in sinks]
+    # A forked worker may still inherit the pair of sentinel pipes
+    # multiprocessing keeps per process; holding the earlier workers' command
+    # and reply pipes as well would make that four.
+    assert all(later - earlier <= 2 for earlier, later in zip(counts, counts[1:]))
+
+
+def test_parallel_sinks_write_the_same_outputs(tmp_path):
+    outputs = {}
+    for processes in (False, True):
+        directory = tmp_path / str(processes)
+        seed_database(
+            directory / "recipes.sql",
+            directory / "recipes.db",
+            catalog=default_catalog(),
+            app_database_path=directory / "recipes_v2.db",
+            processes=processes,
+        )
+        outputs[processes] = {
+            path.name: path.read_bytes() for path in directory.iterdir() if path.suffix in (".sql", ".json")
+        }
+    assert outputs[False] == outputs[True]
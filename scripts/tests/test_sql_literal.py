@@ -0,0 +1,47 @@
+import random
+import sqlite3
+
+import pytest
+
+from seed_recipe_database import sql_literal
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def sample_floats(count: int = 20_000, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.uniform(-1e6, 1e6)
+        yield rng.random()  # like the dish scores
+        yield round(rng.uniform(0, 5000), 2)  # like the per-serving macros
+        yield round(rng.uniform(0, 1e6), rng.randint(0, 8))
+        yield rng.random() * 10.0 ** rng.randint(-12, 12)
+    yield from (0.0, -0.0, 2.0, 0.1, 0.30000000000000004, 1e16, 1e22, 123456789012345.0, 1e-5, 1e300)
+
+
+def test_floats_read_back_unchanged(conn):
+    values = list(sample_floats())
+    for start in range(0, len(values), 500):
+        chunk = values[start:start + 500]
+        literals = ", ".join(f"quote({sql_literal(value)}), typeof({sql_literal(value)})" for value in chunk)
+        parsed = conn.execute(f"SELECT {literals}").fetchone()
+        expected = conn.execute("SELECT " + ", ".join("quote(?)" for _ in chunk), chunk).fetchone()
+        for value, quoted, kind, want in zip(chunk, parsed[::2], parsed[1::2], expected):
+            assert (quoted, kind) == (want, "real"), f"{value!r} was written as {sql_literal(value)}"
+
+
+@pytest.mark.parametrize("value", [None, 0, -7, 2**62, True, "", "it's", "naïve 'quoted' text", "line\nbreak"])
+def test_other_values_match_quote(conn, value):
+    parameter = int(value) if isinstance(value, bool) else value
+    assert sql_literal(value) == conn.execute("SELECT quote(?)", (parameter,)).fetchone()[0]
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_floats_are_rejected(value):
+    with pytest.raises(ValueError, match="no SQL literal"):
+        sql_literal(value)
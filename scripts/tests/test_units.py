@@ -0,0 +1,98 @@
+import pytest
+
+from seed_recipe_database import INGREDIENT_CATALOG, StringPool, build_recipe, unit_factor
+
+
+def ingredient(name):
+    return INGREDIENT_CATALOG[name]
+
+
+def test_default_unit_is_identity():
+    for item in INGREDIENT_CATALOG.values():
+        assert unit_factor(item, item.default_unit) == 1.0
+
+
+@pytest.mark.parametrize(
+    "name, unit, factor",
+    [
+        ("Olive oil", "g", 1 / 0.91),  # measured in ml
+        ("Lemon juice", "g", 1 / 1.03),
+        ("Honey", "ml", 1.42),  # measured in g
+        ("Greek yogurt", "ml", 1.04),
+        ("Water", "g", 1.0),
+    ],
+)
+def test_density_conversions(name, unit, factor):
+    assert unit_factor(ingredient(name), unit) == pytest.approx(factor)
+
+
+def test_density_round_trip():
+    oil = ingredient("Olive oil")
+    # 10 g of olive oil scales the ml macros as about 10.99 ml.
+    assert 10 * unit_factor(oil, "g") == pytest.approx(10.99, abs=0.005)
+
+
+@pytest.mark.parametrize(
+    "name, unit, factor",
+    [
+        ("Egg", "piece", 50.0),  # measured in g
+        ("Banana", "piece", 118.0),
+        ("Garlic", "piece", 3.0),
+        ("Vanilla whey protein", "g", 1 / 30.0),  # measured in scoops
+        ("Whole grain bread", "g", 1 / 28.0),  # measured in slices
+        ("Whole wheat tortilla", "g", 1 / 45.0),  # measured in pieces
+    ],
+)
+def test_piece_conversions(name, unit, factor):
+    assert unit_factor(ingredient(name), unit) == pytest.approx(factor)
+
+
+@pytest.mark.parametrize(
+    "name, unit",
+    [
+        ("Rolled oats", "ml"),  # no density
+        ("Egg", "slice"),  # no slice weight
+        ("Chia seeds", "piece"),
+        ("Whole grain bread", "ml"),  # slice to ml needs a density too
+        ("Olive oil", "scoop"),
+    ],
+)
+def test_unconvertible_units(name, unit):
+    assert unit_factor(ingredient(name), unit) is None
+
+
+def test_factor_is_memoized_per_default_unit():
+    # An ingredient of the same name measured in another default unit must
+    # not reuse the cached factor.
+    egg = ingredient("Egg")
+    assert unit_factor(egg, "piece") == 50.0
+    assert unit_factor(egg._replace(default_unit="piece"), "g") == pytest.approx(1 / 50.0)
+
+
+def recipe(*ingredients):
+    return build_recipe(
+        name="Test",
+        category="Breakfast",
+        description="",
+        instructions=["Mix."],
+        servings=1,
+        image_url="",
+        prep_minutes=0,
+        cook_minutes=0,
+        review_count=0,
+        is_popular=False,
+        ingredients=ingredients,
+        strings=StringPool(),
+    )
+
+
+def test_build_recipe_scales_converted_units():
+    (by_piece,) = recipe(("Egg", 2.0, "piece", None)).ingredient_rows.tuples()
+    (by_weight,) = recipe(("Egg", 100.0, "g", None)).ingredient_rows.tuples()
+    assert by_piece[:3] == ("Egg", 2.0, "piece")  # rows keep the recipe's unit
+    assert by_piece[3:7] == by_weight[3:7]
+
+
+def test_build_recipe_rejects_unconvertible_units():
+    with pytest.raises(ValueError, match="cannot convert ml to g"):
+        recipe(("Rolled oats", 50.0, "ml", None))